@@ -0,0 +1,161 @@
+# ------------------------------------------------------
+#
+#   BenchComparly.py
+#   By: Fred Stakem
+#   Created: 10.18.26
+#
+# ------------------------------------------------------
+
+
+# Libs
+import sys
+import json
+import time
+import argparse
+import resource
+import multiprocessing
+import Queue
+
+# User defined
+from Globals import *
+from Utilities import *
+
+from Corely import Field
+
+from Comparly import UnorderedDiff
+from Comparly import DistanceCalculator
+
+from SyslogGenerator import SyslogGenerator
+
+# Main
+class ComparlyBenchmark(object):
+    
+    # Setup logging
+    logger = Utilities.getLogger(__name__)
+    
+    # Seconds between checks on the process running a size
+    POLL_INTERVAL = 1.0
+    
+    def __init__(self, sizes, key_ratio=0.01, overlap=0.9, skew=1.0, seed=0, max_quadratic_size=10000, max_matrix_size=2000, timeout=None):
+        self.sizes = sizes
+        self.key_ratio = key_ratio
+        self.overlap = overlap
+        self.skew = skew
+        self.seed = seed
+        self.max_quadratic_size = max_quadratic_size
+        self.max_matrix_size = max_matrix_size
+        self.timeout = timeout
+        self.filter = {'component': None, 'component_id': None, 'level': None, 'sub_msg':None }
+        self.weights = { 'component': 3, 'component_id': 1, 'level': 2, 'sub_msg': 2}
+        
+    def run(self):
+        results = { 'seed': self.seed, 'key_ratio': self.key_ratio, 'overlap': self.overlap, 'skew': self.skew, 'runs': [] }
+        
+        # Run every size in its own process so the peak memory is per size
+        for size in self.sizes:
+            queue = multiprocessing.Queue()
+            process = multiprocessing.Process(target=self.runSize, args=(size, queue))
+            process.start()
+            result = self.getResult(size, process, queue)
+            process.join()
+            
+            self.logger.debug('Finished the benchmark with %d events.' % (size))
+            results['runs'].append(result)
+            
+        return results
+    
+    def getResult(self, size, process, queue):
+        # Poll so a process that dies, usually out of memory, is reported
+        # instead of waiting on the queue forever
+        start = time.time()
+        while True:
+            try:
+                return queue.get(timeout=self.POLL_INTERVAL)
+            except Queue.Empty:
+                pass
+                
+            if process.exitcode != None:
+                try:
+                    return queue.get(timeout=self.POLL_INTERVAL)
+                except Queue.Empty:
+                    break
+                    
+            if self.timeout != None and time.time() - start > self.timeout:
+                process.terminate()
+                process.join()
+                break
+                
+        self.logger.error('The benchmark with %d events failed with exit code %s.' % (size, str(process.exitcode)))
+        
+        return { 'events': size, 'failed': True, 'exitcode': process.exitcode, 'seconds': { 'total': time.time() - start } }
+    
+    def runSize(self, size, queue):
+        key_count = max(1, int(size * self.key_ratio))
+        generator = SyslogGenerator(size, key_count, self.overlap, self.skew, self.seed)
+        filter_fields = self.createFilterFields(self.filter)
+        timings = {}
+        
+        start = time.time()
+        events_a, events_b = generator.generatePair()
+        timings['generate'] = time.time() - start
+        
+        start = time.time()
+        UnorderedDiff.filterEvents(events_a, filter_fields)
+        timings['filter'] = time.time() - start
+        
+        start = time.time()
+        matches_both, matches_a_only, matches_b_only = UnorderedDiff.indexedCompare(events_a, events_b, filter_fields)
+        timings['indexed_compare'] = time.time() - start
+        
+        # The original comparison is quadratic so only time the small sizes
+        if size <= self.max_quadratic_size:
+            start = time.time()
+            UnorderedDiff.compare(events_a, events_b, filter_fields)
+            timings['compare'] = time.time() - start
+            
+        start = time.time()
+        for event_a, event_b in zip(events_a, events_b):
+            DistanceCalculator.calculate(event_a, event_b, self.weights, True)
+        timings['distance'] = time.time() - start
+        
+        matrix_size = min(size, self.max_matrix_size)
+        start = time.time()
+        DistanceCalculator.pairwise(events_a[:matrix_size], events_b[:matrix_size], self.weights, True)
+        timings['pairwise_distance'] = time.time() - start
+        
+        queue.put({ 'events': size, 
+                    'keys': key_count,
+                    'matches_both': len(matches_both),
+                    'matches_a_only': len(matches_a_only),
+                    'matches_b_only': len(matches_b_only),
+                    'pairwise_size': matrix_size,
+                    'seconds': timings, 
+                    'peak_memory_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss })
+        
+    def createFilterFields(self, filter):
+        fields = []
+        for key, value in filter.iteritems():
+            fields.append( Field(value, [], key) )
+            
+        return fields
+    
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark the Comparly engines on synthetic syslogs.')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000, 1000000, 10000000])
+    parser.add_argument('--key-ratio', type=float, default=0.01)
+    parser.add_argument('--overlap', type=float, default=0.9)
+    parser.add_argument('--skew', type=float, default=1.0)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--timeout', type=float, default=None)
+    parser.add_argument('--output', default=None)
+    args = parser.parse_args()
+    
+    benchmark = ComparlyBenchmark(args.sizes, args.key_ratio, args.overlap, args.skew, args.seed, timeout=args.timeout)
+    results = json.dumps(benchmark.run(), indent=4, sort_keys=True)
+    
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(results)
+    else:
+        sys.stdout.write(results + '\n')
+    
@@ -0,0 +1,71 @@
+# ------------------------------------------------------
+#
+#   BenchParallelDiff.py
+#   By: Fred Stakem
+#   Created: 10.18.26
+#
+# ------------------------------------------------------
+
+
+# Libs
+import sys
+import time
+import multiprocessing
+
+# User defined
+from Globals import *
+from Utilities import *
+
+from Corely import Field
+
+from Comparly import UnorderedDiff
+from Comparly import ParallelDiff
+
+from SyslogGenerator import SyslogGenerator
+
+# Main
+class ParallelDiffBenchmark(object):
+    
+    # Setup logging
+    logger = Utilities.getLogger(__name__)
+    
+    def __init__(self, event_count=200000, key_count=5000, seed=0):
+        self.event_count = event_count
+        self.key_count = key_count
+        self.seed = seed
+        
+    def run(self):
+        generator = SyslogGenerator(self.event_count, self.key_count, 0.9, 1.0, self.seed)
+        events_a, events_b = generator.generatePair()
+        filter_fields = self.createFilterFields({'component': None, 'component_id': None, 'level': None, 'sub_msg':None })
+        
+        start = time.time()
+        UnorderedDiff.indexedCompare(events_a, events_b, filter_fields)
+        serial_time = time.time() - start
+        self.report('serial', serial_time, serial_time)
+        
+        workers = 1
+        while workers <= multiprocessing.cpu_count():
+            diff = ParallelDiff(workers)
+            start = time.time()
+            diff.compare(events_a, events_b, filter_fields)
+            self.report('%d workers' % (workers), time.time() - start, serial_time)
+            workers *= 2
+        
+    def report(self, name, elapsed, serial_time):
+        print('%-12s %10.3fs %8.2fx' % (name, elapsed, serial_time / elapsed))
+        
+    def createFilterFields(self, filter):
+        fields = []
+        for key, value in filter.iteritems():
+            fields.append( Field(value, [], key) )
+            
+        return fields
+    
+if __name__ == '__main__':
+    event_count = 200000
+    if len(sys.argv) > 1:
+        event_count = int(sys.argv[1])
+        
+    ParallelDiffBenchmark(event_count).run()
+    
@@ -0,0 +1,112 @@
+# ------------------------------------------------------
+#
+#   SyslogGenerator.py
+#   By: Fred Stakem
+#   Created: 10.18.26
+#
+# ------------------------------------------------------
+
+
+# Libs
+import random
+import bisect
+from datetime import datetime
+from datetime import timedelta
+
+# User defined
+from Globals import *
+from Utilities import *
+
+from Corely import Field
+from Corely import Event
+
+# Main
+class SyslogGenerator(object):
+    
+    # Setup logging
+    logger = Utilities.getLogger(__name__)
+    
+    # Event data
+    COMPONENTS = ['kernel', 'NetworkManager', 'rsyslogd', 'colord', 'dbus', 'avahi-daemon', 'cron', 'dhclient']
+    LEVELS = [None, None, 'info', 'warn', 'error']
+    MONTHS = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
+    
+    def __init__(self, event_count, key_count, overlap=0.9, skew=1.0, seed=0, host='ubuntu'):
+        self.event_count = event_count
+        self.key_count = key_count
+        self.overlap = overlap
+        self.skew = skew
+        self.seed = seed
+        self.host = host
+        self.start = datetime(2013, 7, 11, 9, 51, 12)
+        
+        # Zipf weights so a few keys repeat far more than the rest
+        self.cumulative_weights = []
+        total = 0.0
+        for rank in xrange(1, key_count + 1):
+            total += 1.0 / (rank ** skew)
+            self.cumulative_weights.append(total)
+        
+    def generatePair(self):
+        return (self.generateEvents(0), self.generateEvents(1))
+    
+    def generateEvents(self, side):
+        return [self.createEvent(i, timestamp, key_id) for i, timestamp, key_id in self.iterKeys(side)]
+    
+    def generateLines(self, side):
+        return [self.createLine(timestamp, key_id) for i, timestamp, key_id in self.iterKeys(side)]
+    
+    def iterKeys(self, side):
+        generator = random.Random(self.seed * 2 + side)
+        shared_count = int(self.key_count * self.overlap)
+        total = self.cumulative_weights[-1]
+        
+        for i in xrange(self.event_count):
+            rank = bisect.bisect_left(self.cumulative_weights, generator.random() * total)
+            rank = min(rank, self.key_count - 1)
+            
+            # Keys past the overlap are unique to each side
+            if rank >= shared_count:
+                key_id = self.key_count * (side + 1) + rank
+            else:
+                key_id = rank
+                
+            yield (i, self.start + timedelta(seconds=i), key_id)
+            
+    def getKeyData(self, key_id):
+        component = self.COMPONENTS[key_id % len(self.COMPONENTS)]
+        component_id = None
+        if component != 'kernel':
+            component_id = 100 + key_id % 997
+        level = self.LEVELS[key_id % len(self.LEVELS)]
+        sub_msg = 'Synthetic message %d for key %d' % (key_id % 101, key_id)
+        
+        return ('%s %s' % (self.host, component), component_id, level, sub_msg)
+        
+    def createEvent(self, index, timestamp_data, key_id):
+        component_data, component_id_data, level_data, sub_msg_data = self.getKeyData(key_id)
+        sub_msg = Field(sub_msg_data, [], 'sub_msg')
+        level = Field(level_data, [], 'level')
+        msg = Field(None, [level, sub_msg], 'msg')
+        component_id = Field(component_id_data, [], 'component_id')
+        component = Field(component_data, [], 'component')
+        source = Field(None, [component, component_id], 'source')
+        timestamp = Field(timestamp_data, [], 'timestamp')
+        event = Field(None, [timestamp, source, msg], 'event')
+        
+        return Event(index, event)
+    
+    def createLine(self, timestamp, key_id):
+        component, component_id, level, sub_msg = self.getKeyData(key_id)
+        
+        source = component
+        if component_id != None:
+            source = '%s[%d]' % (component, component_id)
+            
+        msg = sub_msg
+        if level != None:
+            msg = '<%s> %s' % (level, sub_msg)
+            
+        return '%s %2d %02d:%02d:%02d %s: %s' % (self.MONTHS[timestamp.month - 1], timestamp.day, timestamp.hour, 
+                                                 timestamp.minute, timestamp.second, source, msg)
+    
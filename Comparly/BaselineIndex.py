@@ -0,0 +1,160 @@
+# ------------------------------------------------------
+#
+#   BaselineIndex.py
+#   By: Fred Stakem
+#   Created: 10.18.26
+#
+# ------------------------------------------------------
+
+
+# Libs
+import json
+import struct
+import numpy
+
+# User defined
+from Globals import *
+from Utilities import *
+from UnorderedDiff import UnorderedDiff
+from CompactMatch import CompactMatch
+
+# Main
+class BaselineIndex(object):
+    
+    # Setup logging
+    logger = Utilities.getLogger(__name__)
+    
+    # File layout
+    MAGIC = 'CMPLYIDX'
+    VERSION = 1
+    HEADER = struct.Struct('<8sIIQQ')
+     
+    def __init__(self, filename):
+        self.filename = filename
+        
+        with open(filename, 'rb') as f:
+            magic, version, names_length, key_count, event_count = self.HEADER.unpack(f.read(self.HEADER.size))
+            if magic != self.MAGIC or version != self.VERSION:
+                raise ValueError('File %s is not a baseline index.' % (filename))
+            self.field_names = json.loads(f.read(names_length))
+            
+        # Map the arrays read only so worker processes share the pages
+        offset = self.align(self.HEADER.size + names_length)
+        self.fingerprints, offset = self.mapArray(numpy.uint64, key_count, offset)
+        self.counts, offset = self.mapArray(numpy.uint32, key_count, offset)
+        self.starts, offset = self.mapArray(numpy.uint64, key_count, offset)
+        self.indices, offset = self.mapArray(numpy.uint64, event_count, offset)
+        
+        self.logger.debug('Loaded %d keys and %d events from %s.' % (key_count, event_count, filename))
+        
+    def __len__(self):
+        return len(self.fingerprints)
+        
+    @classmethod
+    def compile(cls, events, filter_fields, filename):
+        cls.logger.debug('Compiling the baseline index %s.' % (filename))
+        field_names = UnorderedDiff.getFieldNames(filter_fields)
+        
+        # Group the event positions by key fingerprint, the event index can skip
+        # lines that failed to parse so it can not be used to find the event
+        groups = {}
+        for position, key in UnorderedDiff.iterKeyedPositions(events, filter_fields, field_names, None):
+            fingerprint = UnorderedDiff.hashKey(key)
+            groups.setdefault(fingerprint, []).append(position)
+        
+        fingerprints = numpy.array(sorted(groups.keys()), dtype=numpy.uint64)
+        counts = numpy.empty(len(fingerprints), dtype=numpy.uint32)
+        starts = numpy.empty(len(fingerprints), dtype=numpy.uint64)
+        indices = []
+        for i, fingerprint in enumerate(fingerprints):
+            group = groups[int(fingerprint)]
+            counts[i] = len(group)
+            starts[i] = len(indices)
+            indices.extend(group)
+        indices = numpy.array(indices, dtype=numpy.uint64)
+        
+        # Write the header and the aligned arrays
+        names = json.dumps(field_names)
+        with open(filename, 'wb') as f:
+            f.write(cls.HEADER.pack(cls.MAGIC, cls.VERSION, len(names), len(fingerprints), len(indices)))
+            f.write(names)
+            f.write('\0' * (cls.align(f.tell()) - f.tell()))
+            for array in [fingerprints, counts, starts, indices]:
+                f.write(array.tostring())
+                f.write('\0' * (cls.align(f.tell()) - f.tell()))
+                
+        cls.logger.debug('Compiled %d keys from %d events.' % (len(fingerprints), len(indices)))
+        
+        return cls(filename)
+    
+    def find(self, key):
+        fingerprint = numpy.uint64(UnorderedDiff.hashKey(key))
+        i = numpy.searchsorted(self.fingerprints, fingerprint)
+        if i < len(self.fingerprints) and self.fingerprints[i] == fingerprint:
+            return i
+        
+        return None
+    
+    def getIndices(self, i):
+        start = int(self.starts[i])
+        return self.indices[start:start + int(self.counts[i])].tolist()
+    
+    def compare(self, events, filter_fields, baseline_events=None):
+        self.logger.debug('Starting the comparison against the baseline index.')
+        
+        # Input
+        field_names = UnorderedDiff.getFieldNames(filter_fields)
+        if field_names != self.field_names:
+            raise ValueError('The filter fields do not match the baseline index fields.')
+        
+        # Output
+        matches_both = []
+        matches_a_only = []
+        matches_b_only = []
+        
+        # Group the new event positions by key against the baseline
+        found = numpy.zeros(len(self.fingerprints), dtype=bool)
+        matches = {}
+        for position, event in enumerate(events):
+            if not event.field.containsFields(filter_fields):
+                continue
+                
+            key = UnorderedDiff.getKey(event, field_names)
+            match = matches.get(key)
+            if match is None:
+                match = CompactMatch(key, field_names, baseline_events, events)
+                matches[key] = match
+                
+                i = self.find(key)
+                if i == None:
+                    matches_b_only.append(match)
+                else:
+                    found[i] = True
+                    match.positions_a.extend(self.getIndices(i))
+                    matches_both.append(match)
+                    
+            match.positions_b.append(position)
+            
+        # The baseline only holds fingerprints so the key is only known once
+        # the match is bound to the baseline events
+        for i in numpy.flatnonzero(~found):
+            match = CompactMatch(None, field_names, baseline_events, events)
+            match.positions_a.extend(self.getIndices(i))
+            matches_a_only.append(match)
+            
+        self.logger.debug('Finished the comparison.')
+        
+        return (matches_both, matches_a_only, matches_b_only)
+    
+    def mapArray(self, dtype, length, offset):
+        if length == 0:
+            return (numpy.zeros(0, dtype=dtype), offset)
+        
+        array = numpy.memmap(self.filename, dtype=dtype, mode='r', offset=offset, shape=(length,))
+        
+        return (array, self.align(offset + array.nbytes))
+    
+    @classmethod
+    def align(cls, offset):
+        return (offset + 7) // 8 * 8
+    
@@ -0,0 +1,112 @@
+# ------------------------------------------------------
+#
+#   BatchRunner.py
+#   By: Fred Stakem
+#   Created: 10.18.26
+#
+# ------------------------------------------------------
+
+
+# Libs
+import os
+import json
+import time
+import traceback
+import multiprocessing
+
+# User defined
+from Globals import *
+from Utilities import *
+from EventLoader import EventLoader
+from UnorderedDiff import UnorderedDiff
+
+# Workers
+_loaders = {}
+
+def _comparePair(args):
+    name, filename_a, filename_b, factory, filter_fields, method, separator = args
+    start = time.time()
+    summary = { 'name': name, 'file_a': filename_a, 'file_b': filename_b }
+    
+    try:
+        # Build the lexer and parser once per worker process
+        loader = _loaders.get(factory)
+        if loader == None:
+            lexer, parser = factory()
+            loader = EventLoader(lexer, parser, None, None, separator)
+            _loaders[factory] = loader
+            
+        events_a = loader.load(filename_a)
+        summary['errors_a'] = len(loader.errors)
+        events_b = loader.load(filename_b)
+        summary['errors_b'] = len(loader.errors)
+        
+        matches_both, matches_a_only, matches_b_only = getattr(UnorderedDiff, method)(events_a, events_b, filter_fields)
+        summary['events_a'] = len(events_a)
+        summary['events_b'] = len(events_b)
+        summary['both'] = len(matches_both)
+        summary['a_only'] = len(matches_a_only)
+        summary['b_only'] = len(matches_b_only)
+    except Exception:
+        # One bad pair should not stop the batch
+        summary['error'] = traceback.format_exc()
+        
+    summary['seconds'] = time.time() - start
+    
+    return summary
+
+# Main
+class BatchRunner(object):
+    
+    # Setup logging
+    logger = Utilities.getLogger(__name__)
+    
+    def __init__(self, factory, filter_fields, workers=None, method='compare', separator='\n'):
+        self.factory = factory
+        self.filter_fields = filter_fields
+        self.workers = workers or multiprocessing.cpu_count()
+        self.method = method
+        self.separator = separator
+        self.unpaired = []
+    
+    def run(self, directory_a, directory_b, results_filename):
+        self.logger.debug('Comparing the logs in %s against %s.' % (directory_a, directory_b))
+        
+        # Start the biggest pairs first so no large pair is left for the end
+        pairs = self.getPairs(directory_a, directory_b)
+        pairs.sort(key=lambda pair: os.path.getsize(pair[1]) + os.path.getsize(pair[2]), reverse=True)
+        tasks = [(name, filename_a, filename_b, self.factory, self.filter_fields, self.method, self.separator)
+                 for name, filename_a, filename_b in pairs]
+                 
+        summaries = []
+        pool = multiprocessing.Pool(min(self.workers, max(len(tasks), 1)))
+        try:
+            with open(results_filename, 'w') as f:
+                # Write each summary as soon as its pair finishes
+                for summary in pool.imap_unordered(_comparePair, tasks, 1):
+                    f.write(json.dumps(summary, sort_keys=True) + '\n')
+                    f.flush()
+                    summaries.append(summary)
+                    self.logger.debug('Finished the pair %s in %.3f seconds.' % (summary['name'], summary['seconds']))
+            pool.close()
+        except:
+            pool.terminate()
+            raise
+        finally:
+            pool.join()
+            
+        self.logger.debug('Compared %d pairs with %d unpaired files.' % (len(summaries), len(self.unpaired)))
+        
+        return summaries
+    
+    def getPairs(self, directory_a, directory_b):
+        names_a = set([name for name in os.listdir(directory_a) if os.path.isfile(os.path.join(directory_a, name))])
+        names_b = set([name for name in os.listdir(directory_b) if os.path.isfile(os.path.join(directory_b, name))])
+        self.unpaired = sorted(names_a ^ names_b)
+        
+        pairs = []
+        for name in sorted(names_a & names_b):
+            pairs.append( (name, os.path.join(directory_a, name), os.path.join(directory_b, name)) )
+            
+        return pairs
+
@@ -0,0 +1,67 @@
+# ------------------------------------------------------
+#
+#   CompactMatch.py
+#   By: Fred Stakem
+#   Created: 10.18.26
+#
+# ------------------------------------------------------
+
+
+# Libs
+from array import array
+
+# User defined
+from Globals import *
+from Utilities import *
+
+# Main
+class CompactMatch(object):
+    
+    # Positions into the source logs instead of event objects
+    __slots__ = ['key', 'field_names', 'positions_a', 'positions_b', 'events_a', 'events_b']
+    
+    def __init__(self, key, field_names, events_a=None, events_b=None):
+        self.key = key
+        self.field_names = field_names
+        self.positions_a = array('l')
+        self.positions_b = array('l')
+        self.events_a = events_a
+        self.events_b = events_b
+    
+    @property
+    def matches_a(self):
+        return [self.events_a[i] for i in self.positions_a]
+    
+    @property
+    def matches_b(self):
+        return [self.events_b[i] for i in self.positions_b]
+    
+    @property
+    def fields(self):
+        if len(self.positions_a) > 0:
+            event = self.events_a[self.positions_a[0]]
+        else:
+            event = self.events_b[self.positions_b[0]]
+            
+        return event.field.getFields(self.field_names)
+    
+    def bind(self, events_a, events_b):
+        self.events_a = events_a
+        self.events_b = events_b
+    
+    def __getstate__(self):
+        # Leave the logs behind so only the key and positions are stored
+        return (self.key, self.field_names, self.positions_a.tostring(), self.positions_b.tostring())
+    
+    def __setstate__(self, state):
+        self.key, self.field_names, positions_a, positions_b = state
+        self.positions_a = array('l')
+        self.positions_a.fromstring(positions_a)
+        self.positions_b = array('l')
+        self.positions_b.fromstring(positions_b)
+        self.events_a = None
+        self.events_b = None
+    
+    def __str__(self):
+        return 'CompactMatch(key=%s, a=%d, b=%d)' % (str(self.key), len(self.positions_a), len(self.positions_b))
+
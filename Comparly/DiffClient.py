@@ -0,0 +1,51 @@
+# ------------------------------------------------------
+#
+#   DiffClient.py
+#   By: Fred Stakem
+#   Created: 10.18.26
+#
+# ------------------------------------------------------
+
+
+# Libs
+import json
+import socket
+
+# User defined
+from Globals import *
+from Utilities import *
+
+# Main
+class DiffClient(object):
+    
+    # Setup logging
+    logger = Utilities.getLogger(__name__)
+     
+    def __init__(self, address, timeout=None):
+        self.socket = socket.create_connection(address, timeout)
+        self.rfile = self.socket.makefile('rb')
+        
+    def request(self, request):
+        self.socket.sendall(json.dumps(request) + '\n')
+        response = json.loads(self.rfile.readline())
+        if response['status'] != 'ok':
+            raise ValueError(response['message'])
+        
+        return response
+    
+    def load(self, name, filename):
+        return self.request({ 'command': 'load', 'name': name, 'filename': filename })
+    
+    def compare(self, name, filename=None, lines=None, limit=100):
+        request = { 'command': 'compare', 'name': name, 'limit': limit }
+        if filename != None:
+            request['filename'] = filename
+        else:
+            request['lines'] = lines
+            
+        return self.request(request)
+    
+    def close(self):
+        self.rfile.close()
+        self.socket.close()
+    
@@ -0,0 +1,166 @@
+# ------------------------------------------------------
+#
+#   DiffServer.py
+#   By: Fred Stakem
+#   Created: 10.18.26
+#
+# ------------------------------------------------------
+
+
+# Libs
+import os
+import json
+import threading
+import traceback
+import SocketServer
+
+# User defined
+from Globals import *
+from Utilities import *
+from EventLoader import EventLoader
+from UnorderedDiff import UnorderedDiff
+
+# Request handling
+class _DiffRequestHandler(SocketServer.StreamRequestHandler):
+    
+    def handle(self):
+        # One JSON request per line and one JSON response per line
+        for line in iter(self.rfile.readline, ''):
+            if len(line.strip()) == 0:
+                continue
+                
+            try:
+                request = json.loads(line)
+                response = self.server.diff_server.handleRequest(request)
+            except Exception as e:
+                DiffServer.logger.debug('Failed request:\n%s' % (traceback.format_exc()))
+                response = { 'status': 'error', 'message': str(e) }
+                
+            self.wfile.write(json.dumps(response, default=str) + '\n')
+            self.wfile.flush()
+            
+class _ThreadingServer(SocketServer.ThreadingMixIn, SocketServer.TCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+    
+# Main
+class DiffServer(object):
+    
+    # Setup logging
+    logger = Utilities.getLogger(__name__)
+    
+    def __init__(self, factory, filter_fields, host='localhost', port=0, separator='\n', directory=None):
+        self.factory = factory
+        self.directory = None if directory == None else os.path.realpath(directory)
+        self.filter_fields = filter_fields
+        self.field_names = UnorderedDiff.getFieldNames(filter_fields)
+        self.separator = separator
+        self.baselines = {}
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.server = _ThreadingServer((host, port), _DiffRequestHandler)
+        self.server.diff_server = self
+        self.address = self.server.server_address
+        self.thread = None
+    
+    def start(self):
+        self.thread = threading.Thread(target=self.server.serve_forever)
+        self.thread.daemon = True
+        self.thread.start()
+        self.logger.debug('Serving diffs on %s:%d.' % self.address)
+    
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+        if self.thread != None:
+            self.thread.join()
+            self.thread = None
+    
+    def handleRequest(self, request):
+        command = request.get('command')
+        if command == 'load':
+            events, errors = self.loadEvents(request)
+            return self.loadBaseline(request['name'], events, errors)
+        elif command == 'compare':
+            events, errors = self.loadEvents(request)
+            return self.compareBaseline(request['name'], events, errors, request.get('limit', 100))
+        elif command == 'drop':
+            with self.lock:
+                self.baselines.pop(request['name'], None)
+            return { 'status': 'ok' }
+        elif command == 'list':
+            with self.lock:
+                names = sorted(self.baselines.keys())
+            return { 'status': 'ok', 'names': names }
+            
+        raise ValueError('Unknown command %s.' % (command))
+    
+    def getLoader(self):
+        # Lexers keep state so every handler thread gets its own
+        loader = getattr(self.local, 'loader', None)
+        if loader == None:
+            lexer, parser = self.factory()
+            loader = EventLoader(lexer, parser, None, None, self.separator)
+            self.local.loader = loader
+            
+        return loader
+    
+    def loadEvents(self, request):
+        loader = self.getLoader()
+        if 'filename' in request:
+            events = loader.load(self.getPath(request['filename']))
+        else:
+            events = loader.parseData([line.encode('utf-8') for line in request['lines']])
+            
+        return (events, len(loader.errors))
+    
+    def getPath(self, filename):
+        # Clients may only name files inside the log directory
+        if self.directory == None:
+            raise ValueError('The server does not load files.')
+            
+        path = os.path.realpath(os.path.join(self.directory, filename))
+        if not path.startswith(self.directory + os.sep):
+            raise ValueError('File %s is outside of the log directory.' % (filename))
+            
+        return path
+    
+    def loadBaseline(self, name, events, errors=0):
+        # Keep only the key counts of the baseline resident
+        counts = {}
+        for event, key in UnorderedDiff.iterKeyedEvents(events, self.filter_fields, self.field_names):
+            counts[key] = counts.get(key, 0) + 1
+            
+        with self.lock:
+            self.baselines[name] = counts
+            
+        self.logger.debug('Loaded the baseline %s with %d keys.' % (name, len(counts)))
+        
+        return { 'status': 'ok', 'events': len(events), 'errors': errors, 'keys': len(counts) }
+    
+    def compareBaseline(self, name, events, errors=0, limit=100):
+        with self.lock:
+            baseline = self.baselines.get(name)
+        if baseline == None:
+            raise ValueError('Unknown baseline %s.' % (name))
+            
+        # Only the new log is keyed, the baseline is already counted
+        counts = {}
+        for event, key in UnorderedDiff.iterKeyedEvents(events, self.filter_fields, self.field_names):
+            counts[key] = counts.get(key, 0) + 1
+            
+        keys_both = [key for key in counts if key in baseline]
+        keys_a_only = [key for key in baseline if key not in counts]
+        keys_b_only = [key for key in counts if key not in baseline]
+        
+        return { 'status': 'ok',
+                 'events': len(events),
+                 'errors': errors,
+                 'both': len(keys_both),
+                 'a_only': len(keys_a_only),
+                 'b_only': len(keys_b_only),
+                 'events_a_only': sum([baseline[key] for key in keys_a_only]),
+                 'events_b_only': sum([counts[key] for key in keys_b_only]),
+                 'a_only_keys': sorted(keys_a_only)[:limit],
+                 'b_only_keys': sorted(keys_b_only)[:limit] }
+
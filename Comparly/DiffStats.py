@@ -0,0 +1,61 @@
+# ------------------------------------------------------
+#
+#   DiffStats.py
+#   By: Fred Stakem
+#   Created: 10.18.26
+#
+# ------------------------------------------------------
+
+
+# Libs
+import json
+
+# User defined
+from Globals import *
+from Utilities import *
+from PhaseStats import PhaseStats
+
+# Main
+class DiffStats(object):
+    
+    # Setup logging
+    logger = Utilities.getLogger(__name__)
+     
+    def __init__(self, callback=None):
+        self.callback = callback
+        self.phases = {}
+        self.order = []
+        
+    def getPhase(self, name):
+        phase = self.phases.get(name)
+        if phase == None:
+            phase = PhaseStats(name)
+            self.phases[name] = phase
+            self.order.append(name)
+            
+        return phase
+        
+    def start(self, name):
+        self.getPhase(name).start()
+        
+    def stop(self, name, events_in=0, events_out=0, comparisons=0):
+        self.getPhase(name).stop(events_in, events_out, comparisons)
+        self.notify(name)
+        
+    def notify(self, name):
+        if self.callback != None:
+            self.callback(self.phases[name])
+            
+    def reset(self):
+        self.phases = {}
+        self.order = []
+        
+    def to_dict(self):
+        return dict([(name, self.phases[name].to_dict()) for name in self.order])
+    
+    def to_pretty_json(self):
+        return json.dumps(self.to_dict(), indent=4, sort_keys=True)
+    
+    def __str__(self):
+        return '\n'.join([str(self.phases[name]) for name in self.order])
+    
@@ -8,11 +8,12 @@
 
 
 # Libs
-# None
+import numpy
 
 # User defined
 from Globals import *
 from Utilities import *
+from EventTable import EventTable
 
 # Main
 class DistanceCalculator(object):
@@ -20,8 +21,15 @@ class DistanceCalculator(object):
     # Setup logging
     logger = Utilities.getLogger(__name__)
     
+    # Codes for missing fields so they never match each other
+    MISSING_A = -1
+    MISSING_B = -2
+    
     @classmethod  
-    def calculate(cls, event_a, event_b, weights, normalize):
+    def calculate(cls, event_a, event_b, weights, normalize, stats=None):
+        if stats is not None:
+            stats.start('calculate')
+            
         distance = 0.0
         if normalize:
             weights = cls.normalizeWeights(weights)
@@ -32,9 +40,97 @@ class DistanceCalculator(object):
             
             if (field_a != field_b) or (field_a == None and field_b == None):
                 distance += value
+                
+        if stats is not None:
+            stats.stop('calculate', 2, 0, len(weights))
             
         return distance
                 
+    @classmethod
+    def pairwise(cls, events_a, events_b, weights, normalize, block_size=1024, stats=None):
+        if not isinstance(events_a, EventTable):
+            events_a = list(events_a)
+        if not isinstance(events_b, EventTable):
+            events_b = list(events_b)
+        distances = numpy.zeros((len(events_a), len(events_b)))
+        
+        for start, block in cls.iterPairwise(events_a, events_b, weights, normalize, block_size, stats):
+            distances[start:start + len(block)] = block
+            
+        return distances
+    
+    @classmethod
+    def iterPairwise(cls, events_a, events_b, weights, normalize, block_size=1024, stats=None):
+        if normalize:
+            weights = cls.normalizeWeights(weights)
+            
+        # Encode each weighted field once
+        if stats is not None:
+            stats.start('encode')
+            
+        keys = weights.keys()
+        columns_a, columns_b = cls.encodeColumns(events_a, events_b, keys)
+        
+        if stats is not None:
+            stats.stop('encode', len(events_a) + len(events_b), len(events_a) + len(events_b))
+            score = stats.getPhase('score')
+        
+        # Score blocks of log A against all of log B
+        for start in xrange(0, len(events_a), block_size):
+            if stats is not None:
+                score.start()
+                
+            end = min(start + block_size, len(events_a))
+            block = numpy.zeros((end - start, len(events_b)))
+            
+            for key in keys:
+                mismatches = columns_a[key][start:end, numpy.newaxis] != columns_b[key][numpy.newaxis, :]
+                block += mismatches * weights[key]
+                
+            if stats is not None:
+                score.stop(end - start, end - start, (end - start) * len(events_b) * len(keys))
+                
+            yield (start, block)
+            
+        if stats is not None:
+            stats.notify('score')
+    
+    @classmethod
+    def encodeColumns(cls, events_a, events_b, keys):
+        columns_a = {}
+        columns_b = {}
+        
+        # Tables sharing a codebook are already encoded
+        if isinstance(events_a, EventTable) and isinstance(events_b, EventTable):
+            if events_a.codebook is not events_b.codebook:
+                raise ValueError('Event tables must share a codebook.')
+            
+            for key in keys:
+                columns_a[key] = events_a.columns[key]
+                columns_b[key] = numpy.where(events_b.columns[key] == EventTable.MISSING, cls.MISSING_B, events_b.columns[key])
+                
+            return (columns_a, columns_b)
+        
+        for key in keys:
+            codes = {}
+            columns_a[key] = cls.encodeColumn(events_a, key, codes, cls.MISSING_A)
+            columns_b[key] = cls.encodeColumn(events_b, key, codes, cls.MISSING_B)
+            
+        return (columns_a, columns_b)
+    
+    @classmethod
+    def encodeColumn(cls, events, key, codes, missing_code):
+        column = numpy.empty(len(events), dtype=numpy.int64)
+        
+        for i, event in enumerate(events):
+            field = event.field.getField(key)
+            if field == None:
+                column[i] = missing_code
+            else:
+                column[i] = codes.setdefault(field.value, len(codes))
+                
+        return column
+                
     @classmethod
     def normalizeWeights(cls, weights):
         normalized_weights = {}
@@ -0,0 +1,123 @@
+# ------------------------------------------------------
+#
+#   EventCache.py
+#   By: Fred Stakem
+#   Created: 10.18.26
+#
+# ------------------------------------------------------
+
+
+# Libs
+import os
+import zlib
+import cPickle
+import tempfile
+
+# User defined
+from Globals import *
+from Utilities import *
+
+# Main
+class EventCache(object):
+    
+    # Setup logging
+    logger = Utilities.getLogger(__name__)
+    
+    # Cache file extension
+    EXTENSION = '.events'
+     
+    def __init__(self, directory, max_bytes):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        
+        # File times are too coarse to order accesses from this process
+        self.clock = 0
+        self.accessed = {}
+        
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+        
+    def get(self, key):
+        filename = self.getFilename(key)
+        try:
+            with open(filename, 'rb') as f:
+                data = f.read()
+        except IOError:
+            self.misses += 1
+            return None
+        
+        # A truncated or corrupt entry is a miss and is removed
+        try:
+            events = cPickle.loads(zlib.decompress(data))
+        except Exception:
+            self.logger.debug('Removing the corrupt cache entry %s.' % (filename))
+            self.misses += 1
+            self.evictions += 1
+            self.remove(filename)
+            return None
+            
+        # Mark the entry as recently used
+        os.utime(filename, None)
+        self.touch(filename)
+        self.hits += 1
+        
+        return events
+    
+    def put(self, key, events):
+        data = zlib.compress(cPickle.dumps(events, cPickle.HIGHEST_PROTOCOL))
+        if len(data) > self.max_bytes:
+            self.logger.debug('Not caching %d bytes over the cache limit.' % (len(data)))
+            return False
+        
+        # Write then rename so readers never see a partial entry
+        handle, tmp_filename = tempfile.mkstemp(dir=self.directory)
+        with os.fdopen(handle, 'wb') as f:
+            f.write(data)
+        os.rename(tmp_filename, self.getFilename(key))
+        self.touch(self.getFilename(key))
+        
+        self.evict()
+        
+        return True
+    
+    def evict(self):
+        entries = []
+        total = 0
+        for name in os.listdir(self.directory):
+            if name.endswith(self.EXTENSION):
+                stat = os.stat(os.path.join(self.directory, name))
+                entries.append( (self.accessed.get(name, 0), stat.st_mtime, name, stat.st_size) )
+                total += stat.st_size
+                
+        # Remove the least recently used entries first, entries only used by
+        # other processes are older than any used here
+        entries.sort()
+        for access, mtime, name, size in entries:
+            if total <= self.max_bytes:
+                break
+            
+            self.remove(os.path.join(self.directory, name))
+            total -= size
+            self.evictions += 1
+            self.logger.debug('Evicted cache entry %s.' % (name))
+    
+    def touch(self, filename):
+        self.clock += 1
+        self.accessed[os.path.basename(filename)] = self.clock
+        
+    def remove(self, filename):
+        self.accessed.pop(os.path.basename(filename), None)
+        try:
+            os.remove(filename)
+        except OSError:
+            pass
+    
+    def getStats(self):
+        return { 'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions }
+    
+    def getFilename(self, key):
+        return os.path.join(self.directory, key + self.EXTENSION)
+    
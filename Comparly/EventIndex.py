@@ -0,0 +1,57 @@
+# ------------------------------------------------------
+#
+#   EventIndex.py
+#   By: Fred Stakem
+#   Created: 10.18.26
+#
+# ------------------------------------------------------
+
+
+# Libs
+from array import array
+
+# User defined
+from Globals import *
+from Utilities import *
+
+# Main
+class EventIndex(object):
+    
+    # Setup logging
+    logger = Utilities.getLogger(__name__)
+     
+    def __init__(self, events):
+        self.events = list(events)
+        self.indexes = {}
+        self.sorted_values = {}
+        
+    def __len__(self):
+        return len(self.events)
+    
+    def getIndex(self, name):
+        # Index a field the first time a filter asks for it
+        index = self.indexes.get(name)
+        if index == None:
+            index = {}
+            for position, event in enumerate(self.events):
+                field = event.field.getField(name)
+                if field != None:
+                    positions = index.get(field.value)
+                    if positions == None:
+                        positions = array('l')
+                        index[field.value] = positions
+                    positions.append(position)
+                    
+            self.indexes[name] = index
+            self.logger.debug('Indexed %d values of the field %s.' % (len(index), name))
+            
+        return index
+    
+    def getSortedValues(self, name):
+        values = self.sorted_values.get(name)
+        if values == None:
+            values = sorted([value for value in self.getIndex(name) if value != None])
+            self.sorted_values[name] = values
+            
+        return values
+    
@@ -0,0 +1,152 @@
+# ------------------------------------------------------
+#
+#   EventLoader.py
+#   By: Fred Stakem
+#   Created: 10.18.26
+#
+# ------------------------------------------------------
+
+
+# Libs
+import hashlib
+
+# User defined
+from Globals import *
+from Utilities import *
+from Corely import Event
+from Lexly import RawEventSeparator
+from Lexly import Token
+
+# Main
+class EventLoader(object):
+    
+    # Setup logging
+    logger = Utilities.getLogger(__name__)
+    
+    # Objects from these modules are not part of a parser configuration
+    UNHASHED_MODULES = ('logging', 'threading', 'thread')
+    
+    # Attributes the lexer and parser fill in for the last event they handled
+    RUN_STATE_ATTRIBUTES = ('tokens', 'errors', 'fields', 'stream')
+     
+    def __init__(self, lexer, parser, config_id=None, cache=None, separator='\n'):
+        self.lexer = lexer
+        self.parser = parser
+        self.cache = cache
+        self.config_id = None
+        
+        # Cached events are only valid for the lexer and parser that made them,
+        # the caller's id only adds to the hash of their configuration
+        if cache != None:
+            self.config_id = self.getConfigId(lexer, parser, config_id)
+        self.separator = separator
+        self.errors = []
+        
+    def load(self, filename):
+        self.logger.debug('Loading events from file %s.' % (filename))
+        data = Utilities.readDataFromFile(filename)
+        
+        key = None
+        if self.cache != None:
+            key = self.getCacheKey(data)
+            entry = self.cache.get(key)
+            if entry != None:
+                events, self.errors = entry
+                self.logger.debug('Found %d cached events for file %s.' % (len(events), filename))
+                return events
+            
+        separator = RawEventSeparator(self.separator, 'Event Loader RawEventSeparator')
+        events = self.parseData(separator.seperateEvents(data))
+        
+        if self.cache != None:
+            self.cache.put(key, (events, self.errors))
+            
+        return events
+    
+    def getCacheKey(self, data):
+        digest = hashlib.sha1(data).hexdigest()
+        return hashlib.sha1(digest + '\0' + self.config_id).hexdigest()
+    
+    @classmethod
+    def getConfigId(cls, lexer, parser, config_id=None):
+        digest = hashlib.sha1()
+        cls.hashConfig(digest, (lexer, parser, config_id), {})
+        
+        return digest.hexdigest()
+    
+    @classmethod
+    def hashConfig(cls, digest, value, seen):
+        if value == None or isinstance(value, (bool, int, long, float, basestring)):
+            digest.update(repr(value) + '\0')
+            return
+            
+        # Lexer states point back at each other so hash a repeat by its order
+        if id(value) in seen:
+            digest.update('<ref %d>\0' % (seen[id(value)]))
+            return
+        seen[id(value)] = len(seen)
+        
+        value_type = type(value)
+        digest.update('<%s.%s>\0' % (value_type.__module__, value_type.__name__))
+        if value_type.__module__ in cls.UNHASHED_MODULES:
+            return
+        elif isinstance(value, (list, tuple)):
+            for item in value:
+                cls.hashConfig(digest, item, seen)
+        elif isinstance(value, dict):
+            for key in sorted(value.keys()):
+                cls.hashConfig(digest, key, seen)
+                cls.hashConfig(digest, value[key], seen)
+        elif isinstance(value, (set, frozenset)):
+            for item in sorted(value):
+                cls.hashConfig(digest, item, seen)
+        elif hasattr(value, 'pattern') and hasattr(value, 'flags'):
+            cls.hashConfig(digest, (value.pattern, value.flags), seen)
+        elif hasattr(value, '__dict__') and not callable(value):
+            cls.hashConfig(digest, cls.getConfigAttributes(value, vars(value).keys()), seen)
+        elif hasattr(value_type, '__slots__') and not callable(value):
+            cls.hashConfig(digest, cls.getConfigAttributes(value, value_type.__slots__), seen)
+        elif hasattr(value, '__name__'):
+            digest.update('%s.%s\0' % (getattr(value, '__module__', ''), value.__name__))
+    
+    @classmethod
+    def getConfigAttributes(cls, value, names):
+        # A lexer that already ran keeps its last tokens and errors, leave them
+        # out so it has the same id as a new one
+        attributes = {}
+        for name in names:
+            if name not in cls.RUN_STATE_ATTRIBUTES:
+                attributes[name] = getattr(value, name, None)
+                
+        return attributes
+    
+    def parseData(self, raw_events, first_index=0):
+        events = []
+        self.errors = []
+        for i, raw_event in enumerate(raw_events):
+            event = self.parseEvent(first_index + i, raw_event)
+            if event != None:
+                events.append(event)
+                
+        self.logger.debug('Found %d errors parsing %d events.' % (len(self.errors), len(raw_events)))
+        
+        return events
+    
+    def parseEvent(self, index, raw_event):
+        token = Token('event', Token.ALWAYS_DATA, False, raw_event)
+        self.lexer.start(token)
+        tokens = self.lexer.getAllTokens()
+        errors = self.lexer.getAllErrors()
+        
+        if len(errors) > 0:
+            self.errors.append((index, errors))
+            return None
+        
+        self.parser.start(tokens)
+        errors = self.parser.getAllErrors()
+        if len(errors) > 0:
+            self.errors.append((index, errors))
+            return None
+        
+        return Event(index, self.parser.getAllFields())
+    
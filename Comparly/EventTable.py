@@ -0,0 +1,104 @@
+# ------------------------------------------------------
+#
+#   EventTable.py
+#   By: Fred Stakem
+#   Created: 10.18.26
+#
+# ------------------------------------------------------
+
+
+# Libs
+import numpy
+
+# User defined
+from Globals import *
+from Utilities import *
+
+# Main
+class EventTable(object):
+    
+    # Setup logging
+    logger = Utilities.getLogger(__name__)
+    
+    # Code for a field the event does not have
+    MISSING = -1
+     
+    def __init__(self, events, field_names, codebook=None):
+        self.events = list(events)
+        self.field_names = list(field_names)
+        self.codebook = codebook if codebook != None else {}
+        self.columns = {}
+        self.decoders = {}
+        
+        for name in self.field_names:
+            self.columns[name] = self.encodeColumn(name)
+            
+        self.logger.debug('Encoded %d events with %d fields.' % (len(self.events), len(self.field_names)))
+        
+    def __len__(self):
+        return len(self.events)
+    
+    def __iter__(self):
+        return iter(self.events)
+    
+    def __getitem__(self, row):
+        return self.events[row]
+    
+    def encodeColumn(self, name):
+        codes = self.codebook.setdefault(name, {})
+        column = numpy.empty(len(self.events), dtype=numpy.int32)
+        
+        for row, event in enumerate(self.events):
+            field = event.field.getField(name)
+            if field == None:
+                column[row] = self.MISSING
+            else:
+                column[row] = codes.setdefault(field.value, len(codes))
+                
+        return column
+    
+    def getCode(self, name, value):
+        return self.codebook[name].get(value, self.MISSING)
+    
+    def getValue(self, row, name):
+        code = self.columns[name][row]
+        if code == self.MISSING:
+            return None
+        
+        # Rebuild the decoder when a shared codebook has grown
+        codes = self.codebook[name]
+        values = self.decoders.get(name)
+        if values == None or len(values) != len(codes):
+            values = [None] * len(codes)
+            for value, value_code in codes.iteritems():
+                values[value_code] = value
+            self.decoders[name] = values
+            
+        return values[code]
+    
+    def filter(self, filter_fields):
+        selected = numpy.ones(len(self.events), dtype=bool)
+        
+        # Match Field.containsFields where a None value is a wildcard
+        for field in filter_fields:
+            column = self.columns[field.name]
+            selected &= column != self.MISSING
+            if field.value != None:
+                code = self.getCode(field.name, field.value)
+                selected &= column == code
+                
+        return numpy.flatnonzero(selected)
+    
+    def getKeys(self, rows, field_names):
+        columns = []
+        for name in field_names:
+            column = self.columns[name][rows].tolist()
+            
+            # Keep None values so they still act as wildcards
+            none_code = self.codebook[name].get(None)
+            if none_code != None:
+                column = [None if code == none_code else code for code in column]
+            columns.append(column)
+            
+        return zip(*columns)
+    
@@ -0,0 +1,130 @@
+# ------------------------------------------------------
+#
+#   FilterCompiler.py
+#   By: Fred Stakem
+#   Created: 10.18.26
+#
+# ------------------------------------------------------
+
+
+# Libs
+import bisect
+
+# User defined
+from Globals import *
+from Utilities import *
+from Corely import Field
+from ValueRange import ValueRange
+
+# Main
+class FilterCompiler(object):
+    
+    # Setup logging
+    logger = Utilities.getLogger(__name__)
+    
+    # Condition kinds
+    ANY = 'any'
+    EQUAL = 'equal'
+    SET = 'set'
+    RANGE = 'range'
+    REGEX = 'regex'
+    
+    def __init__(self, spec):
+        # Filter fields from the existing filters compile the same way
+        if not isinstance(spec, dict):
+            spec = dict([(field.name, field.value) for field in spec])
+            
+        self.field_names = sorted(spec.keys())
+        self.conditions = []
+        for name in self.field_names:
+            kind, condition = self.getKind(spec[name])
+            self.conditions.append( (name, kind, condition, self.compileTest(kind, condition)) )
+    
+    @classmethod
+    def getKind(cls, condition):
+        if condition == None:
+            return (cls.ANY, None)
+        elif isinstance(condition, ValueRange):
+            return (cls.RANGE, condition)
+        elif hasattr(condition, 'search'):
+            return (cls.REGEX, condition)
+        elif isinstance(condition, (set, frozenset, list)):
+            return (cls.SET, frozenset(condition))
+            
+        return (cls.EQUAL, condition)
+    
+    @classmethod
+    def compileTest(cls, kind, condition):
+        if kind == cls.ANY:
+            return lambda value: True
+        elif kind == cls.RANGE:
+            return condition.contains
+        elif kind == cls.REGEX:
+            return lambda value: isinstance(value, basestring) and condition.search(value) != None
+        elif kind == cls.SET:
+            return lambda value: value in condition
+            
+        return lambda value: value == condition
+    
+    def matches(self, event):
+        for name, kind, condition, test in self.conditions:
+            field = event.field.getField(name)
+            if field == None or not test(field.value):
+                return False
+                
+        return True
+    
+    def filterEvents(self, events):
+        return [event for event in events if self.matches(event)]
+    
+    def iterFilterEvents(self, events):
+        for event in events:
+            if self.matches(event):
+                yield event
+    
+    def select(self, index):
+        # Start from the fewest candidates any indexed condition allows
+        candidates = None
+        for name, kind, condition, test in self.conditions:
+            if kind == self.ANY:
+                continue
+                
+            positions = self.getPositions(index, name, kind, condition, test)
+            if candidates == None or len(positions) < len(candidates):
+                candidates = positions
+                
+        if candidates == None:
+            return self.filterEvents(index.events)
+            
+        # The other conditions are checked on the candidates only
+        events = index.events
+        selected = [events[position] for position in sorted(candidates) if self.matches(events[position])]
+        
+        self.logger.debug('Selected %d events from %d candidates.' % (len(selected), len(candidates)))
+        
+        return selected
+    
+    def getPositions(self, index, name, kind, condition, test):
+        values = index.getIndex(name)
+        if kind == self.EQUAL:
+            return values.get(condition, [])
+        elif kind == self.SET:
+            selected = [value for value in condition if value in values]
+        elif kind == self.RANGE:
+            sorted_values = index.getSortedValues(name)
+            start = 0 if condition.low == None else bisect.bisect_left(sorted_values, condition.low)
+            end = len(sorted_values) if condition.high == None else bisect.bisect_right(sorted_values, condition.high)
+            selected = sorted_values[start:end]
+        else:
+            selected = [value for value in values if test(value)]
+            
+        positions = []
+        for value in selected:
+            positions.extend(values[value])
+            
+        return positions
+    
+    def getFilterFields(self):
+        # Wildcards over the same fields to key the selected events with
+        return [Field(None, [], name) for name in self.field_names]
+
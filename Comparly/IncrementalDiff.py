@@ -0,0 +1,103 @@
+# ------------------------------------------------------
+#
+#   IncrementalDiff.py
+#   By: Fred Stakem
+#   Created: 10.18.26
+#
+# ------------------------------------------------------
+
+
+# Libs
+# None
+
+# User defined
+from Globals import *
+from Utilities import *
+from Corely import EventMatch
+from UnorderedDiff import UnorderedDiff
+
+# Main
+class IncrementalDiff(object):
+    
+    # Setup logging
+    logger = Utilities.getLogger(__name__)
+     
+    def __init__(self, filter_fields):
+        self.filter_fields = filter_fields
+        self.field_names = UnorderedDiff.getFieldNames(filter_fields)
+        self.matches = {}
+        self.categories = { UnorderedDiff.BOTH: {}, UnorderedDiff.A_ONLY: {}, UnorderedDiff.B_ONLY: {} }
+        self.listeners = []
+        
+    def addListener(self, listener):
+        self.listeners.append(listener)
+        
+    def removeListener(self, listener):
+        self.listeners.remove(listener)
+      
+    def addEventA(self, event):
+        return self.addEvent(event, True)
+    
+    def addEventB(self, event):
+        return self.addEvent(event, False)
+    
+    def addEvent(self, event, from_a):
+        if not event.field.containsFields(self.filter_fields):
+            return None
+        
+        key = UnorderedDiff.getKey(event, self.field_names)
+        match = self.matches.get(key)
+        if match is None:
+            match = EventMatch(event.field.getFields(self.field_names))
+            self.matches[key] = match
+            old_category = None
+        else:
+            old_category = self.getCategory(match)
+            
+        if from_a:
+            match.matches_a.append(event)
+        else:
+            match.matches_b.append(event)
+            
+        # Move the key only when its classification changes
+        new_category = self.getCategory(match)
+        if new_category != old_category:
+            if old_category != None:
+                del self.categories[old_category][key]
+            self.categories[new_category][key] = match
+            
+            for listener in self.listeners:
+                listener(key, old_category, new_category, match)
+                
+        return new_category
+    
+    def getCategory(self, match):
+        if len(match.matches_a) == 0:
+            return UnorderedDiff.B_ONLY
+        elif len(match.matches_b) == 0:
+            return UnorderedDiff.A_ONLY
+        else:
+            return UnorderedDiff.BOTH
+    
+    def getState(self):
+        return (self.categories[UnorderedDiff.BOTH].values(), 
+                self.categories[UnorderedDiff.A_ONLY].values(), 
+                self.categories[UnorderedDiff.B_ONLY].values())
+    
+    def getCounts(self):
+        return (len(self.categories[UnorderedDiff.BOTH]), 
+                len(self.categories[UnorderedDiff.A_ONLY]), 
+                len(self.categories[UnorderedDiff.B_ONLY]))
+    
+    def update(self, tailer_a, tailer_b):
+        count = 0
+        for event in tailer_a.poll():
+            self.addEventA(event)
+            count += 1
+            
+        for event in tailer_b.poll():
+            self.addEventB(event)
+            count += 1
+            
+        return count
+    
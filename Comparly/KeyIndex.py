@@ -0,0 +1,85 @@
+# ------------------------------------------------------
+#
+#   KeyIndex.py
+#   By: Fred Stakem
+#   Created: 10.18.26
+#
+# ------------------------------------------------------
+
+
+# Libs
+# None
+
+# User defined
+from Globals import *
+from Utilities import *
+
+# Main
+class KeyIndex(object):
+    
+    # Setup logging
+    logger = Utilities.getLogger(__name__)
+     
+    def __init__(self):
+        self.keys = []
+        self.consumed = bytearray()
+        self.index = {}
+        self.wildcard_indexes = {}
+        
+    def __len__(self):
+        return len(self.keys)
+        
+    def add(self, key):
+        position = len(self.keys)
+        self.keys.append(key)
+        self.consumed.append(0)
+        self.index.setdefault(key, []).append(position)
+        
+        for wildcards, index in self.wildcard_indexes.iteritems():
+            index.setdefault(self.project(key, wildcards), []).append(position)
+            
+        return position
+    
+    def take(self, key):
+        # A None value in the key matches any value like Field.containsFields
+        wildcards = self.getWildcards(key)
+        if len(wildcards) == 0:
+            positions = self.index.pop(key, None)
+        else:
+            positions = self.getWildcardIndex(wildcards).pop(self.project(key, wildcards), None)
+            
+        if positions == None:
+            return []
+        
+        taken = []
+        for position in positions:
+            if not self.consumed[position]:
+                self.consumed[position] = 1
+                taken.append(position)
+                
+        return taken
+    
+    def remaining(self):
+        for position, consumed in enumerate(self.consumed):
+            if not consumed:
+                yield position
+                
+    def getWildcardIndex(self, wildcards):
+        index = self.wildcard_indexes.get(wildcards)
+        if index == None:
+            index = {}
+            for position, key in enumerate(self.keys):
+                if not self.consumed[position]:
+                    index.setdefault(self.project(key, wildcards), []).append(position)
+            self.wildcard_indexes[wildcards] = index
+            
+        return index
+    
+    @classmethod
+    def getWildcards(cls, key):
+        return tuple([i for i, value in enumerate(key) if value == None])
+    
+    @classmethod
+    def project(cls, key, wildcards):
+        return tuple([value for i, value in enumerate(key) if i not in wildcards])
+    
@@ -0,0 +1,37 @@
+# ------------------------------------------------------
+#
+#   KeySummary.py
+#   By: Fred Stakem
+#   Created: 10.18.26
+#
+# ------------------------------------------------------
+
+
+# Libs
+# None
+
+# User defined
+from Globals import *
+from Utilities import *
+
+# Main
+class KeySummary(object):
+    
+    # Keep one small object per key
+    __slots__ = ['count_a', 'count_b', 'exemplars_a', 'exemplars_b']
+     
+    def __init__(self):
+        self.count_a = 0
+        self.count_b = 0
+        self.exemplars_a = []
+        self.exemplars_b = []
+        
+    def to_dict(self):
+        return { 'count_a': self.count_a,
+                 'count_b': self.count_b,
+                 'exemplars_a': self.exemplars_a,
+                 'exemplars_b': self.exemplars_b }
+        
+    def __str__(self):
+        return 'KeySummary(count_a=%d, count_b=%d)' % (self.count_a, self.count_b)
+    
@@ -0,0 +1,42 @@
+# ------------------------------------------------------
+#
+#   LazyEvent.py
+#   By: Fred Stakem
+#   Created: 10.18.26
+#
+# ------------------------------------------------------
+
+
+# Libs
+# None
+
+# User defined
+from Globals import *
+from Utilities import *
+from LazyField import LazyField
+
+# Main
+class LazyEvent(object):
+    
+    # Keep the raw line and decode fields only when they are asked for
+    __slots__ = ['index', 'offset', 'field']
+    
+    def __init__(self, index, offset, raw, extractors, parse=None):
+        self.index = index
+        self.offset = offset
+        self.field = LazyField(raw, extractors, parse)
+        
+    @property
+    def raw(self):
+        return self.field.raw
+    
+    def to_pretty_json(self):
+        return self.field.to_pretty_json()
+    
+    def __reduce_ex__(self, protocol):
+        # The extractors and the parser are closures so fail before any spill or cache write
+        raise TypeError('Lazy events can not be pickled, load the log with an EventLoader instead.')
+    
+    def __str__(self):
+        return 'LazyEvent(index=%d, offset=%d)' % (self.index, self.offset)
+    
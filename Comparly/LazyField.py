@@ -0,0 +1,87 @@
+# ------------------------------------------------------
+#
+#   LazyField.py
+#   By: Fred Stakem
+#   Created: 10.18.26
+#
+# ------------------------------------------------------
+
+
+# Libs
+# None
+
+# User defined
+from Globals import *
+from Utilities import *
+from Corely import Field
+
+# Main
+class LazyField(object):
+    
+    # Stands in for the root field and decodes children on first access
+    __slots__ = ['raw', 'extractors', 'parse', 'cache', 'tree']
+    
+    name = 'event'
+    value = None
+    
+    def __init__(self, raw, extractors, parse=None):
+        self.raw = raw
+        self.extractors = extractors
+        self.parse = parse
+        self.cache = None
+        self.tree = None
+        
+    def getField(self, name):
+        if self.cache != None and name in self.cache:
+            return self.cache[name]
+        
+        field = None
+        extractor = self.extractors.get(name)
+        try:
+            if extractor == None:
+                raise LookupError(name)
+            field = Field(extractor(self.raw), [], name)
+        except (LookupError, ValueError):
+            # Fall back to the full parse when a field can not be extracted
+            tree = self.getTree()
+            if tree != None:
+                field = tree.getField(name)
+                
+        if self.cache == None:
+            self.cache = {}
+        self.cache[name] = field
+        
+        return field
+    
+    def getFields(self, names):
+        return [self.getField(name) for name in names]
+    
+    def containsFields(self, fields):
+        for field in fields:
+            event_field = self.getField(field.name)
+            if event_field == None:
+                return False
+            if field.value != None and field.value != event_field.value:
+                return False
+            
+        return True
+    
+    def getTree(self):
+        if self.tree == None and self.parse != None:
+            self.tree = self.parse(self.raw)
+            
+        return self.tree
+    
+    def isDecoded(self, name):
+        return self.cache != None and name in self.cache
+    
+    def to_pretty_json(self):
+        tree = self.getTree()
+        if tree == None:
+            return self.raw
+        
+        return tree.to_pretty_json()
+    
+    def __reduce_ex__(self, protocol):
+        raise TypeError('Lazy fields can not be pickled, load the log with an EventLoader instead.')
+    
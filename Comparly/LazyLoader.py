@@ -0,0 +1,95 @@
+# ------------------------------------------------------
+#
+#   LazyLoader.py
+#   By: Fred Stakem
+#   Created: 10.18.26
+#
+# ------------------------------------------------------
+
+
+# Libs
+# None
+
+# User defined
+from Globals import *
+from Utilities import *
+from EventLoader import EventLoader
+from LazyEvent import LazyEvent
+
+# Main
+class LazyLoader(object):
+    
+    # Setup logging
+    logger = Utilities.getLogger(__name__)
+    
+    def __init__(self, extractors, factory=None, separator='\n'):
+        self.extractors = extractors
+        self.factory = factory
+        self.separator = separator
+        self.loader = None
+    
+    def load(self, filename):
+        self.logger.debug('Lazily loading events from file %s.' % (filename))
+        with open(filename, 'rb') as f:
+            data = f.read()
+            
+        return self.loadData(data)
+    
+    def loadData(self, data):
+        # Only split the lines, nothing is lexed or parsed yet
+        events = []
+        parse = self.parseField if self.factory != None else None
+        offset = 0
+        index = 0
+        while offset < len(data):
+            end = data.find(self.separator, offset)
+            if end == -1:
+                end = len(data)
+                
+            # Number the events in order like the eager loaders, skipping blank lines
+            if end > offset:
+                events.append(LazyEvent(index, offset, data[offset:end], self.extractors, parse))
+                index += 1
+                
+            offset = end + len(self.separator)
+            
+        self.logger.debug('Found %d lazy events.' % (len(events)))
+        
+        return events
+    
+    def parseField(self, raw):
+        # The full parser is only built if an extractor ever falls back to it
+        if self.loader == None:
+            lexer, parser = self.factory()
+            self.loader = EventLoader(lexer, parser, None, None, self.separator)
+            
+        event = self.loader.parseEvent(0, raw)
+        if event == None:
+            return None
+            
+        return event.field
+    
+    @classmethod
+    def createRegexExtractors(cls, pattern, converters={}):
+        # One extractor for every named group of the pattern
+        extractors = {}
+        for name in pattern.groupindex.keys():
+            extractors[name] = cls.createRegexExtractor(pattern, name, converters.get(name))
+            
+        return extractors
+    
+    @classmethod
+    def createRegexExtractor(cls, pattern, name, converter):
+        def extract(raw):
+            match = pattern.match(raw)
+            if match == None:
+                raise ValueError('The line does not match the pattern for %s.' % (name))
+                
+            value = match.group(name)
+            if value != None and converter != None:
+                value = converter(value)
+                
+            return value
+            
+        return extract
+
@@ -0,0 +1,167 @@
+# ------------------------------------------------------
+#
+#   LogSketch.py
+#   By: Fred Stakem
+#   Created: 10.18.26
+#
+# ------------------------------------------------------
+
+
+# Libs
+import math
+import random
+import struct
+import numpy
+
+# User defined
+from Globals import *
+from Utilities import *
+from UnorderedDiff import UnorderedDiff
+
+# Main
+class LogSketch(object):
+    
+    # Setup logging
+    logger = Utilities.getLogger(__name__)
+    
+    # Multiply-shift hashing of 32 bit values into 32 bit values
+    MAX_HASH = 1 << 32
+    
+    # Serialized layout
+    MAGIC = 'CMPLYSKT'
+    VERSION = 1
+    HEADER = struct.Struct('<8sIIIIQ')
+    
+    def __init__(self, num_perm=128, precision=12, seed=0, batch_size=4096):
+        self.num_perm = num_perm
+        self.precision = precision
+        self.seed = seed
+        self.batch_size = batch_size
+        self.count = 0
+        
+        # One random 64 bit multiplier and offset per permutation
+        rand = random.Random(seed)
+        self.a = numpy.array([rand.getrandbits(64) for i in xrange(num_perm)], dtype=numpy.uint64)
+        self.b = numpy.array([rand.getrandbits(64) for i in xrange(num_perm)], dtype=numpy.uint64)
+        
+        self.minhash = numpy.empty(num_perm, dtype=numpy.uint64)
+        self.minhash.fill(self.MAX_HASH)
+        self.registers = numpy.zeros(1 << precision, dtype=numpy.uint8)
+    
+    @classmethod
+    def build(cls, events, filter_fields, num_perm=128, precision=12, seed=0):
+        cls.logger.debug('Building the log sketch.')
+        
+        sketch = cls(num_perm, precision, seed)
+        field_names = UnorderedDiff.getFieldNames(filter_fields)
+        sketch.update(key for event, key in UnorderedDiff.iterKeyedEvents(events, filter_fields, field_names))
+        
+        cls.logger.debug('Built the log sketch from %d events.' % (sketch.count))
+        
+        return sketch
+    
+    def update(self, keys):
+        # Both sketches ignore repeats so only distinct keys in a batch are hashed
+        batch = set()
+        for key in keys:
+            self.count += 1
+            batch.add(key)
+            if len(batch) >= self.batch_size:
+                self.addHashes([UnorderedDiff.hashKey(k, self.seed) for k in batch])
+                batch = set()
+                
+        if batch:
+            self.addHashes([UnorderedDiff.hashKey(k, self.seed) for k in batch])
+    
+    def addHashes(self, hashes):
+        # HyperLogLog uses the top bits for the register and the rest for the rank
+        width = 64 - self.precision
+        mask = (1 << width) - 1
+        registers = self.registers
+        for h in hashes:
+            i = h >> width
+            rank = width - (h & mask).bit_length() + 1
+            if rank > registers[i]:
+                registers[i] = rank
+                
+        # MinHash permutes the low 32 bits of each hash, (a * x + b) mod 2^64 wraps on purpose
+        values = numpy.array(hashes, dtype=numpy.uint64) & numpy.uint64(0xFFFFFFFF)
+        with numpy.errstate(over='ignore'):
+            permuted = (numpy.outer(self.a, values) + self.b[:, numpy.newaxis]) >> numpy.uint64(32)
+        numpy.minimum(self.minhash, permuted.min(axis=1), self.minhash)
+    
+    def checkCompatible(self, other):
+        if (self.num_perm, self.precision, self.seed) != (other.num_perm, other.precision, other.seed):
+            raise ValueError('The sketches were built with different parameters.')
+    
+    def merge(self, other):
+        self.checkCompatible(other)
+        
+        sketch = LogSketch(self.num_perm, self.precision, self.seed, self.batch_size)
+        sketch.count = self.count + other.count
+        sketch.minhash = numpy.minimum(self.minhash, other.minhash)
+        sketch.registers = numpy.maximum(self.registers, other.registers)
+        
+        return sketch
+    
+    def jaccard(self, other):
+        self.checkCompatible(other)
+        return float(numpy.count_nonzero(self.minhash == other.minhash)) / self.num_perm
+    
+    def cardinality(self):
+        return self.estimateCardinality(self.registers)
+    
+    @classmethod
+    def estimateCardinality(cls, registers):
+        m = len(registers)
+        alpha = 0.7213 / (1.0 + 1.079 / m)
+        estimate = alpha * m * m / numpy.sum(numpy.ldexp(1.0, -registers.astype(numpy.int32)))
+        
+        # Linear counting is more accurate for small sets
+        zeros = m - numpy.count_nonzero(registers)
+        if estimate <= 2.5 * m and zeros > 0:
+            estimate = m * math.log(float(m) / zeros)
+            
+        return float(estimate)
+    
+    def estimateDiff(self, other):
+        self.checkCompatible(other)
+        
+        # Split the union by the estimated similarity
+        union = self.estimateCardinality(numpy.maximum(self.registers, other.registers))
+        both = self.jaccard(other) * union
+        a_only = max(self.cardinality() - both, 0.0)
+        b_only = max(other.cardinality() - both, 0.0)
+        
+        return (both, a_only, b_only)
+    
+    @classmethod
+    def rank(cls, pairs):
+        # Most different pairs first
+        scored = [(sketch_a.jaccard(sketch_b), name) for name, sketch_a, sketch_b in pairs]
+        scored.sort()
+        
+        return [(name, similarity) for similarity, name in scored]
+    
+    def to_bytes(self):
+        header = self.HEADER.pack(self.MAGIC, self.VERSION, self.num_perm, self.precision, self.seed, self.count)
+        return header + self.minhash.tostring() + self.registers.tostring()
+    
+    @classmethod
+    def from_bytes(cls, data):
+        magic, version, num_perm, precision, seed, count = cls.HEADER.unpack(data[:cls.HEADER.size])
+        if magic != cls.MAGIC or version != cls.VERSION:
+            raise ValueError('Data is not a log sketch.')
+            
+        sketch = cls(num_perm, precision, seed)
+        sketch.count = count
+        offset = cls.HEADER.size
+        sketch.minhash = numpy.fromstring(data[offset:offset + num_perm * 8], dtype=numpy.uint64).copy()
+        offset += num_perm * 8
+        sketch.registers = numpy.fromstring(data[offset:offset + (1 << precision)], dtype=numpy.uint8).copy()
+        
+        return sketch
+    
+    def __str__(self):
+        return 'LogSketch(events=%d, cardinality=%.1f)' % (self.count, self.cardinality())
+
@@ -0,0 +1,107 @@
+# ------------------------------------------------------
+#
+#   LogTailer.py
+#   By: Fred Stakem
+#   Created: 10.18.26
+#
+# ------------------------------------------------------
+
+
+# Libs
+import os
+
+# User defined
+from Globals import *
+from Utilities import *
+
+# Main
+class LogTailer(object):
+    
+    # Setup logging
+    logger = Utilities.getLogger(__name__)
+     
+    def __init__(self, filename, parse, separator='\n'):
+        self.filename = filename
+        self.parse = parse
+        self.separator = separator
+        self.file = None
+        self.offset = 0
+        self.index = 0
+        self.partial = ''
+        
+    def poll(self):
+        events = []
+        if self.file != None:
+            # Start over when the log has been truncated in place
+            if os.fstat(self.file.fileno()).st_size < self.offset:
+                self.logger.debug('Log %s was truncated, reading from the start.' % (self.filename))
+                self.file.seek(0)
+                self.offset = 0
+                self.partial = ''
+                
+            events.extend(self.readEvents())
+            
+            # Finish the old file when the name now points at a new one
+            if self.isRotated():
+                self.logger.debug('Log %s was rotated, reading the new file.' % (self.filename))
+                if self.partial != '':
+                    events.extend(self.parseLines([self.partial]))
+                self.close()
+                
+        if self.file == None:
+            if not self.open():
+                return events
+            events.extend(self.readEvents())
+            
+        return events
+    
+    def open(self):
+        try:
+            self.file = open(self.filename, 'rb')
+        except IOError:
+            return False
+            
+        self.offset = 0
+        self.partial = ''
+        
+        return True
+    
+    def close(self):
+        if self.file != None:
+            self.file.close()
+            self.file = None
+            
+    def isRotated(self):
+        try:
+            stat = os.stat(self.filename)
+        except OSError:
+            return True
+            
+        current = os.fstat(self.file.fileno())
+        
+        return (stat.st_dev, stat.st_ino) != (current.st_dev, current.st_ino)
+    
+    def readEvents(self):
+        # Only read the appended bytes
+        self.file.seek(self.offset)
+        data = self.file.read()
+        if data == '':
+            return []
+        self.offset += len(data)
+        
+        # Hold back an incomplete last line until the rest is written
+        lines = (self.partial + data).split(self.separator)
+        self.partial = lines.pop()
+        
+        return self.parseLines(lines)
+    
+    def parseLines(self, lines):
+        events = []
+        for line in lines:
+            event = self.parse(self.index, line)
+            self.index += 1
+            if event != None:
+                events.append(event)
+                
+        return events
+    
@@ -0,0 +1,93 @@
+# ------------------------------------------------------
+#
+#   MessageNormalizer.py
+#   By: Fred Stakem
+#   Created: 10.18.26
+#
+# ------------------------------------------------------
+
+
+# Libs
+import re
+from collections import OrderedDict
+
+# User defined
+from Globals import *
+from Utilities import *
+
+# Main
+class MessageNormalizer(object):
+    
+    # Setup logging
+    logger = Utilities.getLogger(__name__)
+    
+    # Variable tokens in the order they are masked, addresses go first so
+    # the time masks do not take the digit pairs of a MAC address
+    MASKS = [ ('ip', re.compile(r'\b\d{1,3}(?:\.\d{1,3}){3}(?::\d+)?\b'), '<IP>'),
+              ('mac', re.compile(r'\b[0-9a-fA-F]{2}(?::[0-9a-fA-F]{2}){5}\b'), '<MAC>'),
+              ('time', re.compile(r'\b\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}:\d{2}(?:\.\d+)?\b'), '<TIME>'),
+              ('time', re.compile(r'\b(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+\d{1,2}\s+\d{2}:\d{2}:\d{2}\b'), '<TIME>'),
+              ('time', re.compile(r'\b\d{1,2}:\d{2}:\d{2}(?:\.\d+)?\b'), '<TIME>'),
+              ('hex', re.compile(r'\b0x[0-9a-fA-F]+\b'), '<HEX>'),
+              ('hex', re.compile(r'\b(?=[0-9a-fA-F]*[a-fA-F])(?=[0-9a-fA-F]*\d)[0-9a-fA-F]{8,}\b'), '<HEX>'),
+              ('pid', re.compile(r'\[\d+\]'), '[<PID>]'),
+              ('pid', re.compile(r'\b(pid[ =:])\d+\b', re.IGNORECASE), r'\1<PID>'),
+              ('number', re.compile(r'\b\d+(?:\.\d+)?\b'), '<NUM>') ]
+    
+    def __init__(self, field_names=['sub_msg'], max_size=100000, masks=None):
+        self.field_names = list(field_names)
+        self.max_size = max_size
+        self.masks = masks if masks != None else self.MASKS
+        self.cache = OrderedDict()
+        self.positions = {}
+        self.hits = 0
+        self.misses = 0
+    
+    def normalize(self, value):
+        if not isinstance(value, basestring):
+            return value
+            
+        # Syslogs repeat the same messages so remember the recent templates
+        template = self.cache.pop(value, None)
+        if template != None:
+            self.hits += 1
+            self.cache[value] = template
+            return template
+            
+        self.misses += 1
+        template = self.mask(value)
+        self.cache[value] = template
+        if len(self.cache) > self.max_size:
+            self.cache.popitem(last=False)
+            
+        return template
+    
+    def mask(self, value):
+        for name, pattern, replacement in self.masks:
+            value = pattern.sub(replacement, value)
+            
+        return value
+    
+    def normalizeKey(self, key, field_names):
+        positions = self.getPositions(field_names)
+        if len(positions) == 0:
+            return key
+            
+        key = list(key)
+        for i in positions:
+            key[i] = self.normalize(key[i])
+            
+        return tuple(key)
+    
+    def getPositions(self, field_names):
+        names = tuple(field_names)
+        positions = self.positions.get(names)
+        if positions == None:
+            positions = [i for i, name in enumerate(names) if name in self.field_names]
+            self.positions[names] = positions
+            
+        return positions
+    
+    def getStats(self):
+        return { 'hits': self.hits, 'misses': self.misses, 'size': len(self.cache) }
+
@@ -0,0 +1,80 @@
+# ------------------------------------------------------
+#
+#   NWayDiff.py
+#   By: Fred Stakem
+#   Created: 10.18.26
+#
+# ------------------------------------------------------
+
+
+# Libs
+# None
+
+# User defined
+from Globals import *
+from Utilities import *
+from UnorderedDiff import UnorderedDiff
+from NWayMatch import NWayMatch
+
+# Main
+class NWayDiff(object):
+    
+    # Setup logging
+    logger = Utilities.getLogger(__name__)
+      
+    @classmethod  
+    def compare(cls, logs, filter_fields, keep_events=True):
+        cls.logger.debug('Starting the %d way unordered diff comparison.' % (len(logs)))
+        
+        # Input
+        field_names = UnorderedDiff.getFieldNames(filter_fields)
+        
+        # Output
+        matches = {}
+        
+        # Index every log once by the filter key
+        for log, events in enumerate(logs):
+            for event, key in UnorderedDiff.iterKeyedEvents(events, filter_fields, field_names):
+                match = matches.get(key)
+                if match is None:
+                    match = NWayMatch(event.field.getFields(field_names), len(logs), keep_events)
+                    matches[key] = match
+                    
+                match.add(log, event)
+                
+        cls.logger.debug('Found %d keys across %d logs.' % (len(matches), len(logs)))
+        
+        return matches
+    
+    @classmethod
+    def getMask(cls, logs):
+        mask = 0
+        for log in logs:
+            mask |= 1 << log
+            
+        return mask
+    
+    @classmethod
+    def selectByMask(cls, matches, mask):
+        return dict([(key, match) for key, match in matches.iteritems() if match.mask == mask])
+    
+    @classmethod
+    def selectPresentInAll(cls, matches, log_count):
+        return cls.selectByMask(matches, cls.getMask(range(log_count)))
+    
+    @classmethod
+    def selectMissingOnlyFrom(cls, matches, log_count, log):
+        return cls.selectByMask(matches, cls.getMask(range(log_count)) & ~(1 << log))
+    
+    @classmethod
+    def selectOnlyIn(cls, matches, log):
+        return cls.selectByMask(matches, 1 << log)
+    
+    @classmethod
+    def countByMask(cls, matches):
+        counts = {}
+        for match in matches.itervalues():
+            counts[match.mask] = counts.get(match.mask, 0) + 1
+            
+        return counts
+    
@@ -0,0 +1,48 @@
+# ------------------------------------------------------
+#
+#   NWayMatch.py
+#   By: Fred Stakem
+#   Created: 10.18.26
+#
+# ------------------------------------------------------
+
+
+# Libs
+# None
+
+# User defined
+from Globals import *
+from Utilities import *
+
+# Main
+class NWayMatch(object):
+    
+    # Setup logging
+    logger = Utilities.getLogger(__name__)
+     
+    def __init__(self, fields, log_count, keep_events=True):
+        self.fields = fields
+        self.mask = 0
+        self.counts = [0] * log_count
+        self.events = None
+        if keep_events:
+            self.events = [[] for i in range(log_count)]
+        
+    def add(self, log, event):
+        self.mask |= 1 << log
+        self.counts[log] += 1
+        if self.events != None:
+            self.events[log].append(event)
+            
+    def isPresent(self, log):
+        return (self.mask >> log) & 1 == 1
+    
+    def getPresent(self):
+        return [log for log in range(len(self.counts)) if self.isPresent(log)]
+    
+    def getMissing(self):
+        return [log for log in range(len(self.counts)) if not self.isPresent(log)]
+    
+    def __str__(self):
+        return 'NWayMatch(mask=%s, counts=%s)' % (bin(self.mask), str(self.counts))
+    
@@ -0,0 +1,119 @@
+# ------------------------------------------------------
+#
+#   NearestMatcher.py
+#   By: Fred Stakem
+#   Created: 10.18.26
+#
+# ------------------------------------------------------
+
+
+# Libs
+import numpy
+
+# User defined
+from Globals import *
+from Utilities import *
+from DistanceCalculator import DistanceCalculator
+
+# Main
+class NearestMatcher(object):
+    
+    # Setup logging
+    logger = Utilities.getLogger(__name__)
+     
+    def __init__(self, weights, normalize, max_distance, k=1):
+        if normalize:
+            weights = DistanceCalculator.normalizeWeights(weights)
+            
+        self.weights = weights
+        self.max_distance = max_distance
+        self.k = k
+        self.blocking_keys, self.other_keys = self.getBlockingKeys(weights, max_distance)
+        self.blocking_weight = sum([weights[key] for key in self.blocking_keys])
+      
+    def match(self, events_a, events_b):
+        self.logger.debug('Starting the nearest neighbour matching.')
+        
+        # Input
+        events_a = list(events_a)
+        events_b = list(events_b)
+        columns_a, columns_b = DistanceCalculator.encodeColumns(events_a, events_b, self.weights.keys())
+        index = self.indexColumns(columns_b)
+        
+        self.logger.debug('Blocking on the fields: %s' % (', '.join(self.blocking_keys)))
+        
+        # Output
+        matches = []
+        
+        for i, event_a in enumerate(events_a):
+            candidates, distances = self.getCandidates(i, columns_a, columns_b, index, len(events_b))
+            
+            # Keep the closest candidates under the maximum distance
+            order = numpy.lexsort((candidates, distances))[:self.k]
+            matches.append( (event_a, [(events_b[candidates[j]], distances[j]) for j in order]) )
+        
+        self.logger.debug('Finished the nearest neighbour matching.')
+        
+        return matches
+    
+    def getCandidates(self, i, columns_a, columns_b, index, count_b):
+        # Without blocking every event is a candidate
+        if len(self.blocking_keys) == 0:
+            candidates = numpy.arange(count_b)
+            shared_weights = numpy.zeros(count_b)
+        else:
+            positions = []
+            position_weights = []
+            for key in self.blocking_keys:
+                found = index[key].get(columns_a[key][i])
+                if found is not None:
+                    positions.append(found)
+                    position_weights.append(numpy.repeat(self.weights[key], len(found)))
+                    
+            if len(positions) == 0:
+                return (numpy.array([], dtype=numpy.int64), numpy.array([]))
+            
+            candidates, inverse = numpy.unique(numpy.concatenate(positions), return_inverse=True)
+            shared_weights = numpy.bincount(inverse, numpy.concatenate(position_weights))
+        
+        # Prune with the lower bound from the blocking fields
+        distances = self.blocking_weight - shared_weights
+        within = distances <= self.max_distance
+        candidates = candidates[within]
+        distances = distances[within]
+        
+        # Finish the distance over the remaining fields
+        for key in self.other_keys:
+            mismatches = columns_b[key][candidates] != columns_a[key][i]
+            distances = distances + mismatches * self.weights[key]
+            
+        within = distances <= self.max_distance
+        
+        return (candidates[within], distances[within])
+    
+    def indexColumns(self, columns):
+        index = {}
+        for key in self.blocking_keys:
+            positions = {}
+            for position, code in enumerate(columns[key]):
+                if code >= 0:
+                    positions.setdefault(code, []).append(position)
+                    
+            index[key] = {}
+            for code, found in positions.iteritems():
+                index[key][code] = numpy.array(found, dtype=numpy.int64)
+                
+        return index
+    
+    def getBlockingKeys(self, weights, max_distance):
+        keys = sorted(weights.keys(), key=lambda key: weights[key], reverse=True)
+        
+        # Block on the heaviest fields until missing all of them exceeds the maximum distance
+        total = 0.0
+        for i, key in enumerate(keys):
+            total += weights[key]
+            if total > max_distance:
+                return (keys[:i + 1], keys[i + 1:])
+            
+        return ([], keys)
+    
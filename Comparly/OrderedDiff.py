@@ -0,0 +1,360 @@
+# ------------------------------------------------------
+#
+#   OrderedDiff.py
+#   By: Fred Stakem
+#   Created: 10.18.26
+#
+# ------------------------------------------------------
+
+
+# Libs
+import bisect
+from collections import deque
+
+# User defined
+from Globals import *
+from Utilities import *
+from Corely import EventMatch
+from UnorderedDiff import UnorderedDiff
+
+# Main
+class OrderedDiff(object):
+    
+    # Setup logging
+    logger = Utilities.getLogger(__name__)
+    
+    # Hunk tags
+    EQUAL = 'equal'
+    DELETE = 'delete'
+    INSERT = 'insert'
+    MOVE = 'move'
+    
+    # Give up on a minimal script past this many edits in one sub problem
+    MAX_COST = 256
+    
+    # Gaps between anchors still get a minimal script up to this size
+    GAP_SIZE = 32
+    
+    # Number of keys in a row that make an anchor
+    ANCHOR_LENGTH = 4
+    
+    def __init__(self):
+        pass
+    
+    @classmethod
+    def compare(cls, events_a, events_b, filter_fields, detect_moves=True):
+        cls.logger.debug('Starting the ordered diff comparison.')
+        
+        # Input
+        field_names = UnorderedDiff.getFieldNames(filter_fields)
+        
+        # Map every key to a small integer so the diff only compares ints
+        codes = {}
+        events = ([], [])
+        sequences = ([], [])
+        for side, log in enumerate([events_a, events_b]):
+            for event, key in UnorderedDiff.iterKeyedEvents(log, filter_fields, field_names):
+                events[side].append(event)
+                sequences[side].append(codes.setdefault(key, len(codes)))
+                
+        cls.logger.debug('Found %d and %d events with %d distinct keys.' % (len(events[0]), len(events[1]), len(codes)))
+        
+        # Output
+        opcodes = cls.getOpcodes(sequences[0], sequences[1])
+        hunks = cls.createHunks(opcodes, events[0], events[1], sequences[0], sequences[1], field_names, detect_moves)
+        
+        cls.logger.debug('Finished the ordered comparison with %d hunks.' % (len(hunks)))
+        
+        return hunks
+    
+    @classmethod
+    def getOpcodes(cls, a, b):
+        opcodes = []
+        
+        # Work through the sub problems in order without recursion, the gaps
+        # between anchors are not searched for a minimal script again
+        tasks = [(0, len(a), 0, len(b), True)]
+        while len(tasks) > 0:
+            a_lo, a_hi, b_lo, b_hi, search = tasks.pop()
+            
+            # Fast path for the common prefix and suffix
+            prefix = 0
+            while a_lo + prefix < a_hi and b_lo + prefix < b_hi and a[a_lo + prefix] == b[b_lo + prefix]:
+                prefix += 1
+            cls.addOpcode(opcodes, cls.EQUAL, a_lo, a_lo + prefix, b_lo, b_lo + prefix)
+            a_lo += prefix
+            b_lo += prefix
+            
+            suffix = 0
+            while a_lo < a_hi - suffix and b_lo < b_hi - suffix and a[a_hi - suffix - 1] == b[b_hi - suffix - 1]:
+                suffix += 1
+            a_hi -= suffix
+            b_hi -= suffix
+            
+            # Split on the middle snake, the suffix is emitted after both halves
+            snake = None
+            if a_lo < a_hi and b_lo < b_hi and (search or a_hi - a_lo + b_hi - b_lo <= cls.GAP_SIZE):
+                snake = cls.findMiddleSnake(a, a_lo, a_hi, b, b_lo, b_hi)
+            if snake != None:
+                x, y = snake
+                tasks.append((a_hi, a_hi + suffix, b_hi, b_hi + suffix, search))
+                tasks.append((a_lo + x, a_hi, b_lo + y, b_hi, search))
+                tasks.append((a_lo, a_lo + x, b_lo, b_lo + y, search))
+                continue
+                
+            # Very different logs are split on anchors instead of searching on
+            anchors = cls.findAnchors(a, a_lo, a_hi, b, b_lo, b_hi) if search and a_lo < a_hi and b_lo < b_hi else []
+            if len(anchors) > 0:
+                # Each gap ends on its anchor which is then trimmed as a common suffix
+                bounds = [(a_lo, b_lo)] + [(i + 1, j + 1) for i, j in anchors] + [(a_hi, b_hi)]
+                tasks.append((a_hi, a_hi + suffix, b_hi, b_hi + suffix, search))
+                for k in xrange(len(bounds) - 1, 0, -1):
+                    tasks.append((bounds[k - 1][0], bounds[k][0], bounds[k - 1][1], bounds[k][1], False))
+                continue
+                
+            cls.addOpcode(opcodes, cls.DELETE, a_lo, a_hi, b_lo, b_lo)
+            cls.addOpcode(opcodes, cls.INSERT, a_hi, a_hi, b_lo, b_hi)
+            cls.addOpcode(opcodes, cls.EQUAL, a_hi, a_hi + suffix, b_hi, b_hi + suffix)
+            
+        return opcodes
+    
+    @classmethod
+    def addOpcode(cls, opcodes, tag, a_lo, a_hi, b_lo, b_hi):
+        if a_lo == a_hi and b_lo == b_hi:
+            return
+            
+        if len(opcodes) > 0 and opcodes[-1][0] == tag:
+            last = opcodes[-1]
+            opcodes[-1] = (tag, last[1], a_hi, last[3], b_hi)
+        else:
+            opcodes.append((tag, a_lo, a_hi, b_lo, b_hi))
+    
+    @classmethod
+    def findMiddleSnake(cls, a, a_lo, a_hi, b, b_lo, b_hi):
+        # Linear space Myers search from both ends until the paths overlap
+        n = a_hi - a_lo
+        m = b_hi - b_lo
+        max_d = (n + m + 1) // 2
+        offset = max_d
+        forward = [-1] * (2 * max_d + 2)
+        backward = [-1] * (2 * max_d + 2)
+        forward[offset + 1] = 0
+        backward[offset + 1] = 0
+        delta = n - m
+        odd = delta % 2 != 0
+        k1_start = 0
+        k1_end = 0
+        k2_start = 0
+        k2_end = 0
+        
+        for d in xrange(max_d):
+            for k1 in xrange(-d + k1_start, d + 1 - k1_end, 2):
+                k1_offset = offset + k1
+                if k1 == -d or (k1 != d and forward[k1_offset - 1] < forward[k1_offset + 1]):
+                    x1 = forward[k1_offset + 1]
+                else:
+                    x1 = forward[k1_offset - 1] + 1
+                y1 = x1 - k1
+                while x1 < n and y1 < m and a[a_lo + x1] == b[b_lo + y1]:
+                    x1 += 1
+                    y1 += 1
+                forward[k1_offset] = x1
+                
+                if x1 > n:
+                    k1_end += 2
+                elif y1 > m:
+                    k1_start += 2
+                elif odd:
+                    k2_offset = offset + delta - k1
+                    if k2_offset >= 0 and k2_offset < len(backward) and backward[k2_offset] != -1:
+                        if x1 >= n - backward[k2_offset]:
+                            return (x1, y1)
+                            
+            for k2 in xrange(-d + k2_start, d + 1 - k2_end, 2):
+                k2_offset = offset + k2
+                if k2 == -d or (k2 != d and backward[k2_offset - 1] < backward[k2_offset + 1]):
+                    x2 = backward[k2_offset + 1]
+                else:
+                    x2 = backward[k2_offset - 1] + 1
+                y2 = x2 - k2
+                while x2 < n and y2 < m and a[a_hi - x2 - 1] == b[b_hi - y2 - 1]:
+                    x2 += 1
+                    y2 += 1
+                backward[k2_offset] = x2
+                
+                if x2 > n:
+                    k2_end += 2
+                elif y2 > m:
+                    k2_start += 2
+                elif not odd:
+                    k1_offset = offset + delta - k2
+                    if k1_offset >= 0 and k1_offset < len(forward) and forward[k1_offset] != -1:
+                        x1 = forward[k1_offset]
+                        if x1 >= n - x2:
+                            return (x1, x1 - (k1_offset - offset))
+                            
+            # Too many edits for a minimal script, the caller splits on anchors
+            if d >= cls.MAX_COST:
+                return None
+                            
+        # Nothing in common so split anywhere
+        return (n, 0)
+    
+    @classmethod
+    def findAnchors(cls, a, a_lo, a_hi, b, b_lo, b_hi):
+        # Runs of keys that are unique in both logs stay put when the events
+        # around them change, very different logs share too few of them
+        chain = cls.findIncreasingPairs(cls.findUniquePairs(a, a_lo, a_hi, b, b_lo, b_hi))
+        if len(chain) * cls.ANCHOR_LENGTH < min(a_hi - a_lo, b_hi - b_lo) // 2:
+            occurrence_chain = cls.findIncreasingPairs(cls.findOccurrencePairs(a, a_lo, a_hi, b, b_lo, b_hi))
+            if len(occurrence_chain) > len(chain):
+                chain = occurrence_chain
+                
+        # Only the last anchor of a run of equal events is needed to split on
+        anchors = []
+        for i, j in chain:
+            if len(anchors) > 0 and anchors[-1] == (i - 1, j - 1):
+                anchors[-1] = (i, j)
+            else:
+                anchors.append((i, j))
+                
+        return anchors
+    
+    @classmethod
+    def findUniquePairs(cls, a, a_lo, a_hi, b, b_lo, b_hi):
+        length = cls.ANCHOR_LENGTH
+        positions_b = {}
+        for j in xrange(b_lo, b_hi - length + 1):
+            gram = tuple(b[j:j + length])
+            positions_b[gram] = -1 if gram in positions_b else j
+            
+        grams_a = [tuple(a[i:i + length]) for i in xrange(a_lo, a_hi - length + 1)]
+        counts = {}
+        for gram in grams_a:
+            counts[gram] = counts.get(gram, 0) + 1
+            
+        pairs = []
+        for i, gram in enumerate(grams_a):
+            j = positions_b.get(gram, -1)
+            if j != -1 and counts[gram] == 1:
+                pairs.append((a_lo + i, j))
+                
+        return pairs
+    
+    @classmethod
+    def findOccurrencePairs(cls, a, a_lo, a_hi, b, b_lo, b_hi):
+        # Pair the n-th event of a key in A with the n-th in B
+        positions_b = {}
+        for j in xrange(b_lo, b_hi):
+            positions_b.setdefault(b[j], deque()).append(j)
+            
+        pairs = []
+        for i in xrange(a_lo, a_hi):
+            positions = positions_b.get(a[i])
+            if positions:
+                pairs.append((i, positions.popleft()))
+                
+        return pairs
+    
+    @classmethod
+    def findIncreasingPairs(cls, pairs):
+        # The longest run of pairs increasing in B is a common subsequence
+        tails = []
+        tail_pairs = []
+        previous = [None] * len(pairs)
+        for p, (i, j) in enumerate(pairs):
+            t = bisect.bisect_left(tails, j)
+            if t > 0:
+                previous[p] = tail_pairs[t - 1]
+            if t == len(tails):
+                tails.append(j)
+                tail_pairs.append(p)
+            else:
+                tails[t] = j
+                tail_pairs[t] = p
+                
+        chain = []
+        p = tail_pairs[-1] if len(tail_pairs) > 0 else None
+        while p != None:
+            chain.append(pairs[p])
+            p = previous[p]
+        chain.reverse()
+        
+        return chain
+    
+    @classmethod
+    def createHunks(cls, opcodes, events_a, events_b, a, b, field_names, detect_moves):
+        # Pair deleted events with inserted events of the same key as moves
+        moved_a = {}
+        moved_b = set()
+        if detect_moves:
+            inserted = {}
+            for tag, a_lo, a_hi, b_lo, b_hi in opcodes:
+                if tag == cls.INSERT:
+                    for j in xrange(b_lo, b_hi):
+                        inserted.setdefault(b[j], deque()).append(j)
+                        
+            for tag, a_lo, a_hi, b_lo, b_hi in opcodes:
+                if tag == cls.DELETE:
+                    for i in xrange(a_lo, a_hi):
+                        positions = inserted.get(a[i])
+                        if positions:
+                            position = positions.popleft()
+                            moved_a[i] = position
+                            moved_b.add(position)
+                            
+        hunks = []
+        for tag, a_lo, a_hi, b_lo, b_hi in opcodes:
+            if tag == cls.EQUAL:
+                for match in cls.createMatches(xrange(a_lo, a_hi), xrange(b_lo, b_hi), events_a, events_b, a, b, field_names):
+                    hunks.append((tag, match))
+            elif tag == cls.DELETE:
+                for moved, run in cls.splitRuns(xrange(a_lo, a_hi), lambda i: i in moved_a):
+                    if moved:
+                        for match in cls.createMatches(run, [moved_a[i] for i in run], events_a, events_b, a, b, field_names):
+                            hunks.append((cls.MOVE, match))
+                    else:
+                        for match in cls.createMatches(run, [], events_a, events_b, a, b, field_names):
+                            hunks.append((cls.DELETE, match))
+            else:
+                for moved, run in cls.splitRuns(xrange(b_lo, b_hi), lambda position: position in moved_b):
+                    if not moved:
+                        for match in cls.createMatches([], run, events_a, events_b, a, b, field_names):
+                            hunks.append((cls.INSERT, match))
+                        
+        return hunks
+    
+    @classmethod
+    def splitRuns(cls, positions, predicate):
+        run = []
+        current = None
+        for position in positions:
+            value = predicate(position)
+            if len(run) > 0 and value != current:
+                yield (current, run)
+                run = []
+            current = value
+            run.append(position)
+            
+        if len(run) > 0:
+            yield (current, run)
+    
+    @classmethod
+    def createMatches(cls, positions_a, positions_b, events_a, events_b, a, b, field_names):
+        # One match for every key in the order the keys first appear
+        matches = {}
+        order = []
+        for positions, events, codes, side in [(positions_a, events_a, a, 0), (positions_b, events_b, b, 1)]:
+            for position in positions:
+                match = matches.get(codes[position])
+                if match is None:
+                    match = EventMatch(events[position].field.getFields(field_names))
+                    matches[codes[position]] = match
+                    order.append(match)
+                    
+                if side == 0:
+                    match.matches_a.append(events[position])
+                else:
+                    match.matches_b.append(events[position])
+                    
+        return order
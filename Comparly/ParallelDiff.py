@@ -0,0 +1,187 @@
+# ------------------------------------------------------
+#
+#   ParallelDiff.py
+#   By: Fred Stakem
+#   Created: 10.18.26
+#
+# ------------------------------------------------------
+
+
+# Libs
+import heapq
+import multiprocessing
+
+# User defined
+from Globals import *
+from Utilities import *
+from Corely import EventMatch
+from UnorderedDiff import UnorderedDiff
+from KeyIndex import KeyIndex
+
+# Workers
+_events = {}
+
+def _initWorker(events_a, events_b):
+    # Each worker gets the logs once when it starts instead of with every chunk
+    _events[UnorderedDiff.A_ONLY] = events_a
+    _events[UnorderedDiff.B_ONLY] = events_b
+
+def _extractKeys(args):
+    side, start, end, filter_fields, field_names = args
+    
+    keys = []
+    for event in _events[side][start:end]:
+        if event.field.containsFields(filter_fields):
+            keys.append(UnorderedDiff.getKey(event, field_names))
+        else:
+            keys.append(None)
+            
+    return keys
+
+def _compareShard(args):
+    keys_a, keys_b = args
+    index_b = KeyIndex()
+    for position, key in keys_b:
+        index_b.add(key)
+        
+    categories_a = []
+    matched_b = {}
+    for position, key in keys_a:
+        if key not in matched_b:
+            taken = index_b.take(key)
+            if len(taken) > 0:
+                matched_b[key] = [keys_b[i][0] for i in taken]
+                
+        if key in matched_b:
+            categories_a.append( (position, UnorderedDiff.BOTH) )
+        else:
+            categories_a.append( (position, UnorderedDiff.A_ONLY) )
+            
+    only_b = [keys_b[i][0] for i in index_b.remaining()]
+    
+    return (categories_a, matched_b, only_b)
+    
+# Main
+class ParallelDiff(object):
+    
+    # Setup logging
+    logger = Utilities.getLogger(__name__)
+     
+    def __init__(self, workers=None, chunk_size=10000):
+        self.workers = workers or multiprocessing.cpu_count()
+        self.chunk_size = chunk_size
+      
+    def compare(self, events_a, events_b, filter_fields):
+        self.logger.debug('Starting the parallel unordered diff comparison with %d workers.' % (self.workers))
+        
+        # Input
+        events_a = list(events_a)
+        events_b = list(events_b)
+        field_names = UnorderedDiff.getFieldNames(filter_fields)
+        
+        pool = multiprocessing.Pool(self.workers, _initWorker, (events_a, events_b))
+        try:
+            # Filter and key both logs in chunks
+            keys_a = self.extractKeys(pool, UnorderedDiff.A_ONLY, len(events_a), filter_fields, field_names)
+            keys_b = self.extractKeys(pool, UnorderedDiff.B_ONLY, len(events_b), filter_fields, field_names)
+            
+            # Shard on the fields that are never wildcards in log A
+            wildcards = self.getWildcards(keys_a)
+            shards = [([], []) for i in range(self.workers)]
+            shard_ids = {}
+            for side, keys in enumerate([keys_a, keys_b]):
+                for i, key in enumerate(keys):
+                    if key != None:
+                        shards[self.getShard(key, wildcards, shard_ids)][side].append( (i, key) )
+                        
+            # Diff each shard
+            results = pool.map(_compareShard, shards)
+            pool.close()
+        except:
+            pool.terminate()
+            raise
+        finally:
+            pool.join()
+            
+        self.logger.debug('Merging the results from %d shards.' % (len(results)))
+        
+        return self.mergeResults(results, events_a, events_b, keys_a, keys_b, field_names)
+    
+    def getShard(self, key, wildcards, shard_ids):
+        # The stable key hash puts a key in the same shard in every process and run
+        shard = shard_ids.get(key)
+        if shard == None:
+            shard = UnorderedDiff.hashKey(KeyIndex.project(key, wildcards)) % self.workers
+            shard_ids[key] = shard
+            
+        return shard
+    
+    def extractKeys(self, pool, side, count, filter_fields, field_names):
+        chunks = []
+        for i in range(0, count, self.chunk_size):
+            chunks.append( (side, i, i + self.chunk_size, filter_fields, field_names) )
+            
+        keys = []
+        for chunk_keys in pool.map(_extractKeys, chunks):
+            keys.extend(chunk_keys)
+            
+        return keys
+    
+    def getWildcards(self, keys):
+        wildcards = set()
+        for key in keys:
+            if key != None:
+                wildcards.update(KeyIndex.getWildcards(key))
+                
+        return tuple(sorted(wildcards))
+    
+    def mergeResults(self, results, events_a, events_b, keys_a, keys_b, field_names):
+        # Output
+        matches_both = []
+        matches_a_only = []
+        matches_b_only = []
+        
+        matched_b = {}
+        for categories_a, shard_matched_b, only_b in results:
+            matched_b.update(shard_matched_b)
+            
+        # Look up the key fields once per key rather than once per event
+        fields = {}
+        
+        # Rebuild the matches in the order of log A
+        previous_matches = {}
+        for position, category in heapq.merge(*[r[0] for r in results]):
+            event_a = events_a[position]
+            key = keys_a[position]
+            
+            if category == UnorderedDiff.BOTH:
+                match = previous_matches.get(key)
+                if match is None:
+                    match = EventMatch(self.getFields(fields, key, event_a, field_names))
+                    match.matches_b.extend([events_b[i] for i in matched_b[key]])
+                    previous_matches[key] = match
+                    
+                match.matches_a.append(event_a)
+                matches_both.append(match)
+            else:
+                match = EventMatch(self.getFields(fields, key, event_a, field_names))
+                match.matches_a.append(event_a)
+                matches_a_only.append(match)
+                
+        # Group output
+        for position in heapq.merge(*[r[2] for r in results]):
+            event_b = events_b[position]
+            match = EventMatch(self.getFields(fields, keys_b[position], event_b, field_names))
+            match.matches_b.append(event_b)
+            matches_b_only.append(match)
+            
+        return (matches_both, matches_a_only, matches_b_only)
+    
+    def getFields(self, fields, key, event, field_names):
+        key_fields = fields.get(key)
+        if key_fields == None:
+            key_fields = event.field.getFields(field_names)
+            fields[key] = key_fields
+            
+        return key_fields
+    
@@ -0,0 +1,141 @@
+# ------------------------------------------------------
+#
+#   ParallelLoader.py
+#   By: Fred Stakem
+#   Created: 10.18.26
+#
+# ------------------------------------------------------
+
+
+# Libs
+import mmap
+import multiprocessing
+
+# User defined
+from Globals import *
+from Utilities import *
+from EventLoader import EventLoader
+
+# Workers
+_loaders = {}
+
+def _parseChunk(args):
+    filename, start, end, factory, separator = args
+    
+    # Build the lexer and parser once per worker process
+    loader = _loaders.get(factory)
+    if loader == None:
+        lexer, parser = factory()
+        loader = EventLoader(lexer, parser, None)
+        _loaders[factory] = loader
+        
+    with open(filename, 'rb') as f:
+        data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            lines = data[start:end].split(separator)
+        finally:
+            data.close()
+            
+    # Number the events by parse order within the chunk, the chunk offsets
+    # are only known once every chunk has been counted
+    events = []
+    errors = []
+    count = 0
+    for line in lines:
+        if len(line) == 0:
+            continue
+        
+        loader.errors = []
+        event = loader.parseEvent(count, line)
+        if event != None:
+            events.append(event)
+        errors.extend(loader.errors)
+        count += 1
+            
+    return (events, errors, count)
+    
+# Main
+class ParallelLoader(object):
+    
+    # Setup logging
+    logger = Utilities.getLogger(__name__)
+     
+    def __init__(self, factory, workers=None, chunk_size=4 * 1024 * 1024, separator='\n'):
+        self.factory = factory
+        self.workers = workers or multiprocessing.cpu_count()
+        self.chunk_size = chunk_size
+        self.separator = separator
+        self.errors = []
+        
+    def load(self, filename):
+        return self.loadFiles([filename])[0]
+    
+    def loadPair(self, filename_a, filename_b):
+        events_a, events_b = self.loadFiles([filename_a, filename_b])
+        return (events_a, events_b)
+      
+    def loadFiles(self, filenames):
+        self.logger.debug('Loading %d files with %d workers.' % (len(filenames), self.workers))
+        self.errors = [[] for filename in filenames]
+        
+        # Split every file so all of the chunks share one pool
+        chunks = []
+        owners = []
+        for i, filename in enumerate(filenames):
+            for chunk in self.getChunks(filename):
+                chunks.append(chunk)
+                owners.append(i)
+                
+        pool = multiprocessing.Pool(self.workers)
+        try:
+            results = pool.map(_parseChunk, chunks, 1)
+            pool.close()
+        except:
+            pool.terminate()
+            raise
+        finally:
+            pool.join()
+            
+        # Chunks come back in order so the events keep their original order
+        # and the counts of the earlier chunks give the index offsets
+        events = [[] for filename in filenames]
+        offsets = [0 for filename in filenames]
+        for owner, (chunk_events, chunk_errors, count) in zip(owners, results):
+            offset = offsets[owner]
+            for event in chunk_events:
+                event.index += offset
+            events[owner].extend(chunk_events)
+            self.errors[owner].extend([(index + offset, errors) for index, errors in chunk_errors])
+            offsets[owner] += count
+            
+        for filename, file_events, file_errors in zip(filenames, events, self.errors):
+            self.logger.debug('Loaded %d events with %d errors from %s.' % (len(file_events), len(file_errors), filename))
+            
+        return events
+    
+    def getChunks(self, filename):
+        chunks = []
+        with open(filename, 'rb') as f:
+            f.seek(0, 2)
+            size = f.tell()
+            if size == 0:
+                return chunks
+            
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            try:
+                # End every chunk just after a separator
+                start = 0
+                while start < size:
+                    end = data.find(self.separator, min(start + self.chunk_size, size) - 1)
+                    if end == -1:
+                        end = size
+                    else:
+                        end += len(self.separator)
+                        
+                    chunks.append( (filename, start, end, self.factory, self.separator) )
+                    start = end
+            finally:
+                data.close()
+                
+        return chunks
+    
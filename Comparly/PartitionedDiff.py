@@ -0,0 +1,217 @@
+# ------------------------------------------------------
+#
+#   PartitionedDiff.py
+#   By: Fred Stakem
+#   Created: 10.18.26
+#
+# ------------------------------------------------------
+
+
+# Libs
+import os
+import heapq
+import shutil
+import tempfile
+import cPickle
+
+# User defined
+from Globals import *
+from Utilities import *
+from Corely import EventMatch
+from UnorderedDiff import UnorderedDiff
+from KeyIndex import KeyIndex
+
+# Main
+class PartitionedDiff(object):
+    
+    # Setup logging
+    logger = Utilities.getLogger(__name__)
+    
+    # Estimated ratio of in memory event size to pickled event size
+    MEMORY_EXPANSION = 4.0
+     
+    def __init__(self, memory_limit, partitions=16, max_depth=4, tmp_dir=None):
+        self.memory_limit = memory_limit
+        self.partitions = partitions
+        self.max_depth = max_depth
+        self.tmp_dir = tmp_dir
+      
+    def compare(self, events_a, events_b, filter_fields):
+        self.logger.debug('Starting the partitioned unordered diff comparison.')
+        
+        # Output
+        matches = { UnorderedDiff.BOTH: [], UnorderedDiff.A_ONLY: [], UnorderedDiff.B_ONLY: [] }
+        
+        for category, match in self.streamCompare(events_a, events_b, filter_fields):
+            matches[category].append(match)
+            
+        self.logger.debug('Finished the comparison.')
+        
+        return (matches[UnorderedDiff.BOTH], matches[UnorderedDiff.A_ONLY], matches[UnorderedDiff.B_ONLY])
+    
+    def streamCompare(self, events_a, events_b, filter_fields):
+        field_names = UnorderedDiff.getFieldNames(filter_fields)
+        directory = tempfile.mkdtemp(prefix='comparly_', dir=self.tmp_dir)
+        
+        try:
+            # Spill both logs to disk
+            self.logger.debug('Partitioning the events into %s.' % (directory))
+            entries_a = self.iterEntries(events_a, filter_fields, field_names)
+            files_a, wildcards = self.partitionEntries(entries_a, (), directory, 'a', 0)
+            
+            # Partition on the fields that are never wildcards in log A
+            if len(wildcards) > 0:
+                self.logger.debug('Repartitioning without the wildcard fields %s.' % (str(wildcards)))
+                files_a = self.repartitionFiles(files_a, wildcards, directory, 'w', 0)
+            
+            entries_b = self.iterEntries(events_b, filter_fields, field_names)
+            files_b, unused = self.partitionEntries(entries_b, wildcards, directory, 'b', 0)
+            
+            # Diff one bucket at a time
+            for result in self.compareBuckets(files_a, files_b, filter_fields, wildcards, directory, 0, None):
+                yield result
+        finally:
+            shutil.rmtree(directory, True)
+            
+    def compareBuckets(self, files_a, files_b, filter_fields, wildcards, directory, depth, parent_size):
+        for i, (file_a, file_b) in enumerate(zip(files_a, files_b)):
+            if file_a == None and file_b == None:
+                continue
+            
+            size = self.getFileSize(file_a) + self.getFileSize(file_b)
+            if size * self.MEMORY_EXPANSION > self.memory_limit:
+                # Hashing can never split a bucket of one key
+                if self.isSingleKey(file_a, file_b):
+                    self.logger.debug('Streaming bucket %d of one key with %d bytes.' % (i, size))
+                    for result in self.streamBucket(file_a, file_b, filter_fields):
+                        yield result
+                    self.removeFiles([file_a, file_b])
+                    continue
+                
+                # Stop when the last pass did not shrink the bucket
+                if depth >= self.max_depth or (parent_size != None and size >= parent_size):
+                    raise ValueError('Bucket %d with %d bytes can not be split below the memory limit.' % (i, size))
+                
+                self.logger.debug('Repartitioning bucket %d at depth %d with %d bytes.' % (i, depth, size))
+                prefix = '%d_%d' % (depth, i)
+                sub_files_a = self.repartitionFiles([file_a], wildcards, directory, prefix + 'a', depth + 1)
+                sub_files_b = self.repartitionFiles([file_b], wildcards, directory, prefix + 'b', depth + 1)
+                
+                for result in self.compareBuckets(sub_files_a, sub_files_b, filter_fields, wildcards, directory, depth + 1, size):
+                    yield result
+            else:
+                # Restore the original order of the events in the bucket
+                events_a = [event for position, key, event in sorted(self.readEntries(file_a))]
+                events_b = [event for position, key, event in sorted(self.readEntries(file_b))]
+                self.removeFiles([file_a, file_b])
+                
+                for result in UnorderedDiff.streamCompare(events_a, events_b, filter_fields):
+                    yield result
+                    
+    def isSingleKey(self, file_a, file_b):
+        first_key = None
+        for filename in [file_a, file_b]:
+            for position, key, event in self.readEntries(filename):
+                if first_key == None:
+                    first_key = key
+                elif key != first_key:
+                    return False
+                
+        return True
+    
+    def streamBucket(self, file_a, file_b, filter_fields):
+        # Every event in A pairs with every event in B so only the events of the
+        # output match are held, the bucket files are already in log order
+        field_names = UnorderedDiff.getFieldNames(filter_fields)
+        if file_a == None:
+            for position, key, event_b in self.readEntries(file_b):
+                match = EventMatch(event_b.field.getFields(field_names))
+                match.matches_b.append(event_b)
+                yield (UnorderedDiff.B_ONLY, match)
+            return
+        
+        events_b = [event for position, key, event in self.readEntries(file_b)]
+        match = None
+        for position, key, event_a in self.readEntries(file_a):
+            if len(events_b) == 0:
+                only_match = EventMatch(event_a.field.getFields(field_names))
+                only_match.matches_a.append(event_a)
+                yield (UnorderedDiff.A_ONLY, only_match)
+                continue
+            
+            if match is None:
+                match = EventMatch(event_a.field.getFields(field_names))
+                match.matches_b.extend(events_b)
+            match.matches_a.append(event_a)
+            yield (UnorderedDiff.BOTH, match)
+            
+    def iterEntries(self, events, filter_fields, field_names):
+        for position, event in enumerate(UnorderedDiff.iterFilterEvents(events, filter_fields)):
+            yield (position, UnorderedDiff.getKey(event, field_names), event)
+            
+    def repartitionFiles(self, filenames, wildcards, directory, prefix, depth):
+        # Merge on the position so every bucket stays in log order
+        entries = heapq.merge(*[self.readEntries(filename) for filename in filenames])
+        new_filenames, unused = self.partitionEntries(entries, wildcards, directory, prefix, depth)
+        self.removeFiles(filenames)
+        
+        return new_filenames
+        
+    def partitionEntries(self, entries, wildcards, directory, prefix, depth):
+        filenames = [None] * self.partitions
+        buffers = [[] for i in range(self.partitions)]
+        buffer_limit = self.memory_limit / (2 * self.MEMORY_EXPANSION)
+        buffered = 0
+        found_wildcards = set()
+        
+        for entry in entries:
+            key = entry[1]
+            found_wildcards.update(KeyIndex.getWildcards(key))
+            bucket = UnorderedDiff.hashKey(KeyIndex.project(key, wildcards), depth) % self.partitions
+            data = cPickle.dumps(entry, cPickle.HIGHEST_PROTOCOL)
+            buffers[bucket].append(data)
+            buffered += len(data)
+            
+            if buffered > buffer_limit:
+                self.flushBuffers(buffers, filenames, directory, prefix)
+                buffered = 0
+                
+        self.flushBuffers(buffers, filenames, directory, prefix)
+        
+        return (filenames, tuple(sorted(found_wildcards)))
+        
+    def flushBuffers(self, buffers, filenames, directory, prefix):
+        for i, buffer in enumerate(buffers):
+            if len(buffer) == 0:
+                continue
+            
+            if filenames[i] == None:
+                filenames[i] = os.path.join(directory, '%s_%d.bucket' % (prefix, i))
+                
+            with open(filenames[i], 'ab') as f:
+                f.write(''.join(buffer))
+                
+            del buffer[:]
+    
+    def readEntries(self, filename):
+        if filename == None:
+            return
+        
+        with open(filename, 'rb') as f:
+            while True:
+                try:
+                    yield cPickle.load(f)
+                except EOFError:
+                    break
+                
+    def getFileSize(self, filename):
+        if filename == None:
+            return 0
+        
+        return os.path.getsize(filename)
+    
+    def removeFiles(self, filenames):
+        for filename in filenames:
+            if filename != None:
+                os.remove(filename)
+    
@@ -0,0 +1,54 @@
+# ------------------------------------------------------
+#
+#   PhaseStats.py
+#   By: Fred Stakem
+#   Created: 10.18.26
+#
+# ------------------------------------------------------
+
+
+# Libs
+import time
+
+# User defined
+from Globals import *
+from Utilities import *
+
+# Main
+class PhaseStats(object):
+    
+    # Setup logging
+    logger = Utilities.getLogger(__name__)
+     
+    def __init__(self, name):
+        self.name = name
+        self.seconds = 0.0
+        self.calls = 0
+        self.comparisons = 0
+        self.events_in = 0
+        self.events_out = 0
+        self.started = None
+        
+    def start(self):
+        self.started = time.time()
+        
+    def stop(self, events_in=0, events_out=0, comparisons=0):
+        self.seconds += time.time() - self.started
+        self.started = None
+        self.calls += 1
+        self.events_in += events_in
+        self.events_out += events_out
+        self.comparisons += comparisons
+        
+    def to_dict(self):
+        return { 'name': self.name,
+                 'seconds': self.seconds,
+                 'calls': self.calls,
+                 'comparisons': self.comparisons,
+                 'events_in': self.events_in,
+                 'events_out': self.events_out }
+        
+    def __str__(self):
+        return '%s: %.6fs, %d calls, %d comparisons, %d events in, %d events out' % (self.name, self.seconds, self.calls, 
+                                                                                   self.comparisons, self.events_in, self.events_out)
+    
@@ -0,0 +1,131 @@
+# ------------------------------------------------------
+#
+#   ResultReader.py
+#   By: Fred Stakem
+#   Created: 10.18.26
+#
+# ------------------------------------------------------
+
+
+# Libs
+import json
+import struct
+
+# User defined
+from Globals import *
+from Utilities import *
+from ResultWriter import ResultWriter
+
+# Main
+class ResultReader(object):
+    
+    # Setup logging
+    logger = Utilities.getLogger(__name__)
+    
+    def __init__(self, filename):
+        self.filename = filename
+        self.file = open(filename, 'rb')
+        self.position = 0
+        
+        header = self.file.read(ResultWriter.HEADER.size)
+        if len(header) == ResultWriter.HEADER.size and header[:len(ResultWriter.MAGIC)] == ResultWriter.MAGIC:
+            magic, version, self.index_interval = ResultWriter.HEADER.unpack(header)
+            if version != ResultWriter.VERSION:
+                raise ValueError('Unsupported result file version %d.' % (version))
+            self.format = ResultWriter.BINARY
+            self.readIndex()
+        else:
+            # JSON lines have no index so seeking scans from the start
+            self.format = ResultWriter.JSON
+            self.count = None
+            self.file.seek(0)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, type, value, traceback):
+        self.close()
+    
+    def __iter__(self):
+        self.seek(0)
+        record = self.read()
+        while record != None:
+            yield record
+            record = self.read()
+    
+    def __len__(self):
+        if self.count == None:
+            position = self.position
+            self.count = sum([1 for record in self])
+            self.seek(position)
+            
+        return self.count
+    
+    def readIndex(self):
+        self.file.seek(-ResultWriter.TRAILER.size, 2)
+        self.index_offset, self.count, magic = ResultWriter.TRAILER.unpack(self.file.read(ResultWriter.TRAILER.size))
+        if magic != ResultWriter.MAGIC:
+            raise ValueError('Result file %s is truncated.' % (self.filename))
+            
+        blocks = (self.count + self.index_interval - 1) // self.index_interval
+        self.file.seek(self.index_offset)
+        self.offsets = struct.unpack('<%dQ' % (blocks), self.file.read(8 * blocks))
+        self.seek(0)
+    
+    def seek(self, position):
+        if self.format == ResultWriter.JSON:
+            self.file.seek(0)
+            self.position = 0
+        elif position >= self.count:
+            self.file.seek(self.index_offset)
+            self.position = self.count
+            return
+        else:
+            # Jump to the block then skip the records before the position
+            block = position // self.index_interval
+            self.file.seek(self.offsets[block])
+            self.position = block * self.index_interval
+            
+        while self.position < position and self.skip():
+            self.position += 1
+    
+    def skip(self):
+        if self.format == ResultWriter.JSON:
+            return len(self.file.readline()) > 0
+            
+        if self.position >= self.count:
+            return False
+        length = ResultWriter.RECORD.unpack(self.file.read(ResultWriter.RECORD.size))[0]
+        self.file.seek(length - ResultWriter.RECORD.size, 1)
+        
+        return True
+    
+    def read(self):
+        if self.format == ResultWriter.JSON:
+            line = self.file.readline()
+            if len(line) == 0:
+                return None
+            self.position += 1
+            return json.loads(line)
+            
+        if self.position >= self.count:
+            return None
+            
+        length, category_length, key_length, count_a, count_b = ResultWriter.RECORD.unpack(self.file.read(ResultWriter.RECORD.size))
+        data = self.file.read(length - ResultWriter.RECORD.size)
+        key_end = category_length + key_length
+        indices = struct.unpack('<%dq' % (count_a + count_b), data[key_end:])
+        self.position += 1
+        
+        return { 'category': data[:category_length],
+                 'key': json.loads(data[category_length:key_end]),
+                 'indices_a': list(indices[:count_a]),
+                 'indices_b': list(indices[count_a:]) }
+    
+    def getRecord(self, position):
+        self.seek(position)
+        return self.read()
+    
+    def close(self):
+        self.file.close()
+
@@ -0,0 +1,139 @@
+# ------------------------------------------------------
+#
+#   ResultWriter.py
+#   By: Fred Stakem
+#   Created: 10.18.26
+#
+# ------------------------------------------------------
+
+
+# Libs
+import json
+import struct
+from array import array
+
+# User defined
+from Globals import *
+from Utilities import *
+from UnorderedDiff import UnorderedDiff
+from CompactMatch import CompactMatch
+
+# Main
+class ResultWriter(object):
+    
+    # Setup logging
+    logger = Utilities.getLogger(__name__)
+    
+    # Formats
+    JSON = 'json'
+    BINARY = 'binary'
+    
+    # Binary layout
+    MAGIC = 'CMPLYRES'
+    VERSION = 1
+    HEADER = struct.Struct('<8sII')
+    RECORD = struct.Struct('<IBIII')
+    TRAILER = struct.Struct('<QQ8s')
+    
+    # Keep one offset for every block of records
+    INDEX_INTERVAL = 1024
+    
+    def __init__(self, filename, format=BINARY, index_interval=INDEX_INTERVAL):
+        if format not in [self.JSON, self.BINARY]:
+            raise ValueError('Unknown result format %s.' % (format))
+            
+        self.filename = filename
+        self.format = format
+        self.index_interval = index_interval
+        self.count = 0
+        self.offsets = array('L')
+        self.file = open(filename, 'wb')
+        
+        if self.format == self.BINARY:
+            self.file.write(self.HEADER.pack(self.MAGIC, self.VERSION, index_interval))
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, type, value, traceback):
+        self.close()
+    
+    def write(self, category, match):
+        key, indices_a, indices_b = self.getRecord(match)
+        
+        if self.format == self.JSON:
+            record = { 'category': category, 'key': key, 'indices_a': indices_a, 'indices_b': indices_b }
+            self.file.write(json.dumps(record, default=str) + '\n')
+        else:
+            if self.count % self.index_interval == 0:
+                self.offsets.append(self.file.tell())
+                
+            key = json.dumps(key, default=str)
+            length = self.RECORD.size + len(category) + len(key) + 8 * (len(indices_a) + len(indices_b))
+            self.file.write(self.RECORD.pack(length, len(category), len(key), len(indices_a), len(indices_b)))
+            self.file.write(category)
+            self.file.write(key)
+            self.file.write(struct.pack('<%dq' % (len(indices_a) + len(indices_b)), *(indices_a + indices_b)))
+            
+        self.count += 1
+    
+    def getRecord(self, match):
+        # Unbound compact matches only know their key and log positions
+        if isinstance(match, CompactMatch) and (match.events_a == None or match.events_b == None):
+            key = None if match.key == None else list(match.key)
+            return (key, list(match.positions_a), list(match.positions_b))
+            
+        key = None if match.fields == None else [field.value for field in match.fields]
+        indices_a = [event.index for event in match.matches_a]
+        indices_b = [event.index for event in match.matches_b]
+        
+        return (key, indices_a, indices_b)
+    
+    def writeStream(self, stream):
+        # Works with the (category, match) pairs of streamCompare where a match
+        # is yielded again for every event of log A with the same key
+        pending = []
+        written = set()
+        for category, match in stream:
+            if category == UnorderedDiff.BOTH:
+                if id(match) not in written:
+                    written.add(id(match))
+                    pending.append(match)
+                continue
+                
+            # Matches in both logs are complete once log B is being drained
+            if category == UnorderedDiff.B_ONLY:
+                self.writeMatches(UnorderedDiff.BOTH, pending)
+                pending = []
+                written = set()
+            self.write(category, match)
+            
+        self.writeMatches(UnorderedDiff.BOTH, pending)
+    
+    def writeResults(self, matches_both, matches_a_only, matches_b_only):
+        for category, matches in [(UnorderedDiff.BOTH, matches_both), (UnorderedDiff.A_ONLY, matches_a_only), (UnorderedDiff.B_ONLY, matches_b_only)]:
+            self.writeMatches(category, matches)
+    
+    def writeMatches(self, category, matches):
+        # The same match can be listed once for every event of log A
+        written = set()
+        for match in matches:
+            if id(match) not in written:
+                written.add(id(match))
+                self.write(category, match)
+    
+    def close(self):
+        if self.file == None:
+            return
+            
+        # The sparse offset index and the trailer go after the records
+        if self.format == self.BINARY:
+            index_offset = self.file.tell()
+            self.file.write(struct.pack('<%dQ' % (len(self.offsets)), *self.offsets))
+            self.file.write(self.TRAILER.pack(index_offset, self.count, self.MAGIC))
+            
+        self.file.close()
+        self.file = None
+        
+        self.logger.debug('Wrote %d results to %s.' % (self.count, self.filename))
+
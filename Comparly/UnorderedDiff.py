@@ -8,25 +8,36 @@
 
 
 # Libs
-# None
+import hashlib
+import struct
+from array import array
 
 # User defined
 from Globals import *
 from Utilities import *
 from Corely import EventMatch
 from Corely import Field
+from KeyIndex import KeyIndex
+from EventTable import EventTable
+from KeySummary import KeySummary
+from CompactMatch import CompactMatch
 
 # Main
 class UnorderedDiff(object):
     
     # Setup logging
     logger = Utilities.getLogger(__name__)
+    
+    # Match categories
+    BOTH = 'both'
+    A_ONLY = 'a_only'
+    B_ONLY = 'b_only'
      
     def __init__(self):
         pass
       
     @classmethod  
-    def compare(cls, events_a, events_b, filter_fields):
+    def compare(cls, events_a, events_b, filter_fields, stats=None):
         cls.logger.debug('Starting the unordered diff comparison.')
         
         # Input
@@ -41,13 +52,23 @@ class UnorderedDiff(object):
         cls.logger.debug('Found %d events in the second log.' % (len(events_b)))
         cls.logger.debug('Found %d fields used for filtering.' % (len(filter_fields)))
         
-        for i, field in enumerate(filter_fields):
-            cls.logger.debug('Filter field %d:\n%s' % (i, field.to_pretty_json()))
+        if globals.debug_diff:
+            for i, field in enumerate(filter_fields):
+                cls.logger.debug('Filter field %d:\n%s' % (i, field.to_pretty_json()))
         
         # Filter events
         cls.logger.debug('Filtering the events.')
+        if stats is not None:
+            stats.start('filter')
+            events_in = len(events_a) + len(events_b)
+            
         events_a = cls.filterEvents(events_a, filter_fields)
         events_b = cls.filterEvents(events_b, filter_fields)
+        
+        if stats is not None:
+            stats.stop('filter', events_in, len(events_a) + len(events_b), events_in)
+            search = stats.getPhase('previous_match_search')
+            scan = stats.getPhase('scan_b')
          
         cls.logger.debug('Using %d events from the first log.' % (len(events_a)))
         cls.logger.debug('Using %d events from the second log.' % (len(events_b)))
@@ -63,13 +84,26 @@ class UnorderedDiff(object):
                 cls.logger.debug('Events left in second log: %d' % (len(events_b)))
                 cls.logger.debug('Match:\n%s' % (str(match)))
             
-            # Search for previous match
-            for m in matches_both:
-                if m == match:
-                    match = m
-                    if globals.debug_diff:
-                        cls.logger.debug('Found a previous match for the current event.')
-                    break
+            # Search for previous match, only counting comparisons for the stats
+            if stats is None:
+                for m in matches_both:
+                    if m == match:
+                        match = m
+                        if globals.debug_diff:
+                            cls.logger.debug('Found a previous match for the current event.')
+                        break
+            else:
+                search.start()
+                comparisons = 0
+                for m in matches_both:
+                    comparisons += 1
+                    if m == match:
+                        match = m
+                        if globals.debug_diff:
+                            cls.logger.debug('Found a previous match for the current event.')
+                        break
+                search.stop(1, int(len(match.matches_a) > 0), comparisons)
+                scan.start()
              
             # Put the current event into the match
             match.matches_a.append(event_a)    
@@ -81,6 +115,9 @@ class UnorderedDiff(object):
                     match.matches_b.append(event_b)
                 else:
                     non_matching_events.append(event_b)
+                    
+            if stats is not None:
+                scan.stop(len(events_b), len(events_b) - len(non_matching_events), len(events_b))
              
             # Set the data so only searching though unmatched values from log B     
             events_b = non_matching_events
@@ -95,16 +132,234 @@ class UnorderedDiff(object):
                 if globals.debug_diff:
                     cls.logger.debug('Found an event in log A and log B.')
                     
+        if stats is not None:
+            stats.notify('previous_match_search')
+            stats.notify('scan_b')
+            stats.start('group_b')
+                    
         # Group output    
         for event_b in events_b:
             fields_filtered_on = event_b.field.getFields(field_names)
             match = EventMatch(fields_filtered_on)
             match.matches_b.append(event_b)
             matches_b_only.append(match)   
+            
+        if stats is not None:
+            stats.stop('group_b', len(events_b), len(matches_b_only))
            
         cls.logger.debug('Finished the comparison.') 
         
         return (matches_both, matches_a_only, matches_b_only)
+    
+    @classmethod  
+    def indexedCompare(cls, events_a, events_b, filter_fields, normalizer=None):
+        cls.logger.debug('Starting the indexed unordered diff comparison.')
+             
+        # Output
+        matches = { cls.BOTH: [], cls.A_ONLY: [], cls.B_ONLY: [] }
+        
+        for category, match in cls.streamCompare(events_a, events_b, filter_fields, normalizer):
+            matches[category].append(match)
+           
+        cls.logger.debug('Finished the comparison.') 
+        
+        return (matches[cls.BOTH], matches[cls.A_ONLY], matches[cls.B_ONLY])
+    
+    @classmethod  
+    def streamCompare(cls, events_a, events_b, filter_fields, normalizer=None):
+        cls.logger.debug('Starting the streaming unordered diff comparison.')
+        
+        # Input
+        field_names = cls.getFieldNames(filter_fields)
+        if isinstance(events_a, EventTable) != isinstance(events_b, EventTable):
+            raise ValueError('Both logs must be event tables or neither.')
+        if isinstance(events_a, EventTable) and events_a.codebook is not events_b.codebook:
+            raise ValueError('Event tables must share a codebook.')
+        
+        # Index log B by the filter key
+        index_b = KeyIndex()
+        indexed_events_b = []
+        for event_b, key in cls.iterKeyedEvents(events_b, filter_fields, field_names, normalizer):
+            index_b.add(key)
+            indexed_events_b.append(event_b)
+        events_b = indexed_events_b
+        previous_matches = {}
+        
+        cls.logger.debug('Indexed %d events from the second log.' % (len(index_b)))
+          
+        # Stream log A through the index
+        for event_a, key in cls.iterKeyedEvents(events_a, filter_fields, field_names, normalizer):
+            match = previous_matches.get(key)
+            
+            # Take all of the log B events for a key the first time it is seen
+            if match is None:
+                match = EventMatch(event_a.field.getFields(field_names))
+                positions = index_b.take(key)
+                if len(positions) > 0:
+                    match.matches_b.extend([events_b[i] for i in positions])
+                    previous_matches[key] = match
+                    
+            # Put the current event into the match
+            match.matches_a.append(event_a)
+            
+            if len(match.matches_b) == 0:
+                yield (cls.A_ONLY, match)
+            else:
+                yield (cls.BOTH, match)
+                
+        # Release the matches before emitting the unmatched log B events
+        previous_matches = None
+                    
+        # Emit the unmatched log B events in their original order
+        for position in index_b.remaining():
+            event_b = events_b[position]
+            match = EventMatch(event_b.field.getFields(field_names))
+            match.matches_b.append(event_b)
+            yield (cls.B_ONLY, match)
+           
+        cls.logger.debug('Finished the streaming comparison.') 
+        
+    @classmethod  
+    def summarize(cls, events_a, events_b, filter_fields, exemplars=0, normalizer=None):
+        cls.logger.debug('Starting the unordered diff summary.')
+        
+        # Input
+        field_names = cls.getFieldNames(filter_fields)
+        
+        # Count each key without keeping the events
+        summaries = {}
+        for event_a, key in cls.iterKeyedEvents(events_a, filter_fields, field_names, normalizer):
+            summary = summaries.get(key)
+            if summary is None:
+                summary = KeySummary()
+                summaries[key] = summary
+                
+            summary.count_a += 1
+            if len(summary.exemplars_a) < exemplars:
+                summary.exemplars_a.append(event_a.index)
+                
+        for event_b, key in cls.iterKeyedEvents(events_b, filter_fields, field_names, normalizer):
+            summary = summaries.get(key)
+            if summary is None:
+                summary = KeySummary()
+                summaries[key] = summary
+                
+            summary.count_b += 1
+            if len(summary.exemplars_b) < exemplars:
+                summary.exemplars_b.append(event_b.index)
+                
+        # Output
+        summaries_both = {}
+        summaries_a_only = {}
+        summaries_b_only = {}
+        
+        for key, summary in summaries.iteritems():
+            if summary.count_b == 0:
+                summaries_a_only[key] = summary
+            elif summary.count_a == 0:
+                summaries_b_only[key] = summary
+            else:
+                summaries_both[key] = summary
+                
+        cls.logger.debug('Finished the summary of %d keys.' % (len(summaries)))
+                
+        return (summaries_both, summaries_a_only, summaries_b_only)
+        
+    @classmethod  
+    def compareCompact(cls, events_a, events_b, filter_fields, normalizer=None):
+        cls.logger.debug('Starting the compact unordered diff comparison.')
+        
+        # Input
+        field_names = cls.getFieldNames(filter_fields)
+        if isinstance(events_a, EventTable) != isinstance(events_b, EventTable):
+            raise ValueError('Both logs must be event tables or neither.')
+        if isinstance(events_a, EventTable) and events_a.codebook is not events_b.codebook:
+            raise ValueError('Event tables must share a codebook.')
+        
+        # Index log B by the filter key
+        index_b = KeyIndex()
+        positions_b = array('l')
+        for position, key in cls.iterKeyedPositions(events_b, filter_fields, field_names, normalizer):
+            index_b.add(key)
+            positions_b.append(position)
+            
+        # Group log A by key with one match per key, a key takes its log B
+        # events the first time it is seen like compare
+        matches = {}
+        matches_both = []
+        matches_a_only = []
+        for position, key in cls.iterKeyedPositions(events_a, filter_fields, field_names, normalizer):
+            match = matches.get(key)
+            if match is None:
+                match = CompactMatch(key, field_names, events_a, events_b)
+                matches[key] = match
+                
+                match.positions_b.extend([positions_b[i] for i in index_b.take(key)])
+                if len(match.positions_b) == 0:
+                    matches_a_only.append(match)
+                else:
+                    matches_both.append(match)
+                    
+            match.positions_a.append(position)
+            
+        # Group the unmatched log B events by key in their original order
+        matches_b_only = []
+        b_only = {}
+        for i in index_b.remaining():
+            key = index_b.keys[i]
+            match = b_only.get(key)
+            if match is None:
+                match = CompactMatch(key, field_names, events_a, events_b)
+                b_only[key] = match
+                matches_b_only.append(match)
+            match.positions_b.append(positions_b[i])
+            
+        cls.logger.debug('Finished the compact comparison of %d keys.' % (len(matches) + len(b_only)))
+        
+        return (matches_both, matches_a_only, matches_b_only)
+        
+    @classmethod
+    def getKey(cls, event, field_names):
+        return tuple([field.value for field in event.field.getFields(field_names)])
+    
+    @classmethod
+    def hashKey(cls, key, seed=0):
+        digest = hashlib.md5(repr((seed, key))).digest()
+        return struct.unpack('<Q', digest[:8])[0]
+    
+    @classmethod
+    def iterKeyedEvents(cls, events, filter_fields, field_names, normalizer=None):
+        # Tables already hold the encoded keys
+        if isinstance(events, EventTable):
+            rows = events.filter(filter_fields)
+            keyed_events = ((events[row], key) for row, key in zip(rows, events.getKeys(rows, field_names)))
+        else:
+            keyed_events = ((event, cls.getKey(event, field_names)) for event in cls.iterFilterEvents(events, filter_fields))
+            
+        # Match on message templates instead of the raw values
+        if normalizer == None:
+            return keyed_events
+        if isinstance(events, EventTable):
+            raise ValueError('Event tables hold encoded keys that can not be normalized.')
+        
+        return ((event, normalizer.normalizeKey(key, field_names)) for event, key in keyed_events)
+        
+    @classmethod
+    def iterKeyedPositions(cls, events, filter_fields, field_names, normalizer=None):
+        # Tables give the keys without touching the events
+        if isinstance(events, EventTable):
+            rows = events.filter(filter_fields)
+            keyed_positions = zip(rows.tolist(), events.getKeys(rows, field_names))
+        else:
+            keyed_positions = ((position, cls.getKey(event, field_names)) for position, event in enumerate(events)
+                               if event.field.containsFields(filter_fields))
+            
+        if normalizer == None:
+            return keyed_positions
+        if isinstance(events, EventTable):
+            raise ValueError('Event tables hold encoded keys that can not be normalized.')
+        
+        return ((position, normalizer.normalizeKey(key, field_names)) for position, key in keyed_positions)
         
     @classmethod
     def getFieldNames(cls, filter_fields):
@@ -124,6 +379,12 @@ class UnorderedDiff(object):
                       
         return tmp_events
     
+    @classmethod
+    def iterFilterEvents(cls, events, filter_fields):
+        for event in events:
+            if event.field.containsFields(filter_fields):
+                yield event
+    
    
             
                     
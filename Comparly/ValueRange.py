@@ -0,0 +1,39 @@
+# ------------------------------------------------------
+#
+#   ValueRange.py
+#   By: Fred Stakem
+#   Created: 10.18.26
+#
+# ------------------------------------------------------
+
+
+# Libs
+# None
+
+# User defined
+from Globals import *
+from Utilities import *
+
+# Main
+class ValueRange(object):
+    
+    # Inclusive bounds, None leaves a side open
+    __slots__ = ['low', 'high']
+     
+    def __init__(self, low=None, high=None):
+        self.low = low
+        self.high = high
+        
+    def contains(self, value):
+        if value == None:
+            return False
+        if self.low != None and value < self.low:
+            return False
+        if self.high != None and value > self.high:
+            return False
+        
+        return True
+    
+    def __str__(self):
+        return 'ValueRange(%s, %s)' % (str(self.low), str(self.high))
+    
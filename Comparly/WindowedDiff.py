@@ -0,0 +1,104 @@
+# ------------------------------------------------------
+#
+#   WindowedDiff.py
+#   By: Fred Stakem
+#   Created: 10.18.26
+#
+# ------------------------------------------------------
+
+
+# Libs
+from datetime import timedelta
+
+# User defined
+from Globals import *
+from Utilities import *
+from Corely import EventMatch
+from UnorderedDiff import UnorderedDiff
+
+# Main
+class WindowedDiff(object):
+    
+    # Setup logging
+    logger = Utilities.getLogger(__name__)
+    
+    def __init__(self, tolerance, timestamp_field='timestamp'):
+        self.tolerance = timedelta(seconds=tolerance)
+        self.timestamp_field = timestamp_field
+    
+    def compare(self, events_a, events_b, filter_fields, normalizer=None):
+        self.logger.debug('Starting the windowed diff comparison with a tolerance of %s.' % (str(self.tolerance)))
+        
+        # Input
+        field_names = UnorderedDiff.getFieldNames(filter_fields)
+        
+        # Output
+        matches_both = []
+        matches_a_only = []
+        matches_b_only = []
+        
+        # Group both logs by key, events without a time can never be paired
+        groups = {}
+        keys = []
+        for side, events in enumerate([events_a, events_b]):
+            for event, key in UnorderedDiff.iterKeyedEvents(events, filter_fields, field_names, normalizer):
+                timestamp = self.getTimestamp(event)
+                if timestamp == None:
+                    self.addMatch(matches_a_only if side == 0 else matches_b_only, event, side, field_names)
+                    continue
+                    
+                group = groups.get(key)
+                if group is None:
+                    group = ([], [])
+                    groups[key] = group
+                    keys.append(key)
+                group[side].append((timestamp, event))
+                
+        # Sweep the time sorted events of each key
+        for key in keys:
+            timed_a, timed_b = groups[key]
+            timed_a.sort(key=lambda timed: timed[0])
+            timed_b.sort(key=lambda timed: timed[0])
+            
+            i = 0
+            j = 0
+            while i < len(timed_a) and j < len(timed_b):
+                offset = timed_b[j][0] - timed_a[i][0]
+                if offset < -self.tolerance:
+                    self.addMatch(matches_b_only, timed_b[j][1], 1, field_names)
+                    j += 1
+                elif offset > self.tolerance:
+                    self.addMatch(matches_a_only, timed_a[i][1], 0, field_names)
+                    i += 1
+                else:
+                    match = EventMatch(timed_a[i][1].field.getFields(field_names))
+                    match.matches_a.append(timed_a[i][1])
+                    match.matches_b.append(timed_b[j][1])
+                    matches_both.append(match)
+                    i += 1
+                    j += 1
+                    
+            for timestamp, event_a in timed_a[i:]:
+                self.addMatch(matches_a_only, event_a, 0, field_names)
+            for timestamp, event_b in timed_b[j:]:
+                self.addMatch(matches_b_only, event_b, 1, field_names)
+                
+        self.logger.debug('Finished the windowed comparison of %d keys.' % (len(keys)))
+        
+        return (matches_both, matches_a_only, matches_b_only)
+    
+    def getTimestamp(self, event):
+        field = event.field.getField(self.timestamp_field)
+        if field == None:
+            return None
+            
+        return field.value
+    
+    def addMatch(self, matches, event, side, field_names):
+        match = EventMatch(event.field.getFields(field_names))
+        if side == 0:
+            match.matches_a.append(event)
+        else:
+            match.matches_b.append(event)
+        matches.append(match)
+
@@ -1,2 +1,34 @@
+from KeyIndex import KeyIndex
+from EventTable import EventTable
+from ValueRange import ValueRange
+from EventIndex import EventIndex
+from FilterCompiler import FilterCompiler
+from KeySummary import KeySummary
+from CompactMatch import CompactMatch
+from MessageNormalizer import MessageNormalizer
+from PhaseStats import PhaseStats
+from DiffStats import DiffStats
 from UnorderedDiff import UnorderedDiff
-from DistanceCalculator import DistanceCalculator
\ No newline at end of file
+from DistanceCalculator import DistanceCalculator
+from PartitionedDiff import PartitionedDiff
+from ParallelDiff import ParallelDiff
+from NearestMatcher import NearestMatcher
+from IncrementalDiff import IncrementalDiff
+from LogTailer import LogTailer
+from BaselineIndex import BaselineIndex
+from EventCache import EventCache
+from EventLoader import EventLoader
+from ParallelLoader import ParallelLoader
+from LazyField import LazyField
+from LazyEvent import LazyEvent
+from LazyLoader import LazyLoader
+from BatchRunner import BatchRunner
+from DiffServer import DiffServer
+from DiffClient import DiffClient
+from ResultWriter import ResultWriter
+from ResultReader import ResultReader
+from NWayMatch import NWayMatch
+from NWayDiff import NWayDiff
+from LogSketch import LogSketch
+from WindowedDiff import WindowedDiff
+from OrderedDiff import OrderedDiff
@@ -0,0 +1,204 @@
+# ------------------------------------------------------
+#
+#   TestBaselineIndex.py
+#   By: Fred Stakem
+#   Created: 10.18.26
+#
+# ------------------------------------------------------
+
+
+# Libs
+import unittest
+import os
+import tempfile
+from datetime import datetime
+
+# User defined
+from Globals import *
+from Utilities import *
+
+from Corely import Field
+from Corely import Event
+
+from Comparly import UnorderedDiff
+from Comparly import BaselineIndex
+
+#Main
+class BaselineIndexTest(unittest.TestCase):
+    
+    # Setup logging
+    logger = Utilities.getLogger(__name__)
+    
+    @classmethod
+    def setUpClass(cls):
+        pass
+    
+    @classmethod
+    def tearDownClass(cls):
+        pass
+    
+    def setUp(self):
+        self.tmp_debug_diff = globals.debug_diff
+        globals.debug_diff = True
+        
+        self.event_data_a = [ [datetime(2013, 7, 11, 9, 51, 12), 'ubuntu kernel', None, None, 'imklog 5.8.11, log source = /proc/kmsg started.'],
+                              [datetime(2013, 7, 11, 9, 51, 13), 'ubuntu kernel', None, None, '[    0.000000] Initializing cgroup subsys cpuset'],
+                              [datetime(2013, 7, 11, 9, 51, 14), 'ubuntu NetworkManager', 887, None, 'SCPlugin-Ifupdown: init!'],
+                              [datetime(2013, 7, 11, 9, 51, 15), 'ubuntu NetworkManager', 887, None, 'SCPluginIfupdown: management mode: unmanaged'],
+                              [datetime(2013, 7, 11, 9, 51, 16), 'ubuntu NetworkManager', 887, 'info', 'modem-manager is now available'],
+                              [datetime(2013, 7, 11, 9, 51, 17), 'ubuntu NetworkManager', 887, 'info', 'WiFi hardware radio set enabled'],
+                              [datetime(2013, 7, 11, 9, 51, 18), 'ubuntu NetworkManager', 887, 'info', 'WiFi hardware radio set enabled'],
+                              [datetime(2013, 7, 11, 9, 51, 19), 'ubuntu NetworkManager', 887, 'warn', 'DNS: plugin dnsmasq update failed'],
+                              [datetime(2013, 7, 11, 9, 51, 21), 'ubuntu colord', None, None, 'Profile added: icc-0bd9f292ce7882699e93ff844071783d'], ]
+        
+        self.event_data_b = [ [datetime(2013, 8, 6, 7, 12, 35), 'ubuntu kernel', None, None, 'imklog 5.8.11, log source = /proc/kmsg started.'],
+                              [datetime(2013, 8, 6, 7, 12, 36), 'ubuntu kernel', None, None, '[    0.000000] Initializing cgroup subsys cpuset'],
+                              [datetime(2013, 8, 6, 7, 12, 37), 'ubuntu NetworkManager', 887, None, 'SCPlugin-Ifupdown: init!'],
+                              [datetime(2013, 8, 6, 7, 12, 38), 'ubuntu NetworkManager', 887, None, 'SCPluginIfupdown: management mode: managed'],
+                              [datetime(2013, 8, 6, 7, 12, 39), 'ubuntu NetworkManager', 887, 'info', 'modem-manager is now available'],
+                              [datetime(2013, 8, 6, 7, 12, 41), 'ubuntu NetworkManager', 887, 'info', 'modem-manager is now available'],
+                              [datetime(2013, 8, 6, 7, 12, 42), 'ubuntu NetworkManager', 887, 'info', 'modem-manager is now available'],
+                              [datetime(2013, 8, 6, 7, 12, 43), 'ubuntu NetworkManager', 887, 'info', 'WiFi hardware radio set enabled'],
+                              [datetime(2013, 8, 6, 7, 12, 44), 'ubuntu NetworkManager', 887, 'error', 'DNS: plugin dnsmasq update failed'],
+                              [datetime(2013, 8, 6, 7, 12, 44), 'ubuntu colord', None, None, 'Profile added: icc-0bd9f292ce7882699e93ff844071783d'], ]
+        
+    def tearDown(self):
+        globals.debug_diff = self.tmp_debug_diff
+          
+    @log_test(logger, globals.log_separator)
+    def testCompare(self):
+        BaselineIndexTest.logger.debug('Test the comparison against a compiled baseline index.')
+        
+        # Test data
+        events_a = self.createEventLog(self.event_data_a)
+        events_b = self.createEventLog(self.event_data_b)
+        filter = {'component': None, 'component_id': None, 'level': None, 'sub_msg':None }
+        filter_fields = self.createFilterFields(filter)
+        handle, filename = tempfile.mkstemp()
+        os.close(handle)
+        
+        try:
+            # Run test
+            BaselineIndex.compile(events_a, filter_fields, filename)
+            index = BaselineIndex(filename)
+            matches_both, matches_a_only, matches_b_only = index.compare(events_b, filter_fields, events_a)
+            expected = UnorderedDiff.compareCompact(events_a, events_b, filter_fields)
+            
+            # Show test output
+            BaselineIndexTest.logger.debug('Found %d keys in the baseline index.' % (len(index)))
+            BaselineIndexTest.logger.debug('Found keys only in A: %d' % (len(matches_a_only))) 
+            BaselineIndexTest.logger.debug('Found keys only in B: %d' % (len(matches_b_only)))  
+            BaselineIndexTest.logger.debug('Found keys in A and B: %d' % (len(matches_both)))
+            
+            # Verify results
+            assert len(index) == 8, 'Found the incorrect number of keys in the baseline index.'
+            assert len(matches_both) == 6, 'Found an incorrect number of keys in both A and B.'
+            assert len(matches_a_only) == 2, 'Found the incorrect number of A only keys.'
+            assert len(matches_b_only) == 2, 'Found the incorrect number of B only keys.'
+            
+            indices_a = sorted([sorted(m.positions_a) for m in matches_both + matches_a_only])
+            assert indices_a == [[0], [1], [2], [3], [4], [5, 6], [7], [8]], 'Incorrect baseline event indices.'
+            
+            modem = [m for m in matches_both if len(m.positions_b) == 3]
+            assert len(modem) == 1 and list(modem[0].positions_a) == [4], 'Incorrect match for repeated events.'
+            assert modem[0].matches_a == [events_a[4]] and modem[0].matches_b == events_b[4:7], 'Incorrect events for repeated events.'
+            
+            for matches, expected_matches in zip([matches_both, matches_a_only, matches_b_only], expected):
+                keys = sorted([[field.value for field in m.fields] for m in matches])
+                expected_keys = sorted([[field.value for field in m.fields] for m in expected_matches])
+                assert keys == expected_keys, 'Incorrect keys of the matches.'
+            assert all([m.key == None for m in matches_a_only]), 'Found a key for a match only in the baseline.'
+        finally:
+            del index
+            os.remove(filename)
+        
+        BaselineIndexTest.logger.debug('Test succeeded!')
+        
+    @log_test(logger, globals.log_separator)
+    def testCompareIndexGap(self):
+        BaselineIndexTest.logger.debug('Test the comparison against a baseline with gaps in the event indices.')
+        
+        # Test data
+        events_a = self.createEventLog(self.event_data_a[:3])
+        events_a[1].index = 2
+        events_a[2].index = 3
+        events_b = self.createEventLog(self.event_data_b[1:3])
+        filter = {'component': None, 'component_id': None, 'level': None, 'sub_msg':None }
+        filter_fields = self.createFilterFields(filter)
+        handle, filename = tempfile.mkstemp()
+        os.close(handle)
+        
+        try:
+            # Run test
+            index = BaselineIndex.compile(events_a, filter_fields, filename)
+            matches_both, matches_a_only, matches_b_only = index.compare(events_b, filter_fields, events_a)
+            
+            # Show test output
+            BaselineIndexTest.logger.debug('Found keys only in A: %d' % (len(matches_a_only))) 
+            BaselineIndexTest.logger.debug('Found keys only in B: %d' % (len(matches_b_only)))  
+            BaselineIndexTest.logger.debug('Found keys in A and B: %d' % (len(matches_both)))
+            
+            # Verify results
+            assert len(matches_both) == 2, 'Found an incorrect number of keys in both A and B.'
+            assert len(matches_a_only) == 1, 'Found the incorrect number of A only keys.'
+            assert len(matches_b_only) == 0, 'Found the incorrect number of B only keys.'
+            
+            for match in matches_both:
+                assert match.matches_a[0].field.getField('sub_msg').value == match.matches_b[0].field.getField('sub_msg').value, 'Incorrect baseline event for a match.'
+            assert matches_a_only[0].matches_a == [events_a[0]], 'Incorrect baseline event for an A only match.'
+        finally:
+            del index
+            os.remove(filename)
+        
+        BaselineIndexTest.logger.debug('Test succeeded!')
+        
+    def createEventLog(self, data):
+        events = []
+        for i, ed in enumerate(data):
+            events.append( self.createEvent(i, ed[0], ed[1], ed[2], ed[3], ed[4]))
+        
+        return events
+     
+    def createEvent(self, index, timestamp_data, component_data, component_id_data, level_data, sub_msg_data):
+        sub_msg = Field(sub_msg_data, [], 'sub_msg')
+        level = Field(level_data, [], 'level')
+        msg = Field(None, [level, sub_msg], 'msg')
+        component_id = Field(component_id_data, [], 'component_id')
+        component = Field(component_data, [], 'component')
+        source = Field(None, [component, component_id], 'source')
+        timestamp = Field(timestamp_data, [], 'timestamp')
+        msg = Field(None, [timestamp, source, msg], 'event')
+        
+        event = Event(index, msg)
+        
+        return event
+    
+    def createFilterFields(self, filter):
+        fields = []
+        for key, value in filter.iteritems():
+            fields.append( Field(value, [], key) )
+            
+        return fields
+    
+   
+ 
+
+        
+
+    
+    
+    
+    
+    
+    
+    
+  
+        
+ 
+        
+        
+        
+        
+        
+        
+     
\ No newline at end of file
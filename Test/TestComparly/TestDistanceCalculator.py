@@ -20,6 +20,8 @@ from Corely import Field
 from Corely import Event
 
 from Comparly import DistanceCalculator
+from Comparly import EventTable
+from Comparly import DiffStats
 
 #Main
 class DistanceCalculatorTest(unittest.TestCase):
@@ -72,6 +74,33 @@ class DistanceCalculatorTest(unittest.TestCase):
         
         DistanceCalculatorTest.logger.debug('Test succeeded!')
         
+    @log_test(logger, globals.log_separator)
+    def testCalculateStats(self):
+        DistanceCalculatorTest.logger.debug('Test the statistics of the distance calculation.')
+        
+        # Test data
+        event_data_a = [datetime(2013, 7, 11, 9, 51, 17), 'ubuntu NetworkManager', 887, 'info', 'WiFi hardware radio set enabled']
+        event_data_b = [datetime(2013, 8, 6, 7, 12, 43), 'ubuntu NetworkManager', 887, 'error', 'WiFi hardware radio set disabled']
+        weights = { 'component': 3, 'component_id': 1, 'level': 2, 'sub_msg': 2}
+        
+        event_a = self.createEvent(0, event_data_a[0], event_data_a[1], event_data_a[2], event_data_a[3], event_data_a[4])
+        event_b = self.createEvent(0, event_data_b[0], event_data_b[1], event_data_b[2], event_data_b[3], event_data_b[4])
+        stats = DiffStats()
+        
+        # Run test
+        normal_distance = DistanceCalculator.calculate(event_a, event_b, weights, True, stats)
+        
+        # Show test output
+        DistanceCalculatorTest.logger.debug('Calculated normalized distance: %s' % str(normal_distance))
+        DistanceCalculatorTest.logger.debug('Stats: %s' % str(stats.getPhase('calculate')))
+            
+        # Verify results
+        assert normal_distance == 0.5, 'Incorrect distance calculation.'
+        assert stats.getPhase('calculate').calls == 1, 'Incorrect number of calculate calls.'
+        assert stats.getPhase('calculate').comparisons == 4, 'Incorrect number of field comparisons.'
+        
+        DistanceCalculatorTest.logger.debug('Test succeeded!')
+        
         
     @log_test(logger, globals.log_separator)
     def testNormalizeWeights(self):
@@ -97,6 +126,45 @@ class DistanceCalculatorTest(unittest.TestCase):
         
         DistanceCalculatorTest.logger.debug('Test succeeded!')
         
+    @log_test(logger, globals.log_separator)
+    def testPairwise(self):
+        DistanceCalculatorTest.logger.debug('Test the pairwise distance matrix calculation.')
+        
+        # Test data
+        event_data_a = [ [datetime(2013, 7, 11, 9, 51, 14), 'ubuntu NetworkManager', 887, None, 'SCPlugin-Ifupdown: init!'],
+                         [datetime(2013, 7, 11, 9, 51, 17), 'ubuntu NetworkManager', 887, 'info', 'WiFi hardware radio set enabled'],
+                         [datetime(2013, 7, 11, 9, 51, 19), 'ubuntu NetworkManager', 887, 'warn', 'DNS: plugin dnsmasq update failed'] ]
+        event_data_b = [ [datetime(2013, 8, 6, 7, 12, 37), 'ubuntu NetworkManager', 887, None, 'SCPlugin-Ifupdown: init!'],
+                         [datetime(2013, 8, 6, 7, 12, 43), 'ubuntu NetworkManager', 887, 'error', 'WiFi hardware radio set disabled'],
+                         [datetime(2013, 8, 6, 7, 12, 44), 'ubuntu NetworkManager', 887, 'error', 'DNS: plugin dnsmasq update failed'],
+                         [datetime(2013, 8, 6, 7, 12, 44), 'ubuntu colord', None, None, 'Profile added: icc-0bd9f292ce7882699e93ff844071783d'] ]
+        weights = { 'component': 3, 'component_id': 1, 'level': 2, 'sub_msg': 2, 'missing': 1}
+        
+        events_a = [self.createEvent(i, *data) for i, data in enumerate(event_data_a)]
+        events_b = [self.createEvent(i, *data) for i, data in enumerate(event_data_b)]
+        
+        table_a = EventTable(events_a, weights.keys())
+        table_b = EventTable(events_b, weights.keys(), table_a.codebook)
+        
+        # Run test
+        distances = DistanceCalculator.pairwise(events_a, events_b, weights, False, 2)
+        normal_distances = DistanceCalculator.pairwise(events_a, events_b, weights, True, 2)
+        table_distances = DistanceCalculator.pairwise(table_a, table_b, weights, False, 2)
+        
+        # Show test output
+        DistanceCalculatorTest.logger.debug('Calculated distances:\n%s' % str(distances))
+        DistanceCalculatorTest.logger.debug('Calculated normalized distances:\n%s' % str(normal_distances))
+            
+        # Verify results
+        assert distances.shape == (len(events_a), len(events_b)), 'Incorrect distance matrix shape.'
+        assert (distances == table_distances).all(), 'Incorrect event table distance calculation.'
+        for i, event_a in enumerate(events_a):
+            for j, event_b in enumerate(events_b):
+                assert distances[i][j] == DistanceCalculator.calculate(event_a, event_b, weights, False), 'Incorrect distance calculation.'
+                assert normal_distances[i][j] == DistanceCalculator.calculate(event_a, event_b, weights, True), 'Incorrect distance calculation.'
+        
+        DistanceCalculatorTest.logger.debug('Test succeeded!')
+        
     def createEvent(self, index, timestamp_data, component_data, component_id_data, level_data, sub_msg_data):
         sub_msg = Field(sub_msg_data, [], 'sub_msg')
         level = Field(level_data, [], 'level')
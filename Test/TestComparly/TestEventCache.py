@@ -0,0 +1,156 @@
+# ------------------------------------------------------
+#
+#   TestEventCache.py
+#   By: Fred Stakem
+#   Created: 10.18.26
+#
+# ------------------------------------------------------
+
+
+# Libs
+import unittest
+import os
+import shutil
+import tempfile
+from datetime import datetime
+
+# User defined
+from Globals import *
+from Utilities import *
+
+from Corely import Field
+from Corely import Event
+
+from Comparly import EventCache
+
+#Main
+class EventCacheTest(unittest.TestCase):
+    
+    # Setup logging
+    logger = Utilities.getLogger(__name__)
+    
+    @classmethod
+    def setUpClass(cls):
+        pass
+    
+    @classmethod
+    def tearDownClass(cls):
+        pass
+    
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.event_data = [ [datetime(2013, 7, 11, 9, 51, 12), 'ubuntu kernel', None, None, 'imklog 5.8.11, log source = /proc/kmsg started.'],
+                            [datetime(2013, 7, 11, 9, 51, 14), 'ubuntu NetworkManager', 887, None, 'SCPlugin-Ifupdown: init!'],
+                            [datetime(2013, 7, 11, 9, 51, 17), 'ubuntu NetworkManager', 887, 'info', 'WiFi hardware radio set enabled'] ]
+        
+    def tearDown(self):
+        shutil.rmtree(self.directory, True)
+          
+    @log_test(logger, globals.log_separator)
+    def testGetPut(self):
+        EventCacheTest.logger.debug('Test storing and loading cached events.')
+        
+        # Test data
+        events = self.createEventLog(self.event_data)
+        
+        # Run test
+        cache = EventCache(self.directory, 1024 * 1024)
+        missing = cache.get('first')
+        cache.put('first', events)
+        cached_events = cache.get('first')
+        
+        # Show test output
+        EventCacheTest.logger.debug('Cache stats: %s' % (str(cache.getStats())))
+            
+        # Verify results
+        assert missing == None, 'Found an event list that was never cached.'
+        assert len(cached_events) == len(events), 'Found the incorrect number of cached events.'
+        assert [e.index for e in cached_events] == [e.index for e in events], 'Incorrect cached events.'
+        assert cache.getStats() == {'hits': 1, 'misses': 1, 'evictions': 0}, 'Incorrect cache stats.'
+        
+        EventCacheTest.logger.debug('Test succeeded!')
+        
+    @log_test(logger, globals.log_separator)
+    def testEviction(self):
+        EventCacheTest.logger.debug('Test the least recently used eviction.')
+        
+        # Test data
+        events = self.createEventLog(self.event_data)
+        EventCache(self.directory, 1024 * 1024).put('size', events)
+        size = os.path.getsize(os.path.join(self.directory, 'size' + EventCache.EXTENSION))
+        os.remove(os.path.join(self.directory, 'size' + EventCache.EXTENSION))
+        
+        # Run test
+        cache = EventCache(self.directory, size * 2)
+        cache.put('first', events)
+        cache.put('second', events)
+        cache.get('first')
+        cache.put('third', events)
+        
+        # Show test output
+        EventCacheTest.logger.debug('Cache stats: %s' % (str(cache.getStats())))
+            
+        # Verify results
+        assert cache.get('second') == None, 'Did not evict the least recently used entry.'
+        assert cache.get('first') != None, 'Evicted a recently used entry.'
+        assert cache.get('third') != None, 'Evicted the newest entry.'
+        assert cache.getStats()['evictions'] == 1, 'Incorrect number of evictions.'
+        
+        EventCacheTest.logger.debug('Test succeeded!')
+        
+    @log_test(logger, globals.log_separator)
+    def testCorruptEntry(self):
+        EventCacheTest.logger.debug('Test reading truncated and corrupt cache entries.')
+        
+        # Test data
+        events = self.createEventLog(self.event_data)
+        cache = EventCache(self.directory, 1024 * 1024)
+        cache.put('truncated', events)
+        cache.put('corrupt', events)
+        truncated_filename = os.path.join(self.directory, 'truncated' + EventCache.EXTENSION)
+        corrupt_filename = os.path.join(self.directory, 'corrupt' + EventCache.EXTENSION)
+        with open(truncated_filename, 'rb') as f:
+            data = f.read()
+        with open(truncated_filename, 'wb') as f:
+            f.write(data[:len(data) // 2])
+        with open(corrupt_filename, 'wb') as f:
+            f.write('not a cache entry')
+        
+        # Run test
+        truncated = cache.get('truncated')
+        corrupt = cache.get('corrupt')
+        cache.put('truncated', events)
+        cached_events = cache.get('truncated')
+        
+        # Show test output
+        EventCacheTest.logger.debug('Cache stats: %s' % (str(cache.getStats())))
+            
+        # Verify results
+        assert truncated == None and corrupt == None, 'Found events in a corrupt entry.'
+        assert not os.path.exists(corrupt_filename), 'Did not remove the corrupt entry.'
+        assert [e.index for e in cached_events] == [e.index for e in events], 'Incorrect events after replacing a corrupt entry.'
+        assert cache.getStats() == {'hits': 1, 'misses': 2, 'evictions': 2}, 'Incorrect cache stats.'
+        
+        EventCacheTest.logger.debug('Test succeeded!')
+        
+    def createEventLog(self, data):
+        events = []
+        for i, ed in enumerate(data):
+            events.append( self.createEvent(i, ed[0], ed[1], ed[2], ed[3], ed[4]))
+        
+        return events
+     
+    def createEvent(self, index, timestamp_data, component_data, component_id_data, level_data, sub_msg_data):
+        sub_msg = Field(sub_msg_data, [], 'sub_msg')
+        level = Field(level_data, [], 'level')
+        msg = Field(None, [level, sub_msg], 'msg')
+        component_id = Field(component_id_data, [], 'component_id')
+        component = Field(component_data, [], 'component')
+        source = Field(None, [component, component_id], 'source')
+        timestamp = Field(timestamp_data, [], 'timestamp')
+        msg = Field(None, [timestamp, source, msg], 'event')
+        
+        event = Event(index, msg)
+        
+        return event
+    
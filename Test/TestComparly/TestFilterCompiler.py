@@ -0,0 +1,177 @@
+# ------------------------------------------------------
+#
+#   TestFilterCompiler.py
+#   By: Fred Stakem
+#   Created: 10.18.26
+#
+# ------------------------------------------------------
+
+
+# Libs
+import unittest
+import re
+from datetime import datetime
+
+# User defined
+from Globals import *
+from Utilities import *
+
+from Corely import Field
+from Corely import Event
+
+from Comparly import UnorderedDiff
+from Comparly import FilterCompiler
+from Comparly import EventIndex
+from Comparly import ValueRange
+
+#Main
+class FilterCompilerTest(unittest.TestCase):
+    
+    # Setup logging
+    logger = Utilities.getLogger(__name__)
+    
+    @classmethod
+    def setUpClass(cls):
+        pass
+    
+    @classmethod
+    def tearDownClass(cls):
+        pass
+    
+    def setUp(self):
+        self.tmp_debug_diff = globals.debug_diff
+        globals.debug_diff = True
+        
+        self.event_data_a = [ [datetime(2013, 7, 11, 9, 51, 12), 'ubuntu kernel', None, None, 'imklog 5.8.11, log source = /proc/kmsg started.'],
+                              [datetime(2013, 7, 11, 9, 51, 13), 'ubuntu kernel', None, None, '[    0.000000] Initializing cgroup subsys cpuset'],
+                              [datetime(2013, 7, 11, 9, 51, 14), 'ubuntu NetworkManager', 887, None, 'SCPlugin-Ifupdown: init!'],
+                              [datetime(2013, 7, 11, 9, 51, 15), 'ubuntu NetworkManager', 887, None, 'SCPluginIfupdown: management mode: unmanaged'],
+                              [datetime(2013, 7, 11, 9, 51, 16), 'ubuntu NetworkManager', 887, 'info', 'modem-manager is now available'],
+                              [datetime(2013, 7, 11, 9, 51, 17), 'ubuntu NetworkManager', 887, 'info', 'WiFi hardware radio set enabled'],
+                              [datetime(2013, 7, 11, 9, 51, 18), 'ubuntu NetworkManager', 887, 'info', 'WiFi hardware radio set enabled'],
+                              [datetime(2013, 7, 11, 9, 51, 19), 'ubuntu NetworkManager', 887, 'warn', 'DNS: plugin dnsmasq update failed'],
+                              [datetime(2013, 7, 11, 9, 51, 21), 'ubuntu colord', None, None, 'Profile added: icc-0bd9f292ce7882699e93ff844071783d'], ]
+        
+        self.event_data_b = [ [datetime(2013, 8, 6, 7, 12, 35), 'ubuntu kernel', None, None, 'imklog 5.8.11, log source = /proc/kmsg started.'],
+                              [datetime(2013, 8, 6, 7, 12, 36), 'ubuntu kernel', None, None, '[    0.000000] Initializing cgroup subsys cpuset'],
+                              [datetime(2013, 8, 6, 7, 12, 37), 'ubuntu NetworkManager', 887, None, 'SCPlugin-Ifupdown: init!'],
+                              [datetime(2013, 8, 6, 7, 12, 38), 'ubuntu NetworkManager', 887, None, 'SCPluginIfupdown: management mode: managed'],
+                              [datetime(2013, 8, 6, 7, 12, 39), 'ubuntu NetworkManager', 887, 'info', 'modem-manager is now available'],
+                              [datetime(2013, 8, 6, 7, 12, 41), 'ubuntu NetworkManager', 887, 'info', 'modem-manager is now available'],
+                              [datetime(2013, 8, 6, 7, 12, 42), 'ubuntu NetworkManager', 887, 'info', 'modem-manager is now available'],
+                              [datetime(2013, 8, 6, 7, 12, 43), 'ubuntu NetworkManager', 887, 'info', 'WiFi hardware radio set enabled'],
+                              [datetime(2013, 8, 6, 7, 12, 44), 'ubuntu NetworkManager', 887, 'error', 'DNS: plugin dnsmasq update failed'],
+                              [datetime(2013, 8, 6, 7, 12, 44), 'ubuntu colord', None, None, 'Profile added: icc-0bd9f292ce7882699e93ff844071783d'], ]
+        
+    def tearDown(self):
+        globals.debug_diff = self.tmp_debug_diff
+          
+    @log_test(logger, globals.log_separator)
+    def testFilter(self):
+        FilterCompilerTest.logger.debug('Test compiled filters against scanning and indexed selection.')
+        
+        # Test data
+        events = self.createEventLog(self.event_data_a) + self.createEventLog(self.event_data_b)
+        index = EventIndex(events)
+        specs = [ ({'component': None, 'level': 'info', 'sub_msg': None}, [4, 5, 6, 13, 14, 15, 16]),
+                  ({'level': set(['warn', 'error'])}, [7, 17]),
+                  ({'component': re.compile('Network'), 'sub_msg': re.compile('^SCPlugin')}, [2, 3, 11, 12]),
+                  ({'component_id': ValueRange(800, 900), 'level': None}, [2, 3, 4, 5, 6, 7, 11, 12, 13, 14, 15, 16, 17]),
+                  ({'timestamp': ValueRange(datetime(2013, 7, 11, 9, 51, 18), datetime(2013, 8, 6, 7, 12, 35)), 'level': None}, [6, 7, 8, 9]),
+                  ({'component': 'ubuntu kernel', 'level': None}, [0, 1, 9, 10]) ]
+        
+        for spec, expected in specs:
+            # Run test
+            compiled = FilterCompiler(spec)
+            selected = [events.index(event) for event in compiled.select(index)]
+            
+            # Show test output
+            FilterCompilerTest.logger.debug('Filter %s selected: %s' % (str(compiled.field_names), str(selected)))
+            
+            # Verify results
+            assert selected == expected, 'Incorrect indexed selection.'
+            assert [events.index(event) for event in compiled.filterEvents(events)] == expected, 'Incorrect compiled filter.'
+        
+        FilterCompilerTest.logger.debug('Test succeeded!')
+        
+    @log_test(logger, globals.log_separator)
+    def testFilterFields(self):
+        FilterCompilerTest.logger.debug('Test compiling the existing filter fields.')
+        
+        # Test data
+        events_a = self.createEventLog(self.event_data_a)
+        events_b = self.createEventLog(self.event_data_b)
+        filter = {'component': None, 'component_id': None, 'level': 'info', 'sub_msg':None }
+        filter_fields = self.createFilterFields(filter)
+        
+        # Run test
+        compiled = FilterCompiler(filter_fields)
+        index_a = EventIndex(events_a)
+        index_b = EventIndex(events_b)
+        matches_both, matches_a_only, matches_b_only = UnorderedDiff.indexedCompare(compiled.select(index_a), compiled.select(index_b), compiled.getFilterFields())
+        expected = UnorderedDiff.indexedCompare(events_a, events_b, filter_fields)
+        
+        # Show test output
+        FilterCompilerTest.logger.debug('Found events only in A: %d' % (len(matches_a_only))) 
+        FilterCompilerTest.logger.debug('Found events only in B: %d' % (len(matches_b_only)))  
+        FilterCompilerTest.logger.debug('Found events in A and B: %d' % (len(matches_both)))
+        
+        # Verify results
+        assert compiled.filterEvents(events_a) == UnorderedDiff.filterEvents(events_a, filter_fields), 'Incorrect compiled filter.'
+        assert compiled.select(index_b) == UnorderedDiff.filterEvents(events_b, filter_fields), 'Incorrect indexed selection.'
+        assert len(matches_both) == len(expected[0]), 'Found an incorrect number of events in both A and B.'
+        assert len(matches_a_only) == len(expected[1]), 'Found the incorrect number of events only in A.'
+        assert len(matches_b_only) == len(expected[2]), 'Found the incorrect number of events only in B.'
+        
+        FilterCompilerTest.logger.debug('Test succeeded!')
+        
+    def createEventLog(self, data):
+        events = []
+        for i, ed in enumerate(data):
+            events.append( self.createEvent(i, ed[0], ed[1], ed[2], ed[3], ed[4]))
+        
+        return events
+     
+    def createEvent(self, index, timestamp_data, component_data, component_id_data, level_data, sub_msg_data):
+        sub_msg = Field(sub_msg_data, [], 'sub_msg')
+        level = Field(level_data, [], 'level')
+        msg = Field(None, [level, sub_msg], 'msg')
+        component_id = Field(component_id_data, [], 'component_id')
+        component = Field(component_data, [], 'component')
+        source = Field(None, [component, component_id], 'source')
+        timestamp = Field(timestamp_data, [], 'timestamp')
+        msg = Field(None, [timestamp, source, msg], 'event')
+        
+        event = Event(index, msg)
+        
+        return event
+    
+    def createFilterFields(self, filter):
+        fields = []
+        for key, value in filter.iteritems():
+            fields.append( Field(value, [], key) )
+            
+        return fields
+    
+   
+ 
+
+        
+
+    
+    
+    
+    
+    
+    
+    
+  
+        
+ 
+        
+        
+        
+        
+        
+        
+     
\ No newline at end of file
@@ -0,0 +1,247 @@
+# ------------------------------------------------------
+#
+#   TestIncrementalDiff.py
+#   By: Fred Stakem
+#   Created: 10.18.26
+#
+# ------------------------------------------------------
+
+
+# Libs
+import unittest
+import os
+import tempfile
+from datetime import datetime
+
+# User defined
+from Globals import *
+from Utilities import *
+
+from Corely import Field
+from Corely import Event
+
+from Comparly import UnorderedDiff
+from Comparly import IncrementalDiff
+from Comparly import LogTailer
+
+#Main
+class IncrementalDiffTest(unittest.TestCase):
+    
+    # Setup logging
+    logger = Utilities.getLogger(__name__)
+    
+    @classmethod
+    def setUpClass(cls):
+        pass
+    
+    @classmethod
+    def tearDownClass(cls):
+        pass
+    
+    def setUp(self):
+        self.tmp_debug_diff = globals.debug_diff
+        globals.debug_diff = True
+        
+        self.event_data_a = [ [datetime(2013, 7, 11, 9, 51, 12), 'ubuntu kernel', None, None, 'imklog 5.8.11, log source = /proc/kmsg started.'],
+                              [datetime(2013, 7, 11, 9, 51, 13), 'ubuntu kernel', None, None, '[    0.000000] Initializing cgroup subsys cpuset'],
+                              [datetime(2013, 7, 11, 9, 51, 14), 'ubuntu NetworkManager', 887, None, 'SCPlugin-Ifupdown: init!'],
+                              [datetime(2013, 7, 11, 9, 51, 15), 'ubuntu NetworkManager', 887, None, 'SCPluginIfupdown: management mode: unmanaged'],
+                              [datetime(2013, 7, 11, 9, 51, 16), 'ubuntu NetworkManager', 887, 'info', 'modem-manager is now available'],
+                              [datetime(2013, 7, 11, 9, 51, 17), 'ubuntu NetworkManager', 887, 'info', 'WiFi hardware radio set enabled'],
+                              [datetime(2013, 7, 11, 9, 51, 18), 'ubuntu NetworkManager', 887, 'info', 'WiFi hardware radio set enabled'],
+                              [datetime(2013, 7, 11, 9, 51, 19), 'ubuntu NetworkManager', 887, 'warn', 'DNS: plugin dnsmasq update failed'],
+                              [datetime(2013, 7, 11, 9, 51, 21), 'ubuntu colord', None, None, 'Profile added: icc-0bd9f292ce7882699e93ff844071783d'], ]
+        
+        self.event_data_b = [ [datetime(2013, 8, 6, 7, 12, 35), 'ubuntu kernel', None, None, 'imklog 5.8.11, log source = /proc/kmsg started.'],
+                              [datetime(2013, 8, 6, 7, 12, 36), 'ubuntu kernel', None, None, '[    0.000000] Initializing cgroup subsys cpuset'],
+                              [datetime(2013, 8, 6, 7, 12, 37), 'ubuntu NetworkManager', 887, None, 'SCPlugin-Ifupdown: init!'],
+                              [datetime(2013, 8, 6, 7, 12, 38), 'ubuntu NetworkManager', 887, None, 'SCPluginIfupdown: management mode: managed'],
+                              [datetime(2013, 8, 6, 7, 12, 39), 'ubuntu NetworkManager', 887, 'info', 'modem-manager is now available'],
+                              [datetime(2013, 8, 6, 7, 12, 41), 'ubuntu NetworkManager', 887, 'info', 'modem-manager is now available'],
+                              [datetime(2013, 8, 6, 7, 12, 42), 'ubuntu NetworkManager', 887, 'info', 'modem-manager is now available'],
+                              [datetime(2013, 8, 6, 7, 12, 43), 'ubuntu NetworkManager', 887, 'info', 'WiFi hardware radio set enabled'],
+                              [datetime(2013, 8, 6, 7, 12, 44), 'ubuntu NetworkManager', 887, 'error', 'DNS: plugin dnsmasq update failed'],
+                              [datetime(2013, 8, 6, 7, 12, 44), 'ubuntu colord', None, None, 'Profile added: icc-0bd9f292ce7882699e93ff844071783d'], ]
+        
+    def tearDown(self):
+        globals.debug_diff = self.tmp_debug_diff
+          
+    @log_test(logger, globals.log_separator)
+    def testAddEvents(self):
+        IncrementalDiffTest.logger.debug('Test the incremental comparison of event logs.')
+        
+        # Test data
+        events_a = self.createEventLog(self.event_data_a)
+        events_b = self.createEventLog(self.event_data_b)
+        filter = {'component': None, 'component_id': None, 'level': None, 'sub_msg':None }
+        filter_fields = self.createFilterFields(filter)
+        changes = []
+        
+        # Run test
+        diff = IncrementalDiff(filter_fields)
+        diff.addListener(lambda key, old, new, match: changes.append( (key, old, new) ))
+        for event_b in events_b:
+            diff.addEventB(event_b)
+        counts_b = diff.getCounts()
+        for event_a in events_a:
+            diff.addEventA(event_a)
+        matches_both, matches_a_only, matches_b_only = diff.getState()
+        
+        # Show test output
+        IncrementalDiffTest.logger.debug('Found keys only in A: %d' % (len(matches_a_only))) 
+        IncrementalDiffTest.logger.debug('Found keys only in B: %d' % (len(matches_b_only)))  
+        IncrementalDiffTest.logger.debug('Found keys in A and B: %d' % (len(matches_both)))
+        IncrementalDiffTest.logger.debug('Found %d changes.' % (len(changes)))
+            
+        # Verify results
+        assert counts_b == (0, 0, 8), 'Incorrect counts after adding log B.'
+        assert diff.getCounts() == (6, 2, 2), 'Incorrect counts after adding log A.'
+        assert len(changes) == 16, 'Found the incorrect number of changes.'
+        
+        for match in matches_both:
+            assert len(match.matches_a) > 0 and len(match.matches_b) > 0, 'Incorrect match in both A and B.'
+        for match in matches_a_only:
+            assert len(match.matches_b) == 0, 'Incorrect A only match.'
+        for match in matches_b_only:
+            assert len(match.matches_a) == 0, 'Incorrect B only match.'
+        
+        IncrementalDiffTest.logger.debug('Test succeeded!')
+        
+    @log_test(logger, globals.log_separator)
+    def testTailLogs(self):
+        IncrementalDiffTest.logger.debug('Test the incremental comparison of growing log files.')
+        
+        # Test data
+        filter = {'component': None, 'component_id': None, 'level': None, 'sub_msg':None }
+        filter_fields = self.createFilterFields(filter)
+        parse = lambda index, line: self.createEvent(index, None, 'ubuntu kernel', None, None, line)
+        handle_a, filename_a = tempfile.mkstemp()
+        handle_b, filename_b = tempfile.mkstemp()
+        os.close(handle_a)
+        os.close(handle_b)
+        
+        try:
+            # Run test
+            diff = IncrementalDiff(filter_fields)
+            tailer_a = LogTailer(filename_a, parse)
+            tailer_b = LogTailer(filename_b, parse)
+            
+            self.appendData(filename_a, 'imklog started\nInitializing cgroup')
+            self.appendData(filename_b, 'imklog started\n')
+            count_first = diff.update(tailer_a, tailer_b)
+            counts_first = diff.getCounts()
+            
+            self.appendData(filename_a, ' subsys cpuset\n')
+            self.appendData(filename_b, 'Initializing cgroup subsys cpuset\nBooting paravirtualized kernel\n')
+            count_second = diff.update(tailer_a, tailer_b)
+            counts_second = diff.getCounts()
+            
+            # Show test output
+            IncrementalDiffTest.logger.debug('Read %d and then %d events.' % (count_first, count_second))
+            IncrementalDiffTest.logger.debug('Counts: %s then %s' % (str(counts_first), str(counts_second)))
+        finally:
+            tailer_a.close()
+            tailer_b.close()
+            os.remove(filename_a)
+            os.remove(filename_b)
+            
+        # Verify results
+        assert count_first == 2, 'Incorrect number of events read from the first append.'
+        assert count_second == 3, 'Incorrect number of events read from the second append.'
+        assert counts_first == (1, 0, 0), 'Incorrect counts after the first append.'
+        assert counts_second == (2, 0, 1), 'Incorrect counts after the second append.'
+        
+        IncrementalDiffTest.logger.debug('Test succeeded!')
+        
+    @log_test(logger, globals.log_separator)
+    def testTailRotatedLog(self):
+        IncrementalDiffTest.logger.debug('Test tailing a log that is rotated to a larger file.')
+        
+        # Test data
+        parse = lambda index, line: (index, line)
+        handle, filename = tempfile.mkstemp()
+        os.close(handle)
+        rotated_filename = filename + '.1'
+        
+        try:
+            # Run test
+            tailer = LogTailer(filename, parse)
+            self.appendData(filename, 'old 1\nold 2\nold')
+            events_first = tailer.poll()
+            
+            os.rename(filename, rotated_filename)
+            self.appendData(filename, 'new 1\nnew 2\nnew 3\nnew 4\nnew 5\n')
+            events_second = tailer.poll()
+            
+            self.appendData(filename, 'new 6\n')
+            events_third = tailer.poll()
+            
+            # Show test output
+            IncrementalDiffTest.logger.debug('Events: %s then %s then %s' % (str(events_first), str(events_second), str(events_third)))
+        finally:
+            tailer.close()
+            os.remove(filename)
+            os.remove(rotated_filename)
+            
+        # Verify results
+        assert events_first == [(0, 'old 1'), (1, 'old 2')], 'Incorrect events before the rotation.'
+        assert events_second[0] == (2, 'old'), 'Incorrect last line of the rotated file.'
+        assert [line for index, line in events_second[1:]] == ['new 1', 'new 2', 'new 3', 'new 4', 'new 5'], 'The new file was not read from the start.'
+        assert events_third == [(8, 'new 6')], 'Incorrect events after the rotation.'
+        
+        IncrementalDiffTest.logger.debug('Test succeeded!')
+        
+    def appendData(self, filename, data):
+        with open(filename, 'ab') as f:
+            f.write(data)
+            
+    def createEventLog(self, data):
+        events = []
+        for i, ed in enumerate(data):
+            events.append( self.createEvent(i, ed[0], ed[1], ed[2], ed[3], ed[4]))
+        
+        return events
+     
+    def createEvent(self, index, timestamp_data, component_data, component_id_data, level_data, sub_msg_data):
+        sub_msg = Field(sub_msg_data, [], 'sub_msg')
+        level = Field(level_data, [], 'level')
+        msg = Field(None, [level, sub_msg], 'msg')
+        component_id = Field(component_id_data, [], 'component_id')
+        component = Field(component_data, [], 'component')
+        source = Field(None, [component, component_id], 'source')
+        timestamp = Field(timestamp_data, [], 'timestamp')
+        msg = Field(None, [timestamp, source, msg], 'event')
+        
+        event = Event(index, msg)
+        
+        return event
+    
+    def createFilterFields(self, filter):
+        fields = []
+        for key, value in filter.iteritems():
+            fields.append( Field(value, [], key) )
+            
+        return fields
+    
+   
+ 
+
+        
+
+    
+    
+    
+    
+    
+    
+    
+  
+        
+ 
+        
+        
+        
+        
+        
+        
+     
\ No newline at end of file
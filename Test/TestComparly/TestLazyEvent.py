@@ -0,0 +1,281 @@
+# ------------------------------------------------------
+#
+#   TestLazyEvent.py
+#   By: Fred Stakem
+#   Created: 10.18.26
+#
+# ------------------------------------------------------
+
+
+# Libs
+import unittest
+import re
+import cPickle
+from datetime import datetime
+
+# User defined
+from Globals import *
+from Utilities import *
+
+from Corely import Field
+from Corely import Event
+
+from Comparly import UnorderedDiff
+from Comparly import PartitionedDiff
+from Comparly import LazyEvent
+from Comparly import LazyLoader
+
+#Main
+class LazyEventTest(unittest.TestCase):
+    
+    # Setup logging
+    logger = Utilities.getLogger(__name__)
+    
+    @classmethod
+    def setUpClass(cls):
+        pass
+    
+    @classmethod
+    def tearDownClass(cls):
+        pass
+    
+    def setUp(self):
+        self.tmp_debug_diff = globals.debug_diff
+        globals.debug_diff = True
+        
+        self.event_data_a = [ [datetime(2013, 7, 11, 9, 51, 12), 'ubuntu kernel', None, None, 'imklog 5.8.11, log source = /proc/kmsg started.'],
+                              [datetime(2013, 7, 11, 9, 51, 13), 'ubuntu kernel', None, None, '[    0.000000] Initializing cgroup subsys cpuset'],
+                              [datetime(2013, 7, 11, 9, 51, 14), 'ubuntu NetworkManager', 887, None, 'SCPlugin-Ifupdown: init!'],
+                              [datetime(2013, 7, 11, 9, 51, 15), 'ubuntu NetworkManager', 887, None, 'SCPluginIfupdown: management mode: unmanaged'],
+                              [datetime(2013, 7, 11, 9, 51, 16), 'ubuntu NetworkManager', 887, 'info', 'modem-manager is now available'],
+                              [datetime(2013, 7, 11, 9, 51, 17), 'ubuntu NetworkManager', 887, 'info', 'WiFi hardware radio set enabled'],
+                              [datetime(2013, 7, 11, 9, 51, 18), 'ubuntu NetworkManager', 887, 'info', 'WiFi hardware radio set enabled'],
+                              [datetime(2013, 7, 11, 9, 51, 19), 'ubuntu NetworkManager', 887, 'warn', 'DNS: plugin dnsmasq update failed'],
+                              [datetime(2013, 7, 11, 9, 51, 21), 'ubuntu colord', None, None, 'Profile added: icc-0bd9f292ce7882699e93ff844071783d'], ]
+        
+        self.event_data_b = [ [datetime(2013, 8, 6, 7, 12, 35), 'ubuntu kernel', None, None, 'imklog 5.8.11, log source = /proc/kmsg started.'],
+                              [datetime(2013, 8, 6, 7, 12, 36), 'ubuntu kernel', None, None, '[    0.000000] Initializing cgroup subsys cpuset'],
+                              [datetime(2013, 8, 6, 7, 12, 37), 'ubuntu NetworkManager', 887, None, 'SCPlugin-Ifupdown: init!'],
+                              [datetime(2013, 8, 6, 7, 12, 38), 'ubuntu NetworkManager', 887, None, 'SCPluginIfupdown: management mode: managed'],
+                              [datetime(2013, 8, 6, 7, 12, 39), 'ubuntu NetworkManager', 887, 'info', 'modem-manager is now available'],
+                              [datetime(2013, 8, 6, 7, 12, 41), 'ubuntu NetworkManager', 887, 'info', 'modem-manager is now available'],
+                              [datetime(2013, 8, 6, 7, 12, 42), 'ubuntu NetworkManager', 887, 'info', 'modem-manager is now available'],
+                              [datetime(2013, 8, 6, 7, 12, 43), 'ubuntu NetworkManager', 887, 'info', 'WiFi hardware radio set enabled'],
+                              [datetime(2013, 8, 6, 7, 12, 44), 'ubuntu NetworkManager', 887, 'error', 'DNS: plugin dnsmasq update failed'],
+                              [datetime(2013, 8, 6, 7, 12, 44), 'ubuntu colord', None, None, 'Profile added: icc-0bd9f292ce7882699e93ff844071783d'], ]
+        
+    def tearDown(self):
+        globals.debug_diff = self.tmp_debug_diff
+          
+    @log_test(logger, globals.log_separator)
+    def testLazyCompare(self):
+        LazyEventTest.logger.debug('Test comparing lazy events against fully built events.')
+        
+        # Test data
+        loader = LazyLoader(self.createExtractors())
+        data_a = self.createRawLog(self.event_data_a)
+        data_b = self.createRawLog(self.event_data_b)
+        filter = {'component': None, 'component_id': None, 'level': None, 'sub_msg':None }
+        filter_fields = self.createFilterFields(filter)
+        
+        # Run test
+        events_a = loader.loadData(data_a)
+        events_b = loader.loadData(data_b)
+        decoded_before = [event.field.isDecoded('component') for event in events_a]
+        matches_both, matches_a_only, matches_b_only = UnorderedDiff.indexedCompare(events_a, events_b, filter_fields)
+        expected = UnorderedDiff.indexedCompare(self.createEventLog(self.event_data_a), self.createEventLog(self.event_data_b), filter_fields)
+        
+        # Show test output
+        LazyEventTest.logger.debug('Found events only in A: %d' % (len(matches_a_only))) 
+        LazyEventTest.logger.debug('Found events only in B: %d' % (len(matches_b_only)))  
+        LazyEventTest.logger.debug('Found events in A and B: %d' % (len(matches_both)))
+        
+        # Verify results
+        assert len(events_a) == len(self.event_data_a), 'Loaded an incorrect number of lazy events.'
+        assert [event.index for event in events_b] == range(len(self.event_data_b)), 'Incorrect lazy event indices.'
+        assert [data_b[event.offset:event.offset + len(event.raw)] for event in events_b] == [event.raw for event in events_b], 'Incorrect lazy event offsets.'
+        assert not any(decoded_before), 'Decoded fields before they were used.'
+        assert all([event.field.isDecoded('sub_msg') for event in events_a + events_b]), 'Did not decode a filtered field.'
+        assert not any([event.field.isDecoded('timestamp') for event in events_a + events_b]), 'Decoded a field that was not filtered on.'
+        assert len(matches_both) == len(expected[0]), 'Found an incorrect number of events in both A and B.'
+        assert len(matches_a_only) == len(expected[1]), 'Found the incorrect number of events only in A.'
+        assert len(matches_b_only) == len(expected[2]), 'Found the incorrect number of events only in B.'
+        assert [[event.index for event in match.matches_b] for match in matches_b_only] == [[event.index for event in match.matches_b] for match in expected[2]], 'Incorrect events only in B.'
+        
+        LazyEventTest.logger.debug('Test succeeded!')
+        
+    @log_test(logger, globals.log_separator)
+    def testFallback(self):
+        LazyEventTest.logger.debug('Test falling back to the full parse for fields without an extractor.')
+        
+        # Test data
+        data = self.createRawLog(self.event_data_a).split('\n')
+        extractors = self.createExtractors()
+        parsed = []
+        def parse(raw):
+            parsed.append(raw)
+            return self.parseRawEvent(raw)
+        
+        # Run test
+        event = LazyEvent(2, 0, data[2], extractors, parse)
+        component = event.field.getField('component')
+        parsed_after_component = len(parsed)
+        timestamp = event.field.getField('timestamp')
+        event.field.getField('timestamp')
+        broken = LazyEvent(0, 0, 'not a syslog line', extractors, parse)
+        no_parse = LazyEvent(0, 0, 'not a syslog line', extractors)
+        
+        # Show test output
+        LazyEventTest.logger.debug('Lazy event %s' % (str(event)))
+        LazyEventTest.logger.debug('Parsed lines: %s' % (str(parsed)))
+        
+        # Verify results
+        assert component.value == 'ubuntu NetworkManager', 'Incorrect extracted field.'
+        assert parsed_after_component == 0, 'Parsed the line for an extracted field.'
+        assert timestamp.value == self.event_data_a[2][0], 'Incorrect field from the full parse.'
+        assert parsed == [data[2]], 'Parsed the line more than once.'
+        assert broken.field.getField('component') == None, 'Found a field in a line that did not parse.'
+        assert no_parse.field.getField('component') == None, 'Found a field without a parse to fall back to.'
+        assert event.field.containsFields(self.createFilterFields({'component': None, 'level': None})), 'Incorrect contained fields.'
+        assert not event.field.containsFields(self.createFilterFields({'component_id': 888})), 'Incorrect contained fields.'
+        
+        LazyEventTest.logger.debug('Test succeeded!')
+        
+    @log_test(logger, globals.log_separator)
+    def testBlankLines(self):
+        LazyEventTest.logger.debug('Test numbering lazy events around blank lines.')
+        
+        # Test data
+        loader = LazyLoader(self.createExtractors())
+        lines = self.createRawLog(self.event_data_a[:3]).split('\n')
+        data = '\n'.join([lines[0], '', lines[1], lines[2]]) + '\n'
+        
+        # Run test
+        events = loader.loadData(data)
+        
+        # Show test output
+        LazyEventTest.logger.debug('Lazy events: %s' % (str([str(event) for event in events])))
+        
+        # Verify results
+        assert [event.index for event in events] == [0, 1, 2], 'Incorrect lazy event indices.'
+        assert [event.raw for event in events] == lines[:3], 'Incorrect lazy event lines.'
+        assert [data[event.offset:event.offset + len(event.raw)] for event in events] == lines[:3], 'Incorrect lazy event offsets.'
+        
+        LazyEventTest.logger.debug('Test succeeded!')
+        
+    @log_test(logger, globals.log_separator)
+    def testPickle(self):
+        LazyEventTest.logger.debug('Test that lazy events are rejected by the comparisons that pickle events.')
+        
+        # Test data
+        loader = LazyLoader(self.createExtractors())
+        events_a = loader.loadData(self.createRawLog(self.event_data_a))
+        events_b = loader.loadData(self.createRawLog(self.event_data_b))
+        filter = {'component': None, 'component_id': None, 'level': None, 'sub_msg':None }
+        filter_fields = self.createFilterFields(filter)
+        
+        # Run test and verify results
+        try:
+            cPickle.dumps(events_a[0], cPickle.HIGHEST_PROTOCOL)
+            assert False, 'Pickled a lazy event.'
+        except TypeError:
+            pass
+        
+        try:
+            cPickle.dumps(events_a[0].field)
+            assert False, 'Pickled a lazy field.'
+        except TypeError:
+            pass
+        
+        try:
+            PartitionedDiff(1024 * 1024).compare(events_a, events_b, filter_fields)
+            assert False, 'Partitioned lazy events.'
+        except TypeError:
+            pass
+        
+        LazyEventTest.logger.debug('Test succeeded!')
+        
+    def createRawLog(self, data):
+        lines = []
+        for ed in data:
+            lines.append(self.createRawEvent(ed[0], ed[1], ed[2], ed[3], ed[4]))
+            
+        return '\n'.join(lines) + '\n'
+    
+    def createRawEvent(self, timestamp_data, component_data, component_id_data, level_data, sub_msg_data):
+        component_id = '' if component_id_data == None else '[%d]' % (component_id_data)
+        level = '' if level_data == None else '<%s> ' % (level_data)
+        
+        return '%s %s%s: %s%s' % (timestamp_data.strftime('%Y-%m-%d %H:%M:%S'), component_data, component_id, level, sub_msg_data)
+    
+    def parseRawEvent(self, raw):
+        match = self.createPattern().match(raw)
+        if match == None:
+            return None
+        
+        timestamp = datetime.strptime(match.group('timestamp'), '%Y-%m-%d %H:%M:%S')
+        component_id = match.group('component_id')
+        component_id = None if component_id == None else int(component_id)
+        
+        return self.createEvent(0, timestamp, match.group('component'), component_id, match.group('level'), match.group('sub_msg')).field
+    
+    def createExtractors(self):
+        # Everything but the timestamp, which only the full parse decodes
+        extractors = LazyLoader.createRegexExtractors(self.createPattern(), {'component_id': int})
+        del extractors['timestamp']
+        
+        return extractors
+    
+    def createPattern(self):
+        return re.compile(r'^(?P<timestamp>\S+ \S+) (?P<component>[^\[:]+)(?:\[(?P<component_id>\d+)\])?: (?:<(?P<level>\w+)> )?(?P<sub_msg>.*)$')
+        
+    def createEventLog(self, data):
+        events = []
+        for i, ed in enumerate(data):
+            events.append( self.createEvent(i, ed[0], ed[1], ed[2], ed[3], ed[4]))
+        
+        return events
+     
+    def createEvent(self, index, timestamp_data, component_data, component_id_data, level_data, sub_msg_data):
+        sub_msg = Field(sub_msg_data, [], 'sub_msg')
+        level = Field(level_data, [], 'level')
+        msg = Field(None, [level, sub_msg], 'msg')
+        component_id = Field(component_id_data, [], 'component_id')
+        component = Field(component_data, [], 'component')
+        source = Field(None, [component, component_id], 'source')
+        timestamp = Field(timestamp_data, [], 'timestamp')
+        msg = Field(None, [timestamp, source, msg], 'event')
+        
+        event = Event(index, msg)
+        
+        return event
+    
+    def createFilterFields(self, filter):
+        fields = []
+        for key, value in filter.iteritems():
+            fields.append( Field(value, [], key) )
+            
+        return fields
+    
+   
+ 
+
+        
+
+    
+    
+    
+    
+    
+    
+    
+  
+        
+ 
+        
+        
+        
+        
+        
+        
+     
\ No newline at end of file
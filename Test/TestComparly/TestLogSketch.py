@@ -0,0 +1,178 @@
+# ------------------------------------------------------
+#
+#   TestLogSketch.py
+#   By: Fred Stakem
+#   Created: 10.18.26
+#
+# ------------------------------------------------------
+
+
+# Libs
+import unittest
+from datetime import datetime
+
+# User defined
+from Globals import *
+from Utilities import *
+
+from Corely import Field
+from Corely import Event
+
+from Comparly import LogSketch
+
+#Main
+class LogSketchTest(unittest.TestCase):
+    
+    # Setup logging
+    logger = Utilities.getLogger(__name__)
+    
+    @classmethod
+    def setUpClass(cls):
+        pass
+    
+    @classmethod
+    def tearDownClass(cls):
+        pass
+    
+    def setUp(self):
+        self.tmp_debug_diff = globals.debug_diff
+        globals.debug_diff = True
+        
+        self.event_data_a = [ [datetime(2013, 7, 11, 9, 51, 12), 'ubuntu kernel', None, None, 'imklog 5.8.11, log source = /proc/kmsg started.'],
+                              [datetime(2013, 7, 11, 9, 51, 13), 'ubuntu kernel', None, None, '[    0.000000] Initializing cgroup subsys cpuset'],
+                              [datetime(2013, 7, 11, 9, 51, 14), 'ubuntu NetworkManager', 887, None, 'SCPlugin-Ifupdown: init!'],
+                              [datetime(2013, 7, 11, 9, 51, 15), 'ubuntu NetworkManager', 887, None, 'SCPluginIfupdown: management mode: unmanaged'],
+                              [datetime(2013, 7, 11, 9, 51, 16), 'ubuntu NetworkManager', 887, 'info', 'modem-manager is now available'],
+                              [datetime(2013, 7, 11, 9, 51, 17), 'ubuntu NetworkManager', 887, 'info', 'WiFi hardware radio set enabled'],
+                              [datetime(2013, 7, 11, 9, 51, 18), 'ubuntu NetworkManager', 887, 'info', 'WiFi hardware radio set enabled'],
+                              [datetime(2013, 7, 11, 9, 51, 19), 'ubuntu NetworkManager', 887, 'warn', 'DNS: plugin dnsmasq update failed'],
+                              [datetime(2013, 7, 11, 9, 51, 21), 'ubuntu colord', None, None, 'Profile added: icc-0bd9f292ce7882699e93ff844071783d'], ]
+        
+        self.event_data_b = [ [datetime(2013, 8, 6, 7, 12, 35), 'ubuntu kernel', None, None, 'imklog 5.8.11, log source = /proc/kmsg started.'],
+                              [datetime(2013, 8, 6, 7, 12, 36), 'ubuntu kernel', None, None, '[    0.000000] Initializing cgroup subsys cpuset'],
+                              [datetime(2013, 8, 6, 7, 12, 37), 'ubuntu NetworkManager', 887, None, 'SCPlugin-Ifupdown: init!'],
+                              [datetime(2013, 8, 6, 7, 12, 38), 'ubuntu NetworkManager', 887, None, 'SCPluginIfupdown: management mode: managed'],
+                              [datetime(2013, 8, 6, 7, 12, 39), 'ubuntu NetworkManager', 887, 'info', 'modem-manager is now available'],
+                              [datetime(2013, 8, 6, 7, 12, 41), 'ubuntu NetworkManager', 887, 'info', 'modem-manager is now available'],
+                              [datetime(2013, 8, 6, 7, 12, 42), 'ubuntu NetworkManager', 887, 'info', 'modem-manager is now available'],
+                              [datetime(2013, 8, 6, 7, 12, 43), 'ubuntu NetworkManager', 887, 'info', 'WiFi hardware radio set enabled'],
+                              [datetime(2013, 8, 6, 7, 12, 44), 'ubuntu NetworkManager', 887, 'error', 'DNS: plugin dnsmasq update failed'],
+                              [datetime(2013, 8, 6, 7, 12, 44), 'ubuntu colord', None, None, 'Profile added: icc-0bd9f292ce7882699e93ff844071783d'], ]
+        
+    def tearDown(self):
+        globals.debug_diff = self.tmp_debug_diff
+          
+    @log_test(logger, globals.log_separator)
+    def testBuild(self):
+        LogSketchTest.logger.debug('Test building sketches of event logs and estimating their difference.')
+        
+        # Test data
+        events_a = self.createEventLog(self.event_data_a)
+        events_b = self.createEventLog(self.event_data_b)
+        filter = {'component': None, 'component_id': None, 'level': None, 'sub_msg':None }
+        filter_fields = self.createFilterFields(filter)
+        
+        # Run test
+        sketch_a = LogSketch.build(iter(events_a), filter_fields)
+        sketch_b = LogSketch.build(iter(events_b), filter_fields)
+        sketch_copy = LogSketch.build(events_a, filter_fields)
+        both, a_only, b_only = sketch_a.estimateDiff(sketch_b)
+        ranked = LogSketch.rank([('same', sketch_a, sketch_copy), ('changed', sketch_a, sketch_b)])
+        
+        # Show test output
+        LogSketchTest.logger.debug('Sketch A: %s' % (str(sketch_a)))
+        LogSketchTest.logger.debug('Sketch B: %s' % (str(sketch_b)))
+        LogSketchTest.logger.debug('Estimated Jaccard similarity: %f' % (sketch_a.jaccard(sketch_b)))
+        LogSketchTest.logger.debug('Estimated keys in both: %f A only: %f B only: %f' % (both, a_only, b_only))
+        
+        # Verify results
+        assert sketch_a.count == 9 and sketch_b.count == 10, 'Incorrect number of sketched events.'
+        assert round(sketch_a.cardinality()) == 8, 'Incorrect estimate of the keys in A.'
+        assert round(sketch_b.cardinality()) == 8, 'Incorrect estimate of the keys in B.'
+        assert sketch_a.jaccard(sketch_copy) == 1.0, 'Identical logs are not similar.'
+        assert abs(sketch_a.jaccard(sketch_b) - 0.6) < 0.25, 'Incorrect estimate of the Jaccard similarity.'
+        assert abs(both + a_only - 8) < 0.5 and abs(both + b_only - 8) < 0.5, 'Incorrect estimate of the key difference.'
+        assert [name for name, similarity in ranked] == ['changed', 'same'], 'Incorrect ranking of the log pairs.'
+        
+        LogSketchTest.logger.debug('Test succeeded!')
+        
+    @log_test(logger, globals.log_separator)
+    def testSerialize(self):
+        LogSketchTest.logger.debug('Test the serialization of sketches.')
+        
+        # Test data
+        events_a = self.createEventLog(self.event_data_a)
+        filter = {'component': None, 'component_id': None, 'level': None, 'sub_msg':None }
+        filter_fields = self.createFilterFields(filter)
+        sketch_a = LogSketch.build(events_a, filter_fields)
+        
+        # Run test
+        data = sketch_a.to_bytes()
+        sketch_copy = LogSketch.from_bytes(data)
+        
+        # Show test output
+        LogSketchTest.logger.debug('Serialized the sketch into %d bytes.' % (len(data)))
+        
+        # Verify results
+        assert sketch_copy.count == sketch_a.count, 'Incorrect event count after serialization.'
+        assert sketch_copy.cardinality() == sketch_a.cardinality(), 'Incorrect registers after serialization.'
+        assert sketch_copy.jaccard(sketch_a) == 1.0, 'Incorrect MinHash signature after serialization.'
+        
+        try:
+            sketch_a.jaccard(LogSketch(64))
+            assert False, 'Compared sketches with different parameters.'
+        except ValueError:
+            pass
+        
+        LogSketchTest.logger.debug('Test succeeded!')
+        
+    def createEventLog(self, data):
+        events = []
+        for i, ed in enumerate(data):
+            events.append( self.createEvent(i, ed[0], ed[1], ed[2], ed[3], ed[4]))
+        
+        return events
+     
+    def createEvent(self, index, timestamp_data, component_data, component_id_data, level_data, sub_msg_data):
+        sub_msg = Field(sub_msg_data, [], 'sub_msg')
+        level = Field(level_data, [], 'level')
+        msg = Field(None, [level, sub_msg], 'msg')
+        component_id = Field(component_id_data, [], 'component_id')
+        component = Field(component_data, [], 'component')
+        source = Field(None, [component, component_id], 'source')
+        timestamp = Field(timestamp_data, [], 'timestamp')
+        msg = Field(None, [timestamp, source, msg], 'event')
+        
+        event = Event(index, msg)
+        
+        return event
+    
+    def createFilterFields(self, filter):
+        fields = []
+        for key, value in filter.iteritems():
+            fields.append( Field(value, [], key) )
+            
+        return fields
+    
+   
+ 
+
+        
+
+    
+    
+    
+    
+    
+    
+    
+  
+        
+ 
+        
+        
+        
+        
+        
+        
+     
\ No newline at end of file
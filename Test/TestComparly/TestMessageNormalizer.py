@@ -0,0 +1,182 @@
+# ------------------------------------------------------
+#
+#   TestMessageNormalizer.py
+#   By: Fred Stakem
+#   Created: 10.18.26
+#
+# ------------------------------------------------------
+
+
+# Libs
+import unittest
+from datetime import datetime
+
+# User defined
+from Globals import *
+from Utilities import *
+
+from Corely import Field
+from Corely import Event
+
+from Comparly import MessageNormalizer
+from Comparly import UnorderedDiff
+from Comparly import EventTable
+
+#Main
+class MessageNormalizerTest(unittest.TestCase):
+    
+    # Setup logging
+    logger = Utilities.getLogger(__name__)
+    
+    @classmethod
+    def setUpClass(cls):
+        pass
+    
+    @classmethod
+    def tearDownClass(cls):
+        pass
+    
+    def setUp(self):
+        self.tmp_debug_diff = globals.debug_diff
+        globals.debug_diff = True
+        
+        self.event_data_a = [ [datetime(2013, 7, 11, 9, 51, 12), 'ubuntu kernel', None, None, '[    0.000000] Initializing cgroup subsys cpuset'],
+                              [datetime(2013, 7, 11, 9, 51, 13), 'ubuntu kernel', None, None, '[    1.204511] eth0: link up, address 00:0c:29:3e:5b:7a'],
+                              [datetime(2013, 7, 11, 9, 51, 14), 'ubuntu NetworkManager', 887, 'info', 'DHCPACK of 192.168.1.12 from 192.168.1.1:67'],
+                              [datetime(2013, 7, 11, 9, 51, 15), 'ubuntu NetworkManager', 887, 'info', 'Child process pid=4121 exited'],
+                              [datetime(2013, 7, 11, 9, 51, 16), 'ubuntu colord', None, None, 'Profile added: icc-0bd9f292ce7882699e93ff844071783d'],
+                              [datetime(2013, 7, 11, 9, 51, 19), 'ubuntu NetworkManager', 887, 'warn', 'DNS: plugin dnsmasq update failed'], ]
+        
+        self.event_data_b = [ [datetime(2013, 8, 6, 7, 12, 35), 'ubuntu kernel', None, None, '[    0.000000] Initializing cgroup subsys cpuset'],
+                              [datetime(2013, 8, 6, 7, 12, 36), 'ubuntu kernel', None, None, '[    1.388270] eth0: link up, address 00:0c:29:9a:01:c4'],
+                              [datetime(2013, 8, 6, 7, 12, 37), 'ubuntu NetworkManager', 887, 'info', 'DHCPACK of 192.168.1.40 from 192.168.1.1:67'],
+                              [datetime(2013, 8, 6, 7, 12, 38), 'ubuntu NetworkManager', 887, 'info', 'Child process pid=5230 exited'],
+                              [datetime(2013, 8, 6, 7, 12, 39), 'ubuntu NetworkManager', 887, 'info', 'Child process pid=5231 exited'],
+                              [datetime(2013, 8, 6, 7, 12, 41), 'ubuntu colord', None, None, 'Profile added: icc-7a1c2e0f9b3d4a5e6f708192a3b4c5d6'],
+                              [datetime(2013, 8, 6, 7, 12, 44), 'ubuntu NetworkManager', 887, 'error', 'DNS: plugin dnsmasq update failed'], ]
+        
+    def tearDown(self):
+        globals.debug_diff = self.tmp_debug_diff
+          
+    @log_test(logger, globals.log_separator)
+    def testNormalize(self):
+        MessageNormalizerTest.logger.debug('Test masking the variable tokens of messages.')
+        
+        # Test data
+        messages = [ ('Profile added: icc-0bd9f292ce7882699e93ff844071783d', 'Profile added: icc-<HEX>'),
+                     ('[    0.000000] Initializing cgroup subsys cpuset', '[    <NUM>] Initializing cgroup subsys cpuset'),
+                     ('DHCPACK of 192.168.1.12 from 192.168.1.1:67', 'DHCPACK of <IP> from <IP>'),
+                     ('Child process pid=4121 exited at 09:51:12', 'Child process pid=<PID> exited at <TIME>'),
+                     ('eth0: link up, address 00:0c:29:3e:5b:7a', 'eth0: link up, address <MAC>'),
+                     ('link 00:11:22:33:44:55 up at 09:51:12', 'link <MAC> up at <TIME>'),
+                     ('Profile added: icc-0bd9f292ce7882699e93ff844071783d', 'Profile added: icc-<HEX>') ]
+        normalizer = MessageNormalizer(max_size=4)
+        
+        # Run test
+        templates = [normalizer.normalize(message) for message, expected in messages]
+        
+        # Show test output
+        for template in templates:
+            MessageNormalizerTest.logger.debug('Template: %s' % (template))
+        MessageNormalizerTest.logger.debug('Cache stats: %s' % (str(normalizer.getStats())))
+            
+        # Verify results
+        for template, (message, expected) in zip(templates, messages):
+            assert template == expected, 'Incorrect template for the message: %s' % (message)
+        
+        stats = normalizer.getStats()
+        assert stats['misses'] == 7 and stats['size'] == 4, 'The cache is not bounded.'
+        assert normalizer.normalize(None) == None, 'Incorrect template for a missing value.'
+        assert normalizer.normalizeKey(('ubuntu kernel', 'pid 7'), ['component', 'sub_msg']) == ('ubuntu kernel', 'pid <PID>'), 'Incorrect normalized key.'
+        
+        MessageNormalizerTest.logger.debug('Test succeeded!')
+        
+    @log_test(logger, globals.log_separator)
+    def testCompare(self):
+        MessageNormalizerTest.logger.debug('Test the comparison of event logs on message templates.')
+        
+        # Test data
+        events_a = self.createEventLog(self.event_data_a)
+        events_b = self.createEventLog(self.event_data_b)
+        filter = {'component': None, 'component_id': None, 'level': None, 'sub_msg':None }
+        filter_fields = self.createFilterFields(filter)
+        normalizer = MessageNormalizer()
+        
+        # Run test
+        matches_both, matches_a_only, matches_b_only = UnorderedDiff.indexedCompare(events_a, events_b, filter_fields, normalizer)
+        raw_both, raw_a_only, raw_b_only = UnorderedDiff.indexedCompare(events_a, events_b, filter_fields)
+        
+        # Show test output
+        MessageNormalizerTest.logger.debug('Found events only in A: %d' % (len(matches_a_only))) 
+        MessageNormalizerTest.logger.debug('Found events only in B: %d' % (len(matches_b_only)))  
+        MessageNormalizerTest.logger.debug('Found events in A and B: %d' % (len(matches_both)))
+        MessageNormalizerTest.logger.debug('Cache stats: %s' % (str(normalizer.getStats())))
+        
+        # Verify results
+        assert len(raw_both) == 1 and len(raw_a_only) == 5 and len(raw_b_only) == 6, 'Incorrect comparison of the raw messages.'
+        assert len(matches_both) == 5, 'Found an incorrect number of events in both A and B.'
+        assert len(matches_a_only) == 1, 'Found the incorrect number of events only in A.'
+        assert len(matches_b_only) == 1, 'Found the incorrect number of events only in B.'
+        assert [len(m.matches_b) for m in matches_both] == [1, 1, 1, 2, 1], 'Incorrect events matched on the templates.'
+        assert normalizer.getStats()['hits'] > 0, 'The normalizer cache was not used.'
+        
+        table_a = EventTable(events_a, filter.keys())
+        table_b = EventTable(events_b, filter.keys(), table_a.codebook)
+        try:
+            UnorderedDiff.indexedCompare(table_a, table_b, filter_fields, normalizer)
+            assert False, 'Normalized the encoded keys of event tables.'
+        except ValueError:
+            pass
+        
+        MessageNormalizerTest.logger.debug('Test succeeded!')
+        
+    def createEventLog(self, data):
+        events = []
+        for i, ed in enumerate(data):
+            events.append( self.createEvent(i, ed[0], ed[1], ed[2], ed[3], ed[4]))
+        
+        return events
+     
+    def createEvent(self, index, timestamp_data, component_data, component_id_data, level_data, sub_msg_data):
+        sub_msg = Field(sub_msg_data, [], 'sub_msg')
+        level = Field(level_data, [], 'level')
+        msg = Field(None, [level, sub_msg], 'msg')
+        component_id = Field(component_id_data, [], 'component_id')
+        component = Field(component_data, [], 'component')
+        source = Field(None, [component, component_id], 'source')
+        timestamp = Field(timestamp_data, [], 'timestamp')
+        msg = Field(None, [timestamp, source, msg], 'event')
+        
+        event = Event(index, msg)
+        
+        return event
+    
+    def createFilterFields(self, filter):
+        fields = []
+        for key, value in filter.iteritems():
+            fields.append( Field(value, [], key) )
+            
+        return fields
+    
+   
+ 
+
+        
+
+    
+    
+    
+    
+    
+    
+    
+  
+        
+ 
+        
+        
+        
+        
+        
+        
+     
\ No newline at end of file
@@ -0,0 +1,117 @@
+# ------------------------------------------------------
+#
+#   TestNearestMatcher.py
+#   By: Fred Stakem
+#   Created: 10.18.26
+#
+# ------------------------------------------------------
+
+
+# Libs
+import unittest
+from datetime import datetime
+
+# User defined
+from Globals import *
+from Utilities import *
+
+from Corely import Field
+from Corely import Event
+
+from Comparly import DistanceCalculator
+from Comparly import NearestMatcher
+
+#Main
+class NearestMatcherTest(unittest.TestCase):
+    
+    # Setup logging
+    logger = Utilities.getLogger(__name__)
+    
+    @classmethod
+    def setUpClass(cls):
+        pass
+    
+    @classmethod
+    def tearDownClass(cls):
+        pass
+    
+    def setUp(self):
+        self.event_data_a = [ [datetime(2013, 7, 11, 9, 51, 15), 'ubuntu NetworkManager', 887, None, 'SCPluginIfupdown: management mode: unmanaged'],
+                              [datetime(2013, 7, 11, 9, 51, 19), 'ubuntu NetworkManager', 887, 'warn', 'DNS: plugin dnsmasq update failed'],
+                              [datetime(2013, 7, 11, 9, 51, 20), 'ubuntu kernel', None, None, '[    0.000000] Initializing cgroup subsys cpu'],
+                              [datetime(2013, 7, 11, 9, 51, 21), 'ubuntu colord', None, None, 'Profile added: icc-0bd9f292ce7882699e93ff844071783d'] ]
+        
+        self.event_data_b = [ [datetime(2013, 8, 6, 7, 12, 38), 'ubuntu NetworkManager', 887, None, 'SCPluginIfupdown: management mode: managed'],
+                              [datetime(2013, 8, 6, 7, 12, 44), 'ubuntu NetworkManager', 887, 'error', 'DNS: plugin dnsmasq update failed'],
+                              [datetime(2013, 8, 6, 7, 12, 45), 'ubuntu NetworkManager', 912, 'warn', 'DNS: plugin dnsmasq update failed'],
+                              [datetime(2013, 8, 6, 7, 12, 46), 'ubuntu kernel', None, None, '[    0.000000] Initializing cgroup subsys cpuset'],
+                              [datetime(2013, 8, 6, 7, 12, 47), 'ubuntu kernel', None, 'info', '[    0.000000] Initializing cgroup subsys cpuset'] ]
+        
+        self.weights = { 'component': 3, 'component_id': 1, 'level': 2, 'sub_msg': 2}
+        
+    def tearDown(self):
+        pass
+          
+    @log_test(logger, globals.log_separator)
+    def testMatch(self):
+        NearestMatcherTest.logger.debug('Test the nearest neighbour matching against a brute force search.')
+        
+        # Test data
+        events_a = [self.createEvent(i, *data) for i, data in enumerate(self.event_data_a)]
+        events_b = [self.createEvent(i, *data) for i, data in enumerate(self.event_data_b)]
+        
+        for max_distance in [0, 1, 2, 3, 5, 8]:
+            for k in [1, 2]:
+                # Run test
+                matcher = NearestMatcher(self.weights, False, max_distance, k)
+                matches = matcher.match(events_a, events_b)
+                
+                # Show test output
+                NearestMatcherTest.logger.debug('Using a maximum distance of %d and k of %d.' % (max_distance, k))
+                for event_a, nearest in matches:
+                    NearestMatcherTest.logger.debug('Event %d: %s' % (event_a.index, [(e.index, d) for e, d in nearest]))
+                    
+                # Verify results
+                assert len(matches) == len(events_a), 'Incorrect number of matched events.'
+                for event_a, nearest in matches:
+                    expected = self.bruteForce(event_a, events_b, max_distance, k)
+                    assert [(e.index, d) for e, d in nearest] == expected, 'Incorrect nearest neighbours.'
+        
+        NearestMatcherTest.logger.debug('Test succeeded!')
+        
+    def bruteForce(self, event_a, events_b, max_distance, k):
+        distances = []
+        for event_b in events_b:
+            distance = DistanceCalculator.calculate(event_a, event_b, self.weights, False)
+            if distance <= max_distance:
+                distances.append( (distance, event_b.index) )
+                
+        return [(index, distance) for distance, index in sorted(distances)[:k]]
+        
+    def createEvent(self, index, timestamp_data, component_data, component_id_data, level_data, sub_msg_data):
+        sub_msg = Field(sub_msg_data, [], 'sub_msg')
+        level = Field(level_data, [], 'level')
+        msg = Field(None, [level, sub_msg], 'msg')
+        component_id = Field(component_id_data, [], 'component_id')
+        component = Field(component_data, [], 'component')
+        source = Field(None, [component, component_id], 'source')
+        timestamp = Field(timestamp_data, [], 'timestamp')
+        msg = Field(None, [timestamp, source, msg], 'event')
+        
+        event = Event(index, msg)
+        
+        return event
+    
+    def createFilterFields(self, filter):
+        fields = []
+        for key, value in filter.iteritems():
+            fields.append( Field(value, [], key) )
+            
+        return fields
+        
+        
+        
+        
+        
+            
+      
\ No newline at end of file
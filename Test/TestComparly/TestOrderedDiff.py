@@ -0,0 +1,210 @@
+# ------------------------------------------------------
+#
+#   TestOrderedDiff.py
+#   By: Fred Stakem
+#   Created: 10.18.26
+#
+# ------------------------------------------------------
+
+
+# Libs
+import unittest
+from datetime import datetime
+
+# User defined
+from Globals import *
+from Utilities import *
+
+from Corely import Field
+from Corely import Event
+
+from Comparly import OrderedDiff
+
+#Main
+class OrderedDiffTest(unittest.TestCase):
+    
+    # Setup logging
+    logger = Utilities.getLogger(__name__)
+    
+    @classmethod
+    def setUpClass(cls):
+        pass
+    
+    @classmethod
+    def tearDownClass(cls):
+        pass
+    
+    def setUp(self):
+        self.tmp_debug_diff = globals.debug_diff
+        globals.debug_diff = True
+        
+        self.event_data_a = [ [datetime(2013, 7, 11, 9, 51, 12), 'ubuntu kernel', None, None, 'imklog 5.8.11, log source = /proc/kmsg started.'],
+                              [datetime(2013, 7, 11, 9, 51, 13), 'ubuntu kernel', None, None, '[    0.000000] Initializing cgroup subsys cpuset'],
+                              [datetime(2013, 7, 11, 9, 51, 14), 'ubuntu NetworkManager', 887, None, 'SCPlugin-Ifupdown: init!'],
+                              [datetime(2013, 7, 11, 9, 51, 15), 'ubuntu NetworkManager', 887, None, 'SCPluginIfupdown: management mode: unmanaged'],
+                              [datetime(2013, 7, 11, 9, 51, 16), 'ubuntu NetworkManager', 887, 'info', 'modem-manager is now available'],
+                              [datetime(2013, 7, 11, 9, 51, 17), 'ubuntu NetworkManager', 887, 'info', 'WiFi hardware radio set enabled'],
+                              [datetime(2013, 7, 11, 9, 51, 19), 'ubuntu NetworkManager', 887, 'warn', 'DNS: plugin dnsmasq update failed'],
+                              [datetime(2013, 7, 11, 9, 51, 21), 'ubuntu colord', None, None, 'Profile added: icc-0bd9f292ce7882699e93ff844071783d'], ]
+        
+        self.event_data_b = [ [datetime(2013, 8, 6, 7, 12, 35), 'ubuntu kernel', None, None, 'imklog 5.8.11, log source = /proc/kmsg started.'],
+                              [datetime(2013, 8, 6, 7, 12, 36), 'ubuntu kernel', None, None, '[    0.000000] Initializing cgroup subsys cpuset'],
+                              [datetime(2013, 8, 6, 7, 12, 37), 'ubuntu colord', None, None, 'Profile added: icc-0bd9f292ce7882699e93ff844071783d'],
+                              [datetime(2013, 8, 6, 7, 12, 38), 'ubuntu NetworkManager', 887, None, 'SCPlugin-Ifupdown: init!'],
+                              [datetime(2013, 8, 6, 7, 12, 39), 'ubuntu NetworkManager', 887, None, 'SCPluginIfupdown: management mode: managed'],
+                              [datetime(2013, 8, 6, 7, 12, 41), 'ubuntu NetworkManager', 887, 'info', 'modem-manager is now available'],
+                              [datetime(2013, 8, 6, 7, 12, 42), 'ubuntu NetworkManager', 887, 'info', 'modem-manager is now available'],
+                              [datetime(2013, 8, 6, 7, 12, 43), 'ubuntu NetworkManager', 887, 'info', 'WiFi hardware radio set enabled'],
+                              [datetime(2013, 8, 6, 7, 12, 44), 'ubuntu NetworkManager', 887, 'warn', 'DNS: plugin dnsmasq update failed'], ]
+        
+    def tearDown(self):
+        globals.debug_diff = self.tmp_debug_diff
+          
+    @log_test(logger, globals.log_separator)
+    def testCompare(self):
+        OrderedDiffTest.logger.debug('Test the ordered comparison of event logs.')
+        
+        # Test data
+        events_a = self.createEventLog(self.event_data_a)
+        events_b = self.createEventLog(self.event_data_b)
+        filter = {'component': None, 'component_id': None, 'level': None, 'sub_msg':None }
+        filter_fields = self.createFilterFields(filter)
+        
+        # Run test
+        hunks = OrderedDiff.compare(events_a, events_b, filter_fields)
+        hunks_no_moves = OrderedDiff.compare(events_a, events_b, filter_fields, False)
+        
+        # Show test output
+        for tag, match in hunks:
+            OrderedDiffTest.logger.debug('%s: %s' % (tag, str(self.getMatchIndices(match))))
+        
+        # Verify results
+        expected = [ (OrderedDiff.EQUAL, [0], [0]),
+                     (OrderedDiff.EQUAL, [1], [1]),
+                     (OrderedDiff.INSERT, [], [2]),
+                     (OrderedDiff.EQUAL, [2], [3]),
+                     (OrderedDiff.INSERT, [], [4]),
+                     (OrderedDiff.INSERT, [], [5]),
+                     (OrderedDiff.DELETE, [3], []),
+                     (OrderedDiff.EQUAL, [4], [6]),
+                     (OrderedDiff.EQUAL, [5], [7]),
+                     (OrderedDiff.EQUAL, [6], [8]),
+                     (OrderedDiff.DELETE, [7], []) ]
+        result = [(tag,) + self.getMatchIndices(match) for tag, match in hunks_no_moves]
+        assert result == expected, 'Incorrect hunks without move detection.'
+        
+        result = [(tag,) + self.getMatchIndices(match) for tag, match in hunks]
+        assert (OrderedDiff.MOVE, [7], [2]) in result, 'The moved event was not detected.'
+        assert (OrderedDiff.INSERT, [], [2]) not in result, 'The moved event is also an insert.'
+        assert len(result) == len(expected) - 1, 'Incorrect number of hunks with move detection.'
+        
+        OrderedDiffTest.logger.debug('Test succeeded!')
+        
+    @log_test(logger, globals.log_separator)
+    def testGetOpcodes(self):
+        OrderedDiffTest.logger.debug('Test the edit script of integer sequences.')
+        
+        # Test data
+        a = [1, 2, 3, 4, 5, 6, 7, 8]
+        b = [1, 2, 9, 4, 5, 7, 8, 6]
+        
+        # Run test
+        opcodes = OrderedDiff.getOpcodes(a, b)
+        
+        # Show test output
+        for opcode in opcodes:
+            OrderedDiffTest.logger.debug('Opcode: %s' % (str(opcode)))
+        
+        # Verify results
+        equal = sum([a_hi - a_lo for tag, a_lo, a_hi, b_lo, b_hi in opcodes if tag == OrderedDiff.EQUAL])
+        assert equal == 6, 'The edit script is not minimal.'
+        assert opcodes[0] == (OrderedDiff.EQUAL, 0, 2, 0, 2), 'Incorrect common prefix.'
+        assert OrderedDiff.getOpcodes(a, a) == [(OrderedDiff.EQUAL, 0, 8, 0, 8)], 'Incorrect script for identical sequences.'
+        assert OrderedDiff.getOpcodes([], b) == [(OrderedDiff.INSERT, 0, 0, 0, 8)], 'Incorrect script for an empty sequence.'
+        
+        OrderedDiffTest.logger.debug('Test succeeded!')
+        
+    @log_test(logger, globals.log_separator)
+    def testGetOpcodesAnchors(self):
+        OrderedDiffTest.logger.debug('Test the edit script of very different integer sequences.')
+        
+        # Test data
+        common = range(2000, 2100)
+        a = [i * 7919 % 1009 for i in xrange(3000)]
+        b = [i * 6007 % 1013 for i in xrange(3000)]
+        a = a[:1500] + common + a[1500:]
+        b = b[:1000] + common + b[1000:]
+        
+        # Run test
+        opcodes = OrderedDiff.getOpcodes(a, b)
+        
+        # Show test output
+        OrderedDiffTest.logger.debug('Found %d opcodes.' % (len(opcodes)))
+        
+        # Verify results
+        a_end = 0
+        b_end = 0
+        for tag, a_lo, a_hi, b_lo, b_hi in opcodes:
+            assert a_lo == a_end and b_lo == b_end, 'The edit script has a gap.'
+            if tag == OrderedDiff.EQUAL:
+                assert a[a_lo:a_hi] == b[b_lo:b_hi], 'Unequal events in an equal opcode.'
+            a_end = a_hi
+            b_end = b_hi
+        assert a_end == len(a) and b_end == len(b), 'The edit script does not cover both sequences.'
+        assert (OrderedDiff.EQUAL, 1500, 1600, 1000, 1100) in opcodes, 'The common run was not found.'
+        
+        OrderedDiffTest.logger.debug('Test succeeded!')
+        
+    def getMatchIndices(self, match):
+        return ([event.index for event in match.matches_a], [event.index for event in match.matches_b])
+    
+    def createEventLog(self, data):
+        events = []
+        for i, ed in enumerate(data):
+            events.append( self.createEvent(i, ed[0], ed[1], ed[2], ed[3], ed[4]))
+        
+        return events
+     
+    def createEvent(self, index, timestamp_data, component_data, component_id_data, level_data, sub_msg_data):
+        sub_msg = Field(sub_msg_data, [], 'sub_msg')
+        level = Field(level_data, [], 'level')
+        msg = Field(None, [level, sub_msg], 'msg')
+        component_id = Field(component_id_data, [], 'component_id')
+        component = Field(component_data, [], 'component')
+        source = Field(None, [component, component_id], 'source')
+        timestamp = Field(timestamp_data, [], 'timestamp')
+        msg = Field(None, [timestamp, source, msg], 'event')
+        
+        event = Event(index, msg)
+        
+        return event
+    
+    def createFilterFields(self, filter):
+        fields = []
+        for key, value in filter.iteritems():
+            fields.append( Field(value, [], key) )
+            
+        return fields
+    
+   
+ 
+
+        
+
+    
+    
+    
+    
+    
+    
+    
+  
+        
+ 
+        
+        
+        
+        
+        
+        
+     
\ No newline at end of file
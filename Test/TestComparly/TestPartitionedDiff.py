@@ -0,0 +1,161 @@
+# ------------------------------------------------------
+#
+#   TestPartitionedDiff.py
+#   By: Fred Stakem
+#   Created: 10.18.26
+#
+# ------------------------------------------------------
+
+
+# Libs
+import unittest
+import os
+import shutil
+import tempfile
+from datetime import datetime
+
+# User defined
+from Globals import *
+from Utilities import *
+
+from Corely import Field
+from Corely import Event
+
+from Comparly import UnorderedDiff
+from Comparly import PartitionedDiff
+
+#Main
+class PartitionedDiffTest(unittest.TestCase):
+    
+    # Setup logging
+    logger = Utilities.getLogger(__name__)
+    
+    @classmethod
+    def setUpClass(cls):
+        pass
+    
+    @classmethod
+    def tearDownClass(cls):
+        pass
+    
+    def setUp(self):
+        self.tmp_debug_diff = globals.debug_diff
+        globals.debug_diff = True
+        self.directory = tempfile.mkdtemp()
+        
+        self.hot_data = [datetime(2013, 7, 11, 9, 51, 17), 'ubuntu NetworkManager', 887, 'info', 'WiFi hardware radio set enabled']
+        self.event_data_a = [ [datetime(2013, 7, 11, 9, 51, 12), 'ubuntu kernel', None, None, 'imklog 5.8.11, log source = /proc/kmsg started.'],
+                              [datetime(2013, 7, 11, 9, 51, 14), 'ubuntu NetworkManager', 887, None, 'SCPlugin-Ifupdown: init!'],
+                              [datetime(2013, 7, 11, 9, 51, 19), 'ubuntu NetworkManager', 887, 'warn', 'DNS: plugin dnsmasq update failed'] ]
+                              
+        self.event_data_b = [ [datetime(2013, 8, 6, 7, 12, 35), 'ubuntu kernel', None, None, 'imklog 5.8.11, log source = /proc/kmsg started.'],
+                              [datetime(2013, 8, 6, 7, 12, 38), 'ubuntu NetworkManager', 887, None, 'SCPluginIfupdown: management mode: managed'],
+                              [datetime(2013, 8, 6, 7, 12, 44), 'ubuntu NetworkManager', 887, 'error', 'DNS: plugin dnsmasq update failed'] ]
+    
+    def tearDown(self):
+        globals.debug_diff = self.tmp_debug_diff
+        shutil.rmtree(self.directory, True)
+    
+    @log_test(logger, globals.log_separator)
+    def testHotKey(self):
+        PartitionedDiffTest.logger.debug('Test the partitioned diff of a key that is larger than the memory limit.')
+        
+        # Test data
+        events_a = self.createEventLog(self.event_data_a + [self.hot_data] * 200 + self.event_data_a)
+        events_b = self.createEventLog([self.hot_data] * 100 + self.event_data_b)
+        events_a_only = self.createEventLog([self.hot_data] * 50)
+        filter = {'component': None, 'component_id': None, 'level': None, 'sub_msg':None }
+        filter_fields = self.createFilterFields(filter)
+        memory_limit = 16 * 1024
+        
+        # Run test
+        diff = PartitionedDiff(memory_limit, 4, tmp_dir=self.directory)
+        repartitions = []
+        repartitionFiles = diff.repartitionFiles
+        def countRepartitions(filenames, wildcards, directory, prefix, depth):
+            repartitions.append(depth)
+            return repartitionFiles(filenames, wildcards, directory, prefix, depth)
+        diff.repartitionFiles = countRepartitions
+        results = diff.compare(events_a, events_b, filter_fields)
+        expected = UnorderedDiff.indexedCompare(events_a, events_b, filter_fields)
+        results_a_only = diff.compare(events_a_only, [], filter_fields)
+        results_b_only = diff.compare([], events_a_only, filter_fields)
+        
+        # Show test output
+        PartitionedDiffTest.logger.debug('Found events only in A: %d' % (len(results[1])))
+        PartitionedDiffTest.logger.debug('Found events only in B: %d' % (len(results[2])))
+        PartitionedDiffTest.logger.debug('Found events in A and B: %d' % (len(results[0])))
+        PartitionedDiffTest.logger.debug('Repartitioned at depths: %s' % (str(repartitions)))
+        
+        # Verify results
+        assert max(repartitions + [0]) == 0, 'Repartitioned a bucket of one key.'
+        for expected_matches, matches in zip(expected, results):
+            assert self.getMatchIndices(expected_matches) == self.getMatchIndices(matches), 'Partitioned diff differs from the indexed diff.'
+        hot_matches = [match for match in results[0] if len(match.matches_b) == 100]
+        assert [e.index for e in hot_matches[0].matches_a] == range(3, 203), 'Incorrect order of the streamed events.'
+        assert len(results_a_only[1]) == 50 and len(results_a_only[0]) == 0, 'Incorrect streamed events only in A.'
+        assert len(results_b_only[2]) == 50 and len(results_b_only[0]) == 0, 'Incorrect streamed events only in B.'
+        assert os.listdir(self.directory) == [], 'Did not remove the bucket files.'
+        
+        PartitionedDiffTest.logger.debug('Test succeeded!')
+    
+    @log_test(logger, globals.log_separator)
+    def testUnsplittableBucket(self):
+        PartitionedDiffTest.logger.debug('Test the partitioned diff of keys that only differ in a wildcard field.')
+        
+        # Test data
+        wildcard_data = list(self.hot_data)
+        wildcard_data[3] = None
+        events_a = self.createEventLog([self.hot_data, wildcard_data] * 100)
+        events_b = self.createEventLog([self.hot_data] * 10)
+        filter = {'component': None, 'component_id': None, 'level': None, 'sub_msg':None }
+        filter_fields = self.createFilterFields(filter)
+        memory_limit = 16 * 1024
+        
+        # Run test and verify results
+        diff = PartitionedDiff(memory_limit, 4, tmp_dir=self.directory)
+        try:
+            diff.compare(events_a, events_b, filter_fields)
+            assert False, 'Went over the memory limit for a bucket that can not be split.'
+        except ValueError:
+            pass
+            
+        assert os.listdir(self.directory) == [], 'Did not remove the bucket files.'
+        
+        PartitionedDiffTest.logger.debug('Test succeeded!')
+    
+    def getMatchIndices(self, matches):
+        indices = []
+        for match in matches:
+            indices.append( (tuple([e.index for e in match.matches_a]), tuple([e.index for e in match.matches_b])) )
+            
+        return sorted(indices)
+    
+    def createEventLog(self, data):
+        events = []
+        for i, ed in enumerate(data):
+            events.append( self.createEvent(i, ed[0], ed[1], ed[2], ed[3], ed[4]))
+            
+        return events
+    
+    def createEvent(self, index, timestamp_data, component_data, component_id_data, level_data, sub_msg_data):
+        sub_msg = Field(sub_msg_data, [], 'sub_msg')
+        level = Field(level_data, [], 'level')
+        msg = Field(None, [level, sub_msg], 'msg')
+        component_id = Field(component_id_data, [], 'component_id')
+        component = Field(component_data, [], 'component')
+        source = Field(None, [component, component_id], 'source')
+        timestamp = Field(timestamp_data, [], 'timestamp')
+        msg = Field(None, [timestamp, source, msg], 'event')
+        
+        event = Event(index, msg)
+        
+        return event
+    
+    def createFilterFields(self, filter):
+        fields = []
+        for key, value in filter.iteritems():
+            fields.append( Field(value, [], key) )
+            
+        return fields
+
@@ -0,0 +1,246 @@
+# ------------------------------------------------------
+#
+#   TestResultWriter.py
+#   By: Fred Stakem
+#   Created: 10.18.26
+#
+# ------------------------------------------------------
+
+
+# Libs
+import unittest
+import os
+import json
+import shutil
+import tempfile
+from datetime import datetime
+
+# User defined
+from Globals import *
+from Utilities import *
+
+from Corely import Field
+from Corely import Event
+
+from Comparly import UnorderedDiff
+from Comparly import ResultWriter
+from Comparly import ResultReader
+
+#Main
+class ResultWriterTest(unittest.TestCase):
+    
+    # Setup logging
+    logger = Utilities.getLogger(__name__)
+    
+    @classmethod
+    def setUpClass(cls):
+        pass
+    
+    @classmethod
+    def tearDownClass(cls):
+        pass
+    
+    def setUp(self):
+        self.tmp_debug_diff = globals.debug_diff
+        globals.debug_diff = True
+        self.directory = tempfile.mkdtemp()
+        
+        self.event_data_a = [ [datetime(2013, 7, 11, 9, 51, 12), 'ubuntu kernel', None, None, 'imklog 5.8.11, log source = /proc/kmsg started.'],
+                              [datetime(2013, 7, 11, 9, 51, 13), 'ubuntu kernel', None, None, '[    0.000000] Initializing cgroup subsys cpuset'],
+                              [datetime(2013, 7, 11, 9, 51, 14), 'ubuntu NetworkManager', 887, None, 'SCPlugin-Ifupdown: init!'],
+                              [datetime(2013, 7, 11, 9, 51, 15), 'ubuntu NetworkManager', 887, None, 'SCPluginIfupdown: management mode: unmanaged'],
+                              [datetime(2013, 7, 11, 9, 51, 16), 'ubuntu NetworkManager', 887, 'info', 'modem-manager is now available'],
+                              [datetime(2013, 7, 11, 9, 51, 17), 'ubuntu NetworkManager', 887, 'info', 'WiFi hardware radio set enabled'],
+                              [datetime(2013, 7, 11, 9, 51, 18), 'ubuntu NetworkManager', 887, 'info', 'WiFi hardware radio set enabled'],
+                              [datetime(2013, 7, 11, 9, 51, 19), 'ubuntu NetworkManager', 887, 'warn', 'DNS: plugin dnsmasq update failed'],
+                              [datetime(2013, 7, 11, 9, 51, 21), 'ubuntu colord', None, None, 'Profile added: icc-0bd9f292ce7882699e93ff844071783d'], ]
+        
+        self.event_data_b = [ [datetime(2013, 8, 6, 7, 12, 35), 'ubuntu kernel', None, None, 'imklog 5.8.11, log source = /proc/kmsg started.'],
+                              [datetime(2013, 8, 6, 7, 12, 36), 'ubuntu kernel', None, None, '[    0.000000] Initializing cgroup subsys cpuset'],
+                              [datetime(2013, 8, 6, 7, 12, 37), 'ubuntu NetworkManager', 887, None, 'SCPlugin-Ifupdown: init!'],
+                              [datetime(2013, 8, 6, 7, 12, 38), 'ubuntu NetworkManager', 887, None, 'SCPluginIfupdown: management mode: managed'],
+                              [datetime(2013, 8, 6, 7, 12, 39), 'ubuntu NetworkManager', 887, 'info', 'modem-manager is now available'],
+                              [datetime(2013, 8, 6, 7, 12, 41), 'ubuntu NetworkManager', 887, 'info', 'modem-manager is now available'],
+                              [datetime(2013, 8, 6, 7, 12, 42), 'ubuntu NetworkManager', 887, 'info', 'modem-manager is now available'],
+                              [datetime(2013, 8, 6, 7, 12, 43), 'ubuntu NetworkManager', 887, 'info', 'WiFi hardware radio set enabled'],
+                              [datetime(2013, 8, 6, 7, 12, 44), 'ubuntu NetworkManager', 887, 'error', 'DNS: plugin dnsmasq update failed'],
+                              [datetime(2013, 8, 6, 7, 12, 44), 'ubuntu colord', None, None, 'Profile added: icc-0bd9f292ce7882699e93ff844071783d'], ]
+        
+    def tearDown(self):
+        globals.debug_diff = self.tmp_debug_diff
+        shutil.rmtree(self.directory, True)
+          
+    @log_test(logger, globals.log_separator)
+    def testWriteRead(self):
+        ResultWriterTest.logger.debug('Test writing and reading diff results in both formats.')
+        
+        # Test data
+        events_a = self.createEventLog(self.event_data_a)
+        events_b = self.createEventLog(self.event_data_b)
+        filter = {'component': None, 'component_id': None, 'level': None, 'sub_msg':None }
+        filter_fields = self.createFilterFields(filter)
+        matches_both, matches_a_only, matches_b_only = UnorderedDiff.indexedCompare(events_a, events_b, filter_fields)
+        expected = self.getRecords(matches_both, matches_a_only, matches_b_only)
+        
+        for format in [ResultWriter.BINARY, ResultWriter.JSON]:
+            filename = os.path.join(self.directory, 'results.' + format)
+            
+            # Run test
+            with ResultWriter(filename, format, 3) as writer:
+                writer.writeResults(matches_both, matches_a_only, matches_b_only)
+                
+            with ResultReader(filename) as reader:
+                records = list(reader)
+                count = len(reader)
+                seeks = [reader.getRecord(i) for i in [7, 2, 3, 9]]
+                reader.seek(len(expected))
+                end = reader.read()
+                
+            # Show test output
+            ResultWriterTest.logger.debug('Wrote %d results into %d bytes of %s.' % (count, os.path.getsize(filename), format))
+            
+            # Verify results
+            assert reader.format == format, 'Incorrect format of the result file.'
+            assert count == 10, 'Incorrect number of results.'
+            assert count == len(expected), 'Incorrect number of results.'
+            assert records == expected, 'Incorrect results read back from the %s file.' % (format)
+            assert seeks == [expected[7], expected[2], expected[3], expected[9]], 'Incorrect results after seeking.'
+            assert end == None, 'Read past the last result.'
+        
+        ResultWriterTest.logger.debug('Test succeeded!')
+        
+    @log_test(logger, globals.log_separator)
+    def testWriteStream(self):
+        ResultWriterTest.logger.debug('Test writing the results of a streaming comparison.')
+        
+        # Test data
+        events_a = self.createEventLog(self.event_data_a)
+        events_b = self.createEventLog(self.event_data_b)
+        filter = {'component': None, 'component_id': None, 'level': None, 'sub_msg':None }
+        filter_fields = self.createFilterFields(filter)
+        filename = os.path.join(self.directory, 'results.binary')
+        
+        # Run test
+        with ResultWriter(filename) as writer:
+            writer.writeStream(UnorderedDiff.streamCompare(iter(events_a), iter(events_b), filter_fields))
+            
+        with ResultReader(filename) as reader:
+            records = list(reader)
+            
+        # Show test output
+        ResultWriterTest.logger.debug('Wrote %d streamed results.' % (len(records)))
+            
+        # Verify results
+        categories = [record['category'] for record in records]
+        assert categories.count(UnorderedDiff.BOTH) == 6, 'Found an incorrect number of events in both A and B.'
+        assert len(set([json.dumps(record['key']) for record in records])) == len(records), 'Wrote a key more than once.'
+        assert [record for record in records if record['indices_b'] == [4, 5, 6]][0]['indices_a'] == [4], 'Incorrect streamed match.'
+        assert categories.count(UnorderedDiff.A_ONLY) == 2, 'Found the incorrect number of events only in A.'
+        assert categories.count(UnorderedDiff.B_ONLY) == 2, 'Found the incorrect number of events only in B.'
+        assert records[-1]['indices_b'] == [8] and records[-1]['indices_a'] == [], 'Incorrect last streamed result.'
+        
+        ResultWriterTest.logger.debug('Test succeeded!')
+        
+    @log_test(logger, globals.log_separator)
+    def testWriteCompact(self):
+        ResultWriterTest.logger.debug('Test writing the results of a compact comparison.')
+        
+        # Test data
+        events_a = self.createEventLog(self.event_data_a)
+        events_b = self.createEventLog(self.event_data_b)
+        filter = {'component': None, 'component_id': None, 'level': None, 'sub_msg':None }
+        filter_fields = self.createFilterFields(filter)
+        expected = self.getRecords(*UnorderedDiff.indexedCompare(events_a, events_b, filter_fields))
+        matches_both, matches_a_only, matches_b_only = UnorderedDiff.compareCompact(events_a, events_b, filter_fields)
+        bound_filename = os.path.join(self.directory, 'bound.binary')
+        unbound_filename = os.path.join(self.directory, 'unbound.binary')
+        
+        # Run test
+        with ResultWriter(bound_filename) as writer:
+            writer.writeResults(matches_both, matches_a_only, matches_b_only)
+            
+        for match in matches_both + matches_a_only + matches_b_only:
+            match.bind(None, None)
+        with ResultWriter(unbound_filename) as writer:
+            writer.writeResults(matches_both, matches_a_only, matches_b_only)
+            
+        with ResultReader(bound_filename) as reader:
+            bound = list(reader)
+        with ResultReader(unbound_filename) as reader:
+            unbound = list(reader)
+            
+        # Show test output
+        ResultWriterTest.logger.debug('Wrote %d compact results.' % (len(bound)))
+            
+        # Verify results
+        key = lambda record: (record['category'], json.dumps(record['key']))
+        assert sorted(bound, key=key) == sorted(expected, key=key), 'Incorrect compact results.'
+        assert unbound == bound, 'Incorrect unbound compact results.'
+        
+        ResultWriterTest.logger.debug('Test succeeded!')
+        
+    def getRecords(self, matches_both, matches_a_only, matches_b_only):
+        records = []
+        written = set()
+        for category, matches in [(UnorderedDiff.BOTH, matches_both), (UnorderedDiff.A_ONLY, matches_a_only), (UnorderedDiff.B_ONLY, matches_b_only)]:
+            for match in matches:
+                if id(match) in written:
+                    continue
+                written.add(id(match))
+                records.append({ 'category': category,
+                                 'key': [field.value for field in match.fields],
+                                 'indices_a': [event.index for event in match.matches_a],
+                                 'indices_b': [event.index for event in match.matches_b] })
+                
+        return records
+    
+    def createEventLog(self, data):
+        events = []
+        for i, ed in enumerate(data):
+            events.append( self.createEvent(i, ed[0], ed[1], ed[2], ed[3], ed[4]))
+        
+        return events
+     
+    def createEvent(self, index, timestamp_data, component_data, component_id_data, level_data, sub_msg_data):
+        sub_msg = Field(sub_msg_data, [], 'sub_msg')
+        level = Field(level_data, [], 'level')
+        msg = Field(None, [level, sub_msg], 'msg')
+        component_id = Field(component_id_data, [], 'component_id')
+        component = Field(component_data, [], 'component')
+        source = Field(None, [component, component_id], 'source')
+        timestamp = Field(timestamp_data, [], 'timestamp')
+        msg = Field(None, [timestamp, source, msg], 'event')
+        
+        event = Event(index, msg)
+        
+        return event
+    
+    def createFilterFields(self, filter):
+        fields = []
+        for key, value in filter.iteritems():
+            fields.append( Field(value, [], key) )
+            
+        return fields
+    
+   
+ 
+
+        
+
+    
+    
+    
+    
+    
+    
+    
+  
+        
+ 
+        
+        
+        
+        
+        
+        
+     
\ No newline at end of file
@@ -9,6 +9,7 @@
 
 # Libs
 import unittest
+import cPickle
 from datetime import datetime
 
 # User defined
@@ -19,6 +20,8 @@ from Corely import Field
 from Corely import Event
 
 from Comparly import UnorderedDiff
+from Comparly import EventTable
+from Comparly import DiffStats
 
 #Main
 class UnorderedDiffTest(unittest.TestCase):
@@ -112,6 +115,284 @@ class UnorderedDiffTest(unittest.TestCase):
         
         UnorderedDiffTest.logger.debug('Test succeeded!')
         
+    @log_test(logger, globals.log_separator)
+    def testCompareStats(self):
+        UnorderedDiffTest.logger.debug('Test the per phase statistics of the comparison.')
+        
+        # Test data
+        events_a = self.createEventLog(self.event_data_a)
+        events_b = self.createEventLog(self.event_data_b)
+        filter = {'component': None, 'component_id': None, 'level': None, 'sub_msg':None }
+        filter_fields = self.createFilterFields(filter)
+        notified = []
+        stats = DiffStats(lambda phase: notified.append(phase.name))
+        
+        # Run test
+        expected = UnorderedDiff.compare(events_a, events_b, filter_fields)
+        results = UnorderedDiff.compare(events_a, events_b, filter_fields, stats)
+        phases = stats.to_dict()
+        
+        # Show test output
+        UnorderedDiffTest.logger.debug('Stats:\n%s' % (stats.to_pretty_json()))
+            
+        # Verify results
+        for expected_matches, matches in zip(expected, results):
+            assert self.getMatchIndices(expected_matches) == self.getMatchIndices(matches), 'Statistics changed the comparison.'
+        
+        assert notified == ['filter', 'previous_match_search', 'scan_b', 'group_b'], 'Incorrect phase notifications.'
+        assert phases['filter']['events_in'] == 19 and phases['filter']['events_out'] == 19, 'Incorrect filter statistics.'
+        assert phases['previous_match_search']['calls'] == 9, 'Incorrect previous match search calls.'
+        assert phases['previous_match_search']['events_out'] == 1, 'Incorrect number of previous matches found.'
+        assert phases['previous_match_search']['comparisons'] == 30, 'Incorrect number of previous match comparisons.'
+        assert phases['scan_b']['calls'] == 9, 'Incorrect log B scan calls.'
+        assert phases['scan_b']['events_out'] == 8, 'Incorrect number of log B events matched.'
+        assert phases['group_b']['events_out'] == 2, 'Incorrect number of B only events.'
+        
+        UnorderedDiffTest.logger.debug('Test succeeded!')
+        
+    @log_test(logger, globals.log_separator)
+    def testIndexedCompare(self):
+        UnorderedDiffTest.logger.debug('Test the indexed comparison against the original comparison.')
+        
+        # Test data
+        events_a = self.createEventLog(self.event_data_a)
+        events_b = self.createEventLog(self.event_data_b)
+        filters = [ {'component': None, 'component_id': None, 'level': None, 'sub_msg':None },
+                    {'component': 'ubuntu kernel', 'component_id': None, 'level': None, 'sub_msg':None },
+                    {'component': 'ubuntu NetworkManager', 'component_id': None, 'level': None, 'sub_msg':None } ]
+        
+        for filter in filters:
+            filter_fields = self.createFilterFields(filter)
+            
+            # Run test
+            expected = UnorderedDiff.compare(events_a, events_b, filter_fields)
+            results = UnorderedDiff.indexedCompare(events_a, events_b, filter_fields)
+            
+            # Show test output
+            UnorderedDiffTest.logger.debug('Found events only in A: %d' % (len(results[1]))) 
+            UnorderedDiffTest.logger.debug('Found events only in B: %d' % (len(results[2])))  
+            UnorderedDiffTest.logger.debug('Found events in A and B: %d' % (len(results[0])))
+            
+            # Verify results
+            for expected_matches, matches in zip(expected, results):
+                assert self.getMatchIndices(expected_matches) == self.getMatchIndices(matches), 'Indexed comparison differs from the original comparison.'
+        
+        UnorderedDiffTest.logger.debug('Test succeeded!')
+        
+    @log_test(logger, globals.log_separator)
+    def testIndexedCompareWildcards(self):
+        UnorderedDiffTest.logger.debug('Test the indexed comparison treats None values in log A as wildcards.')
+        
+        # Test data
+        event_data_a = [ [datetime(2013, 7, 11, 9, 51, 16), 'ubuntu NetworkManager', 887, None, 'modem-manager is now available'],
+                         [datetime(2013, 7, 11, 9, 51, 17), 'ubuntu NetworkManager', 887, 'info', 'modem-manager is now available'],
+                         [datetime(2013, 7, 11, 9, 51, 18), 'ubuntu NetworkManager', None, 'info', 'WiFi hardware radio set enabled'],
+                         [datetime(2013, 7, 11, 9, 51, 19), 'ubuntu NetworkManager', 887, 'info', 'WiFi hardware radio set enabled'] ]
+        event_data_b = [ [datetime(2013, 8, 6, 7, 12, 39), 'ubuntu NetworkManager', 887, 'info', 'modem-manager is now available'],
+                         [datetime(2013, 8, 6, 7, 12, 40), 'ubuntu NetworkManager', 887, None, 'modem-manager is now available'],
+                         [datetime(2013, 8, 6, 7, 12, 41), 'ubuntu NetworkManager', 887, 'info', 'WiFi hardware radio set enabled'],
+                         [datetime(2013, 8, 6, 7, 12, 42), 'ubuntu NetworkManager', 912, 'info', 'WiFi hardware radio set enabled'] ]
+        events_a = self.createEventLog(event_data_a)
+        events_b = self.createEventLog(event_data_b)
+        filter = {'component': None, 'component_id': None, 'level': None, 'sub_msg':None }
+        filter_fields = self.createFilterFields(filter)
+        
+        # Run test
+        expected = UnorderedDiff.compare(events_a, events_b, filter_fields)
+        results = UnorderedDiff.indexedCompare(events_a, events_b, filter_fields)
+        
+        # Show test output
+        UnorderedDiffTest.logger.debug('Found events only in A: %d' % (len(results[1]))) 
+        UnorderedDiffTest.logger.debug('Found events only in B: %d' % (len(results[2])))  
+        UnorderedDiffTest.logger.debug('Found events in A and B: %d' % (len(results[0])))
+        
+        # Verify results
+        for expected_matches, matches in zip(expected, results):
+            assert self.getMatchIndices(expected_matches) == self.getMatchIndices(matches), 'Indexed comparison differs from the original comparison.'
+        
+        UnorderedDiffTest.logger.debug('Test succeeded!')
+        
+    @log_test(logger, globals.log_separator)
+    def testTableCompare(self):
+        UnorderedDiffTest.logger.debug('Test the comparison of event tables.')
+        
+        # Test data
+        events_a = self.createEventLog(self.event_data_a)
+        events_b = self.createEventLog(self.event_data_b)
+        filter = {'component': 'ubuntu NetworkManager', 'component_id': None, 'level': None, 'sub_msg':None }
+        filter_fields = self.createFilterFields(filter)
+        field_names = UnorderedDiff.getFieldNames(filter_fields)
+        table_a = EventTable(events_a, field_names)
+        table_b = EventTable(events_b, field_names, table_a.codebook)
+        
+        # Run test
+        expected = UnorderedDiff.compare(events_a, events_b, filter_fields)
+        results = UnorderedDiff.indexedCompare(table_a, table_b, filter_fields)
+        
+        # Show test output
+        UnorderedDiffTest.logger.debug('Found events only in A: %d' % (len(results[1]))) 
+        UnorderedDiffTest.logger.debug('Found events only in B: %d' % (len(results[2])))  
+        UnorderedDiffTest.logger.debug('Found events in A and B: %d' % (len(results[0])))
+        
+        # Verify results
+        for expected_matches, matches in zip(expected, results):
+            assert self.getMatchIndices(expected_matches) == self.getMatchIndices(matches), 'Table comparison differs from the original comparison.'
+        
+        UnorderedDiffTest.logger.debug('Test succeeded!')
+        
+    @log_test(logger, globals.log_separator)
+    def testSummarize(self):
+        UnorderedDiffTest.logger.debug('Test the count only summary of event logs.')
+        
+        # Test data
+        events_a = self.createEventLog(self.event_data_a)
+        events_b = self.createEventLog(self.event_data_b)
+        filter = {'component': None, 'component_id': None, 'level': None, 'sub_msg':None }
+        filter_fields = self.createFilterFields(filter)
+        
+        # Run test
+        summaries_both, summaries_a_only, summaries_b_only = UnorderedDiff.summarize(iter(events_a), iter(events_b), filter_fields, 2)
+        
+        # Show test output
+        UnorderedDiffTest.logger.debug('Found keys only in A: %d' % (len(summaries_a_only))) 
+        UnorderedDiffTest.logger.debug('Found keys only in B: %d' % (len(summaries_b_only)))  
+        UnorderedDiffTest.logger.debug('Found keys in A and B: %d' % (len(summaries_both)))
+        
+        # Verify results
+        assert len(summaries_both) == 6, 'Found an incorrect number of keys in both A and B.'
+        assert len(summaries_a_only) == 2, 'Found the incorrect number of A only keys.'
+        assert len(summaries_b_only) == 2, 'Found the incorrect number of B only keys.'
+        assert sum([s.count_a for s in summaries_both.values()]) == 7, 'Incorrect count of A events in both A and B.'
+        assert sum([s.count_b for s in summaries_both.values()]) == 8, 'Incorrect count of B events in both A and B.'
+        
+        modem = [s for s in summaries_both.values() if s.count_b == 3]
+        assert len(modem) == 1 and modem[0].exemplars_b == [4, 5], 'Incorrect exemplars for a repeated key.'
+        
+        UnorderedDiffTest.logger.debug('Test succeeded!')
+        
+    @log_test(logger, globals.log_separator)
+    def testCompareCompact(self):
+        UnorderedDiffTest.logger.debug('Test the compact comparison of event logs.')
+        
+        # Test data
+        events_a = self.createEventLog(self.event_data_a)
+        events_b = self.createEventLog(self.event_data_b)
+        filter = {'component': None, 'component_id': None, 'level': None, 'sub_msg':None }
+        filter_fields = self.createFilterFields(filter)
+        field_names = UnorderedDiff.getFieldNames(filter_fields)
+        
+        # Run test
+        matches_both, matches_a_only, matches_b_only = UnorderedDiff.compareCompact(events_a, events_b, filter_fields)
+        copies = cPickle.loads(cPickle.dumps(matches_both, cPickle.HIGHEST_PROTOCOL))
+        
+        # Show test output
+        UnorderedDiffTest.logger.debug('Found keys only in A: %d' % (len(matches_a_only))) 
+        UnorderedDiffTest.logger.debug('Found keys only in B: %d' % (len(matches_b_only)))  
+        UnorderedDiffTest.logger.debug('Found keys in A and B: %d' % (len(matches_both)))
+        
+        # Verify results
+        assert len(matches_both) == 6, 'Found an incorrect number of keys in both A and B.'
+        assert len(matches_a_only) == 2, 'Found the incorrect number of A only keys.'
+        assert len(matches_b_only) == 2, 'Found the incorrect number of B only keys.'
+        
+        for match in matches_both + matches_a_only + matches_b_only:
+            for event in match.matches_a + match.matches_b:
+                assert UnorderedDiff.getKey(event, field_names) == match.key, 'Incorrect event in a compact match.'
+            assert [field.value for field in match.fields] == list(match.key), 'Incorrect fields of a compact match.'
+        
+        modem = [m for m in matches_both if len(m.positions_b) == 3]
+        assert len(modem) == 1 and list(modem[0].positions_b) == [4, 5, 6], 'Incorrect positions for a repeated key.'
+        
+        for match, copy in zip(matches_both, copies):
+            assert copy.events_a == None and copy.events_b == None, 'The logs were serialized with the match.'
+            copy.bind(events_a, events_b)
+            assert copy.key == match.key and copy.matches_b == match.matches_b, 'Incorrect match after serialization.'
+        
+        UnorderedDiffTest.logger.debug('Test succeeded!')
+        
+    @log_test(logger, globals.log_separator)
+    def testCompareCompactWildcards(self):
+        UnorderedDiffTest.logger.debug('Test the compact comparison treats None values in log A as wildcards.')
+        
+        # Test data
+        event_data_a = [ [datetime(2013, 7, 11, 9, 51, 16), 'ubuntu NetworkManager', 887, None, 'modem-manager is now available'],
+                         [datetime(2013, 7, 11, 9, 51, 17), 'ubuntu NetworkManager', 887, 'info', 'modem-manager is now available'],
+                         [datetime(2013, 7, 11, 9, 51, 18), 'ubuntu NetworkManager', None, 'info', 'WiFi hardware radio set enabled'],
+                         [datetime(2013, 7, 11, 9, 51, 19), 'ubuntu NetworkManager', 887, 'info', 'WiFi hardware radio set enabled'] ]
+        event_data_b = [ [datetime(2013, 8, 6, 7, 12, 39), 'ubuntu NetworkManager', 887, 'info', 'modem-manager is now available'],
+                         [datetime(2013, 8, 6, 7, 12, 40), 'ubuntu NetworkManager', 887, None, 'modem-manager is now available'],
+                         [datetime(2013, 8, 6, 7, 12, 41), 'ubuntu NetworkManager', 887, 'info', 'WiFi hardware radio set enabled'],
+                         [datetime(2013, 8, 6, 7, 12, 42), 'ubuntu NetworkManager', 912, 'info', 'WiFi hardware radio set enabled'],
+                         [datetime(2013, 8, 6, 7, 12, 43), 'ubuntu colord', None, None, 'Profile added: icc-0bd9f292ce7882699e93ff844071783d'] ]
+        events_a = self.createEventLog(event_data_a)
+        events_b = self.createEventLog(event_data_b)
+        filter = {'component': None, 'component_id': None, 'level': None, 'sub_msg':None }
+        filter_fields = self.createFilterFields(filter)
+        
+        # Run test
+        expected = UnorderedDiff.compare(events_a, events_b, filter_fields)
+        results = UnorderedDiff.compareCompact(events_a, events_b, filter_fields)
+        single = UnorderedDiff.compareCompact(events_a[:1], events_b[:1], filter_fields)
+        
+        # Show test output
+        UnorderedDiffTest.logger.debug('Found keys only in A: %d' % (len(results[1]))) 
+        UnorderedDiffTest.logger.debug('Found keys only in B: %d' % (len(results[2])))  
+        UnorderedDiffTest.logger.debug('Found keys in A and B: %d' % (len(results[0])))
+        
+        # Verify results
+        for expected_matches, matches in zip(expected, results):
+            assert self.getEventIndices(expected_matches) == self.getEventIndices(matches), 'Compact comparison differs from the original comparison.'
+        assert [len(matches) for matches in single] == [1, 0, 0], 'A None value in log A did not match any value in log B.'
+        assert list(single[0][0].positions_b) == [0], 'Incorrect positions for a wildcard key.'
+        
+        UnorderedDiffTest.logger.debug('Test succeeded!')
+        
+    @log_test(logger, globals.log_separator)
+    def testStreamCompare(self):
+        UnorderedDiffTest.logger.debug('Test the streaming comparison of event log generators.')
+        
+        # Test data
+        events_a = self.createEventLog(self.event_data_a)
+        events_b = self.createEventLog(self.event_data_b)
+        filter = {'component': None, 'component_id': None, 'level': None, 'sub_msg':None }
+        filter_fields = self.createFilterFields(filter)
+        
+        # Run test
+        expected = UnorderedDiff.compare(events_a, events_b, filter_fields)
+        results = { UnorderedDiff.BOTH: [], UnorderedDiff.A_ONLY: [], UnorderedDiff.B_ONLY: [] }
+        stream = UnorderedDiff.streamCompare(iter(events_a), (e for e in events_b), filter_fields)
+        for category, match in stream:
+            results[category].append(match)
+            
+        # Show test output
+        UnorderedDiffTest.logger.debug('Found events only in A: %d' % (len(results[UnorderedDiff.A_ONLY]))) 
+        UnorderedDiffTest.logger.debug('Found events only in B: %d' % (len(results[UnorderedDiff.B_ONLY])))  
+        UnorderedDiffTest.logger.debug('Found events in A and B: %d' % (len(results[UnorderedDiff.BOTH])))
+        
+        # Verify results
+        assert self.getMatchIndices(expected[0]) == self.getMatchIndices(results[UnorderedDiff.BOTH]), 'Incorrect events in both A and B.'
+        assert self.getMatchIndices(expected[1]) == self.getMatchIndices(results[UnorderedDiff.A_ONLY]), 'Incorrect A only events.'
+        assert self.getMatchIndices(expected[2]) == self.getMatchIndices(results[UnorderedDiff.B_ONLY]), 'Incorrect B only events.'
+        
+        UnorderedDiffTest.logger.debug('Test succeeded!')
+        
+    def getEventIndices(self, matches):
+        # Events by category no matter how they are grouped into matches
+        indices_a = set()
+        indices_b = set()
+        for match in matches:
+            indices_a.update([e.index for e in match.matches_a])
+            indices_b.update([e.index for e in match.matches_b])
+            
+        return (sorted(indices_a), sorted(indices_b))
+    
+    def getMatchIndices(self, matches):
+        indices = []
+        for match in matches:
+            indices.append( ([e.index for e in match.matches_a], [e.index for e in match.matches_b]) )
+            
+        return indices
+        
     def createEventLog(self, data):
         events = []
         for i, ed in enumerate(data):
@@ -0,0 +1,146 @@
+# ------------------------------------------------------
+#
+#   TestWindowedDiff.py
+#   By: Fred Stakem
+#   Created: 10.18.26
+#
+# ------------------------------------------------------
+
+
+# Libs
+import unittest
+from datetime import datetime
+
+# User defined
+from Globals import *
+from Utilities import *
+
+from Corely import Field
+from Corely import Event
+
+from Comparly import WindowedDiff
+
+#Main
+class WindowedDiffTest(unittest.TestCase):
+    
+    # Setup logging
+    logger = Utilities.getLogger(__name__)
+    
+    @classmethod
+    def setUpClass(cls):
+        pass
+    
+    @classmethod
+    def tearDownClass(cls):
+        pass
+    
+    def setUp(self):
+        self.tmp_debug_diff = globals.debug_diff
+        globals.debug_diff = True
+        
+        self.event_data_a = [ [datetime(2013, 7, 11, 9, 51, 12), 'ubuntu kernel', None, None, 'imklog 5.8.11, log source = /proc/kmsg started.'],
+                              [datetime(2013, 7, 11, 9, 51, 16), 'ubuntu NetworkManager', 887, 'info', 'modem-manager is now available'],
+                              [datetime(2013, 7, 11, 9, 52, 0), 'ubuntu NetworkManager', 887, 'info', 'modem-manager is now available'],
+                              [datetime(2013, 7, 11, 10, 0, 0), 'ubuntu NetworkManager', 887, 'warn', 'DNS: plugin dnsmasq update failed'], ]
+        
+        self.event_data_b = [ [datetime(2013, 7, 11, 9, 53, 0), 'ubuntu NetworkManager', 887, 'info', 'modem-manager is now available'],
+                              [datetime(2013, 7, 11, 9, 51, 59), 'ubuntu NetworkManager', 887, 'info', 'modem-manager is now available'],
+                              [datetime(2013, 7, 11, 9, 51, 15), 'ubuntu NetworkManager', 887, 'info', 'modem-manager is now available'],
+                              [datetime(2013, 7, 11, 9, 51, 14), 'ubuntu kernel', None, None, 'imklog 5.8.11, log source = /proc/kmsg started.'],
+                              [datetime(2013, 7, 11, 12, 0, 0), 'ubuntu NetworkManager', 887, 'warn', 'DNS: plugin dnsmasq update failed'], ]
+        
+    def tearDown(self):
+        globals.debug_diff = self.tmp_debug_diff
+          
+    @log_test(logger, globals.log_separator)
+    def testCompare(self):
+        WindowedDiffTest.logger.debug('Test the comparison of event logs within a time window.')
+        
+        # Test data
+        events_a = self.createEventLog(self.event_data_a)
+        events_b = self.createEventLog(self.event_data_b)
+        filter = {'component': None, 'component_id': None, 'level': None, 'sub_msg':None }
+        filter_fields = self.createFilterFields(filter)
+        
+        # Run test
+        matches_both, matches_a_only, matches_b_only = WindowedDiff(5).compare(events_a, events_b, filter_fields)
+        day_both, day_a_only, day_b_only = WindowedDiff(24 * 60 * 60).compare(events_a, events_b, filter_fields)
+        
+        # Show test output
+        WindowedDiffTest.logger.debug('Found events only in A: %d' % (len(matches_a_only))) 
+        WindowedDiffTest.logger.debug('Found events only in B: %d' % (len(matches_b_only)))  
+        WindowedDiffTest.logger.debug('Found events in A and B: %d' % (len(matches_both)))
+        
+        # Verify results
+        assert len(matches_both) == 3, 'Found an incorrect number of events in both A and B.'
+        assert len(matches_a_only) == 1, 'Found the incorrect number of events only in A.'
+        assert len(matches_b_only) == 2, 'Found the incorrect number of events only in B.'
+        
+        pairs = self.getMatchIndices(matches_both)
+        assert pairs == [(0, 3), (1, 2), (2, 1)], 'Incorrect events paired within the window.'
+        assert self.getMatchIndices(matches_a_only) == [(3, None)], 'Incorrect events only in A.'
+        assert self.getMatchIndices(matches_b_only) == [(None, 0), (None, 4)], 'Incorrect events only in B.'
+        
+        assert len(day_both) == 4 and len(day_a_only) == 0 and len(day_b_only) == 1, 'Incorrect comparison with a wide window.'
+        
+        WindowedDiffTest.logger.debug('Test succeeded!')
+        
+    def getMatchIndices(self, matches):
+        indices = []
+        for match in matches:
+            index_a = match.matches_a[0].index if len(match.matches_a) > 0 else None
+            index_b = match.matches_b[0].index if len(match.matches_b) > 0 else None
+            indices.append((index_a, index_b))
+        
+        return sorted(indices)
+    
+    def createEventLog(self, data):
+        events = []
+        for i, ed in enumerate(data):
+            events.append( self.createEvent(i, ed[0], ed[1], ed[2], ed[3], ed[4]))
+        
+        return events
+     
+    def createEvent(self, index, timestamp_data, component_data, component_id_data, level_data, sub_msg_data):
+        sub_msg = Field(sub_msg_data, [], 'sub_msg')
+        level = Field(level_data, [], 'level')
+        msg = Field(None, [level, sub_msg], 'msg')
+        component_id = Field(component_id_data, [], 'component_id')
+        component = Field(component_data, [], 'component')
+        source = Field(None, [component, component_id], 'source')
+        timestamp = Field(timestamp_data, [], 'timestamp')
+        msg = Field(None, [timestamp, source, msg], 'event')
+        
+        event = Event(index, msg)
+        
+        return event
+    
+    def createFilterFields(self, filter):
+        fields = []
+        for key, value in filter.iteritems():
+            fields.append( Field(value, [], key) )
+            
+        return fields
+    
+   
+ 
+
+        
+
+    
+    
+    
+    
+    
+    
+    
+  
+        
+ 
+        
+        
+        
+        
+        
+        
+     
\ No newline at end of file
@@ -9,6 +9,10 @@
 
 # Libs
 import unittest
+import os
+import json
+import shutil
+import tempfile
 from datetime import datetime
 import numpy
 
@@ -21,6 +25,13 @@ from Corely import Event
 
 from Comparly import UnorderedDiff
 from Comparly import DistanceCalculator
+from Comparly import PartitionedDiff
+from Comparly import EventCache
+from Comparly import EventLoader
+from Comparly import ParallelLoader
+from Comparly import BatchRunner
+from Comparly import DiffServer
+from Comparly import DiffClient
 
 from Lexly import Stream
 from Lexly import RawEventSeparator
@@ -35,6 +46,11 @@ from Lexly.Parser import DatetimeParser
 from Lexly.Parser import StrParser
 from Lexly.Parser import IntParser
 
+# Parser factory for worker processes
+def createSyslogParsers():
+    test = CompareSyslogTest('testUnorderedDiff')
+    return (test.createEventLexer(), test.createEventParser()[0])
+    
 #Main
 class CompareSyslogTest(unittest.TestCase):
     
@@ -62,6 +78,8 @@ class CompareSyslogTest(unittest.TestCase):
                        'ubuntu_kern_new': './logs/ubuntu_logs_8_12_13/kern.log'}
         self.test_file_old = test_files['ubuntu_syslog_old']
         self.test_file_new = test_files['ubuntu_syslog_new']
+        self.bundled_file_old = '../../logs/ubuntu_13_04_logs/7_11_13/syslog'
+        self.bundled_file_new = '../../logs/ubuntu_13_04_logs/8_16_13/syslog'
         self.filters = { 'syslog_time_filter': {'component': None, 'component_id': None, 'level': None, 'sub_msg':None },
                          'syslog_error_filter': {'component': None, 'component_id': None, 'level': 'error', 'sub_msg':None },
                          'auth_filter': {'component': None, 'component_id': None, 'level': None, 'sub_msg':None },
@@ -106,6 +124,232 @@ class CompareSyslogTest(unittest.TestCase):
         
         CompareSyslogTest.logger.debug('Test succeeded!')
         
+    @log_test(logger, globals.log_separator)
+    def testPartitionedDiff(self):
+        CompareSyslogTest.logger.debug('Test the partitioned diff of event logs with a tiny memory budget.')
+        
+        # Test data
+        self.fail_on_error = False
+        old_raw_events = self.getData(self.bundled_file_old)
+        new_raw_events = self.getData(self.bundled_file_new)
+        
+        self.lexer = self.createEventLexer()
+        parsers = self.createEventParser()
+        self.parser = parsers[0]
+        
+        old_events = self.parseData(old_raw_events)
+        new_events = self.parseData(new_raw_events)
+        filter_fields = self.createFilterFields(self.filter)
+        memory_limit = 16 * 1024
+        
+        # Run test
+        expected = UnorderedDiff.indexedCompare(old_events, new_events, filter_fields)
+        diff = PartitionedDiff(memory_limit, 8)
+        results = diff.compare(old_events, new_events, filter_fields)
+        
+        # Show test output
+        CompareSyslogTest.logger.debug('Found events only in A: %d' % (len(results[1]))) 
+        CompareSyslogTest.logger.debug('Found events only in B: %d' % (len(results[2])))  
+        CompareSyslogTest.logger.debug('Found events in A and B: %d' % (len(results[0])))
+        
+        # Verify results
+        for expected_matches, matches in zip(expected, results):
+            assert self.getMatchIndices(expected_matches) == self.getMatchIndices(matches), 'Partitioned diff differs from the indexed diff.'
+        
+        CompareSyslogTest.logger.debug('Test succeeded!')
+        
+    @log_test(logger, globals.log_separator)
+    def testEventLoaderCache(self):
+        CompareSyslogTest.logger.debug('Test loading events through the parsed event cache.')
+        
+        # Test data
+        directory = tempfile.mkdtemp()
+        self.lexer = self.createEventLexer()
+        parsers = self.createEventParser()
+        
+        try:
+            # Run test
+            cache = EventCache(directory, 64 * 1024 * 1024)
+            loader = EventLoader(self.lexer, parsers[0], 'syslog', cache)
+            events = loader.load(self.test_file_old)
+            errors = len(loader.errors)
+            cached_events = loader.load(self.test_file_old)
+            cached_errors = len(loader.errors)
+            used_loader = EventLoader(self.lexer, parsers[0], 'syslog', cache)
+            used_events = used_loader.load(self.test_file_old)
+            other_loader = EventLoader(self.lexer, parsers[0], 'syslog v2', cache)
+            other_events = other_loader.load(self.test_file_old)
+            same_loader = EventLoader(self.createEventLexer(), self.createEventParser()[0], 'syslog', cache)
+            same_events = same_loader.load(self.test_file_old)
+            changed_parser = Parser('event', [parsers[1], parsers[2]], [], 'Changed Event Parser')
+            changed_loader = EventLoader(self.createEventLexer(), changed_parser, 'syslog', cache)
+            changed_loader.load(self.test_file_old)
+            
+            # Show test output
+            CompareSyslogTest.logger.debug('Loaded %d events.' % (len(events)))
+            CompareSyslogTest.logger.debug('Cache stats: %s' % (str(cache.getStats())))
+        finally:
+            shutil.rmtree(directory, True)
+            
+        # Verify results
+        assert len(events) > 0, 'Did not load any events.'
+        assert [e.index for e in cached_events] == [e.index for e in events], 'Incorrect cached events.'
+        assert cached_errors == errors, 'Incorrect number of parse errors for cached events.'
+        assert used_loader.config_id == loader.config_id, 'A lexer that already ran has a different id.'
+        assert [e.index for e in used_events] == [e.index for e in events], 'Incorrect cached events for a lexer that already ran.'
+        assert len(other_events) == len(events), 'Incorrect events for a new configuration.'
+        assert [e.index for e in same_events] == [e.index for e in events], 'Incorrect cached events for the same configuration.'
+        assert same_loader.config_id == loader.config_id, 'The same configuration has a different id.'
+        assert changed_loader.config_id != loader.config_id, 'A changed configuration has the same id.'
+        assert cache.getStats() == {'hits': 3, 'misses': 3, 'evictions': 0}, 'Incorrect cache stats.'
+        
+        CompareSyslogTest.logger.debug('Test succeeded!')
+        
+    @log_test(logger, globals.log_separator)
+    def testParallelLoader(self):
+        CompareSyslogTest.logger.debug('Test loading both logs in parallel chunks.')
+        
+        # Test data
+        self.lexer, self.parser = createSyslogParsers()
+        old_events = self.parseData(self.getData(self.test_file_old))
+        new_events = self.parseData(self.getData(self.test_file_new))
+        field_names = ['component', 'component_id', 'level', 'sub_msg']
+        
+        # Run test
+        loader = ParallelLoader(createSyslogParsers, 4, 16 * 1024)
+        parallel_old_events, parallel_new_events = loader.loadPair(self.test_file_old, self.test_file_new)
+        
+        # Show test output
+        CompareSyslogTest.logger.debug('Loaded %d events from the old log.' % (len(parallel_old_events)))
+        CompareSyslogTest.logger.debug('Loaded %d events from the new log.' % (len(parallel_new_events)))
+        
+        # Verify results
+        for events, parallel_events in [(old_events, parallel_old_events), (new_events, parallel_new_events)]:
+            assert len(parallel_events) == len(events), 'Loaded the incorrect number of events.'
+            for event, parallel_event in zip(events, parallel_events):
+                assert UnorderedDiff.getKey(event, field_names) == UnorderedDiff.getKey(parallel_event, field_names), 'Loaded the events out of order.'
+                assert event.index == parallel_event.index, 'Loaded the events with the incorrect index.'
+        
+        CompareSyslogTest.logger.debug('Test succeeded!')
+        
+    @log_test(logger, globals.log_separator)
+    def testBatchRunner(self):
+        CompareSyslogTest.logger.debug('Test comparing two directories of logs with a worker pool.')
+        
+        # Test data
+        directory = tempfile.mkdtemp()
+        directory_a = os.path.join(directory, 'old')
+        directory_b = os.path.join(directory, 'new')
+        results_filename = os.path.join(directory, 'results.json')
+        os.mkdir(directory_a)
+        os.mkdir(directory_b)
+        shutil.copy(self.test_file_old, os.path.join(directory_a, 'syslog'))
+        shutil.copy(self.test_file_new, os.path.join(directory_b, 'syslog'))
+        shutil.copy(self.test_file_new, os.path.join(directory_a, 'syslog.1'))
+        shutil.copy(self.test_file_new, os.path.join(directory_b, 'syslog.1'))
+        shutil.copy(self.test_file_old, os.path.join(directory_a, 'syslog.2'))
+        
+        self.lexer, self.parser = createSyslogParsers()
+        old_events = self.parseData(self.getData(self.test_file_old))
+        new_events = self.parseData(self.getData(self.test_file_new))
+        filter_fields = self.createFilterFields(self.filter)
+        matches_both, matches_a_only, matches_b_only = UnorderedDiff.compare(old_events, new_events, filter_fields)
+        
+        try:
+            # Run test
+            runner = BatchRunner(createSyslogParsers, filter_fields, 2)
+            summaries = runner.run(directory_a, directory_b, results_filename)
+            with open(results_filename, 'r') as f:
+                results = dict([(summary['name'], summary) for summary in map(json.loads, f.readlines())])
+        finally:
+            shutil.rmtree(directory, True)
+        
+        # Show test output
+        for summary in summaries:
+            CompareSyslogTest.logger.debug('Summary: %s' % (json.dumps(summary, sort_keys=True)))
+            
+        # Verify results
+        assert len(summaries) == 2 and sorted(results.keys()) == ['syslog', 'syslog.1'], 'Compared the incorrect pairs.'
+        assert runner.unpaired == ['syslog.2'], 'Incorrect unpaired files.'
+        
+        summary = results['syslog']
+        assert 'error' not in summary, 'Failed to compare a pair.'
+        assert summary['events_a'] == len(old_events) and summary['events_b'] == len(new_events), 'Loaded the incorrect number of events.'
+        assert summary['both'] == len(matches_both), 'Found an incorrect number of events in both A and B.'
+        assert summary['a_only'] == len(matches_a_only), 'Found the incorrect number of events only in A.'
+        assert summary['b_only'] == len(matches_b_only), 'Found the incorrect number of events only in B.'
+        assert results['syslog.1']['a_only'] == 0 and results['syslog.1']['b_only'] == 0, 'Identical logs are different.'
+        
+        CompareSyslogTest.logger.debug('Test succeeded!')
+        
+    @log_test(logger, globals.log_separator)
+    def testDiffServer(self):
+        CompareSyslogTest.logger.debug('Test comparing logs against a baseline held by the diff server.')
+        
+        # Test data
+        self.lexer, self.parser = createSyslogParsers()
+        new_raw_events = self.getData(self.test_file_new)
+        old_events = self.parseData(self.getData(self.test_file_old))
+        new_events = self.parseData(new_raw_events)
+        filter_fields = self.createFilterFields(self.filter)
+        summaries_both, summaries_a_only, summaries_b_only = UnorderedDiff.summarize(old_events, new_events, filter_fields)
+        
+        directory = './logs'
+        server = DiffServer(createSyslogParsers, filter_fields, directory=directory)
+        server.start()
+        client = DiffClient(server.address, 60)
+        
+        try:
+            # Run test
+            loaded = client.load('syslog', os.path.relpath(self.test_file_old, directory))
+            file_result = client.compare('syslog', os.path.relpath(self.test_file_new, directory))
+            lines_result = client.compare('syslog', lines=new_raw_events, limit=5)
+            names = client.request({ 'command': 'list' })['names']
+            
+            try:
+                client.compare('missing', os.path.relpath(self.test_file_new, directory))
+                assert False, 'Compared against a missing baseline.'
+            except ValueError:
+                pass
+                
+            for filename in ['../TestCompareSyslog.py', os.path.abspath(__file__), '/etc/passwd']:
+                try:
+                    client.load('outside', filename)
+                    assert False, 'Loaded a file outside of the log directory.'
+                except ValueError:
+                    pass
+        finally:
+            client.close()
+            server.stop()
+        
+        # Show test output
+        CompareSyslogTest.logger.debug('Loaded baseline: %s' % (str(loaded)))
+        CompareSyslogTest.logger.debug('Found keys only in A: %d' % (file_result['a_only'])) 
+        CompareSyslogTest.logger.debug('Found keys only in B: %d' % (file_result['b_only']))  
+        CompareSyslogTest.logger.debug('Found keys in A and B: %d' % (file_result['both']))
+        
+        # Verify results
+        assert loaded['events'] == len(old_events), 'Loaded the incorrect number of baseline events.'
+        assert names == ['syslog'], 'Incorrect baseline names.'
+        assert file_result['events'] == len(new_events), 'Loaded the incorrect number of new events.'
+        assert file_result['both'] == len(summaries_both), 'Found an incorrect number of keys in both A and B.'
+        assert file_result['a_only'] == len(summaries_a_only), 'Found the incorrect number of A only keys.'
+        assert file_result['b_only'] == len(summaries_b_only), 'Found the incorrect number of B only keys.'
+        assert file_result['events_b_only'] == sum([s.count_b for s in summaries_b_only.values()]), 'Incorrect count of B only events.'
+        
+        for name in ['events', 'both', 'a_only', 'b_only']:
+            assert lines_result[name] == file_result[name], 'Incorrect comparison of raw lines.'
+        assert len(lines_result['b_only_keys']) == min(5, file_result['b_only']), 'Incorrect limit on the returned keys.'
+        
+        CompareSyslogTest.logger.debug('Test succeeded!')
+        
+    def getMatchIndices(self, matches):
+        indices = []
+        for match in matches:
+            indices.append( (tuple([e.index for e in match.matches_a]), tuple([e.index for e in match.matches_b])) )
+            
+        return sorted(indices)
+        
     def parseData(self, raw_events):
         events = []
         all_errors = []